@@ -2,19 +2,23 @@ import tkinter as tk
 from tkinter import *
 from tkinter import ttk
 
+from expense_journal import ExpenseJournal
+
 class AuthApp(tk.Tk):
     def __init__(self):
         super().__init__()
         self.title("Expense Tracker")
         self.geometry("900x600")
         
-        # Create monthly expenses dictionary
-        self.monthly_expenses = {
-            "January": [], "February": [], "March": [], 
-            "April": [], "May": [], "June": [],
-            "July": [], "August": [], "September": [],
-            "October": [], "November": [], "December": []
-        }
+        # Monthly expenses dictionary, restored from the last snapshot plus the journal
+        self.journal = ExpenseJournal([
+            "January", "February", "March",
+            "April", "May", "June",
+            "July", "August", "September",
+            "October", "November", "December"
+        ])
+        self.monthly_expenses = self.journal.expenses
+        self.protocol("WM_DELETE_WINDOW", self.close)
         
         self.current_active_card = None
         self.create_widgets()
@@ -132,8 +136,8 @@ class AuthApp(tk.Tk):
                 item = item_entry.get()
                 price = price_entry.get()
                 if item and price.isdigit():
-                    self.monthly_expenses[month].append((item, int(price)))
-                    update_expense_list(list_inner_frame, month)
+                    self.journal.add(month, item, int(price))
+                    append_expense_label(list_inner_frame, item, int(price))
                     item_entry.delete(0, END)
                     price_entry.delete(0, END)
 
@@ -144,7 +148,7 @@ class AuthApp(tk.Tk):
             bottom_frame.pack(fill=X, pady=(10, 0))
 
             def clear_expenses():
-                self.monthly_expenses[month] = []
+                self.journal.clear(month)
                 update_expense_list(list_inner_frame, month)
 
             Button(bottom_frame, text="Clear All", command=clear_expenses, bg="#FFCDD2").pack(side=RIGHT)
@@ -153,18 +157,24 @@ class AuthApp(tk.Tk):
             update_expense_list(list_inner_frame, month)
 
         def update_expense_list(frame, month):
-            # Clear existing widgets
+            # Full redraw, only when a card's content is built or cleared
             for widget in frame.winfo_children():
                 widget.destroy()
 
-            # Add expenses
-            total = 0
+            # Total stays last; expense labels are packed before it
+            frame.total = 0
+            frame.total_label = Label(frame, bg="white", font=("Arial", 10, "bold"), fg="green")
+            frame.total_label.pack(fill=X, pady=(5,0))
             for item, price in self.monthly_expenses[month]:
-                Label(frame, text=f"{item}: P{price}", bg="white", anchor="w").pack(fill=X)
-                total += price
+                Label(frame, text=f"{item}: P{price}", bg="white", anchor="w").pack(fill=X, before=frame.total_label)
+                frame.total += price
+            frame.total_label.config(text=f"Total: P{frame.total}")
 
-            # Add total
-            Label(frame, text=f"Total: P{total}", bg="white", font=("Arial", 10, "bold"), fg="green").pack(fill=X, pady=(5,0))
+        def append_expense_label(frame, item, price):
+            # One new label and a running total, instead of redrawing the month
+            Label(frame, text=f"{item}: P{price}", bg="white", anchor="w").pack(fill=X, before=frame.total_label)
+            frame.total += price
+            frame.total_label.config(text=f"Total: P{frame.total}")
 
         # Create 3-column grid of month cards
         for i, month in enumerate(self.monthly_expenses.keys()):
@@ -176,6 +186,10 @@ class AuthApp(tk.Tk):
         for i in range(3):
             scrollable_frame.grid_columnconfigure(i, weight=1)
 
+    def close(self):
+        self.journal.close()
+        self.destroy()
+
 if __name__ == "__main__":
     app = AuthApp()
     app.mainloop()
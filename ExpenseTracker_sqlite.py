@@ -8,65 +8,9 @@ from PyQt5.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, QH
                              QSpinBox, QCalendarWidget)
 from PyQt5.QtCore import Qt, QDate, pyqtSignal, QRegExp
 from PyQt5.QtGui import QFont, QColor, QPalette, QIcon, QRegExpValidator
-
-# === SQLite Database Setup ===
-DB_PATH = 'expense_tracker.db'
-
-
-def setup_database():
-    conn = sqlite3.connect(DB_PATH)
-    c = conn.cursor()
-
-    # Create Users table if it doesn't exist
-    c.execute('''CREATE TABLE IF NOT EXISTS users (
-                    username TEXT PRIMARY KEY,
-                    name TEXT,
-                    email TEXT,
-                    password TEXT)''')
-
-    # Create Expenses table with the new schema
-    c.execute('''CREATE TABLE IF NOT EXISTS expenses (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    username TEXT,
-                    item TEXT,
-                    price REAL,
-                    date TEXT,
-                    FOREIGN KEY (username) REFERENCES users(username))''')
-
-    # Check if we need to migrate from old schema
-    c.execute("PRAGMA table_info(expenses)")
-    columns = [column[1] for column in c.fetchall()]
-
-    if 'date' not in columns:
-        try:
-            # Add the new date column
-            c.execute("ALTER TABLE expenses ADD COLUMN date TEXT")
-
-            # If there's existing data with month/day columns, migrate it
-            if 'month' in columns and 'day' in columns:
-                current_year = datetime.now().year
-                c.execute("SELECT id, month, day FROM expenses WHERE date IS NULL")
-                for expense_id, month, day in c.fetchall():
-                    # Convert month name to number
-                    months = ["January", "February", "March", "April", "May", "June",
-                              "July", "August", "September", "October", "November", "December"]
-                    month_num = months.index(month) + 1
-                    date_str = f"{current_year}-{month_num:02d}-{day:02d}"
-                    c.execute("UPDATE expenses SET date=? WHERE id=?", (date_str, expense_id))
-
-            # Remove old columns if they exist
-            if 'month' in columns:
-                c.execute("CREATE TABLE expenses_new AS SELECT id, username, item, price, date FROM expenses")
-                c.execute("DROP TABLE expenses")
-                c.execute("ALTER TABLE expenses_new RENAME TO expenses")
-
-        except sqlite3.Error as e:
-            print(f"Database migration error: {e}")
-            conn.rollback()
-        else:
-            conn.commit()
-
-    conn.close()
+from expense_repository import get_repository, setup_database
+from month_view import format_amount, format_date
+from write_worker import get_expense_writer, stop_expense_writer
 
 
 # === Helper Functions ===
@@ -136,8 +80,8 @@ class RegisterPage(QWidget):
         form_layout.addSpacing(10)
 
         # Register button
-        register_btn = QPushButton("Register")
-        register_btn.setStyleSheet("""
+        self.register_btn = QPushButton("Register")
+        self.register_btn.setStyleSheet("""
             QPushButton {
                 background-color: #3498db; 
                 color: white; 
@@ -149,9 +93,9 @@ class RegisterPage(QWidget):
                 background-color: #2980b9;
             }
         """)
-        register_btn.setCursor(Qt.PointingHandCursor)
-        register_btn.clicked.connect(self.register)
-        form_layout.addWidget(register_btn)
+        self.register_btn.setCursor(Qt.PointingHandCursor)
+        self.register_btn.clicked.connect(self.register)
+        form_layout.addWidget(self.register_btn)
 
         # Login link
         login_container = QHBoxLayout()
@@ -203,22 +147,25 @@ class RegisterPage(QWidget):
             QMessageBox.warning(self, "Missing Fields", "Username and password are required.")
             return
 
-        conn = sqlite3.connect(DB_PATH)
-        c = conn.cursor()
-        c.execute("SELECT * FROM users WHERE username = ?", (username,))
-        if c.fetchone():
+        if get_repository().user_exists(username):
             QMessageBox.warning(self, "Username Exists", "Username already exists.")
-            conn.close()
             return
 
-        c.execute("INSERT INTO users (username, name, email, password) VALUES (?, ?, ?, ?)",
-                  (username, name, email, password))
-        conn.commit()
-        conn.close()
+        # Committed on the writer thread; Register stays off until it is
+        self.register_btn.setEnabled(False)
+        get_expense_writer().add_user(username, name, email, password,
+                                      on_done=lambda _: self.registered(),
+                                      on_error=self.register_failed)
 
+    def registered(self):
+        self.register_btn.setEnabled(True)
         QMessageBox.information(self, "Success", "Registered Successfully!")
         self.switch_to_login.emit()
 
+    def register_failed(self, error):
+        self.register_btn.setEnabled(True)
+        QMessageBox.warning(self, "Database Error", f"Failed to register: {str(error)}")
+
 
 # === Login Page ===
 class LoginPage(QWidget):
@@ -324,11 +271,7 @@ class LoginPage(QWidget):
         username = self.username_entry.text().strip()
         password = self.password_entry.text().strip()
 
-        conn = sqlite3.connect(DB_PATH)
-        c = conn.cursor()
-        c.execute("SELECT * FROM users WHERE username = ? AND password = ?", (username, password))
-        user = c.fetchone()
-        conn.close()
+        user = get_repository().authenticate(username, password)
 
         if user:
             QMessageBox.information(self, "Login Success", f"Welcome, {user[1]}!")
@@ -403,6 +346,7 @@ class AddExpenseDialog(QDialog):
         self.month = month
         self.username = username
         self.current_year = datetime.now().year
+        self.saving = False
         self.initUI()
 
     def initUI(self):
@@ -522,8 +466,8 @@ class AddExpenseDialog(QDialog):
         # Buttons
         buttons_layout = QHBoxLayout()
 
-        cancel_btn = QPushButton("Cancel")
-        cancel_btn.setStyleSheet("""
+        self.cancel_btn = QPushButton("Cancel")
+        self.cancel_btn.setStyleSheet("""
             QPushButton { 
                 background-color: #95a5a6; 
                 color: white; 
@@ -534,10 +478,10 @@ class AddExpenseDialog(QDialog):
                 background-color: #7f8c8d; 
             }
         """)
-        cancel_btn.clicked.connect(self.reject)
+        self.cancel_btn.clicked.connect(self.reject)
 
-        save_btn = QPushButton("Save Expense")
-        save_btn.setStyleSheet("""
+        self.save_btn = QPushButton("Save Expense")
+        self.save_btn.setStyleSheet("""
             QPushButton { 
                 background-color: #2ecc71; 
                 color: white; 
@@ -549,10 +493,10 @@ class AddExpenseDialog(QDialog):
                 background-color: #27ae60; 
             }
         """)
-        save_btn.clicked.connect(self.save_expense)
+        self.save_btn.clicked.connect(self.save_expense)
 
-        buttons_layout.addWidget(cancel_btn)
-        buttons_layout.addWidget(save_btn)
+        buttons_layout.addWidget(self.cancel_btn)
+        buttons_layout.addWidget(self.save_btn)
         layout.addLayout(buttons_layout)
 
     def format_price_input(self, text):
@@ -604,15 +548,32 @@ class AddExpenseDialog(QDialog):
         # Format date as YYYY-MM-DD
         date_str = f"{self.current_year}-{month_num:02d}-{self.day_input.value():02d}"
 
-        conn = sqlite3.connect(DB_PATH)
-        c = conn.cursor()
-        c.execute("INSERT INTO expenses (username, item, price, date) VALUES (?, ?, ?, ?)",
-                  (self.username, item, price, date_str))
-        conn.commit()
-        conn.close()
-
+        # This frontend has no category picker, so everything goes under Food.
+        # Queued on the writer thread; the dialog closes once it is committed
+        self.set_saving(True)
+        get_expense_writer().add_expense(self.username, item, price, date_str, 1,
+                                         on_done=lambda _: self.saved(),
+                                         on_error=self.save_failed)
+
+    def set_saving(self, saving):
+        """Lock the buttons while a save is queued, so the row can't land after a cancel"""
+        self.saving = saving
+        self.save_btn.setEnabled(not saving)
+        self.cancel_btn.setEnabled(not saving)
+
+    def reject(self):
+        # Esc and the close button end up here too
+        if not self.saving:
+            super().reject()
+
+    def saved(self):
+        self.saving = False
         self.accept()
 
+    def save_failed(self, error):
+        self.set_saving(False)
+        QMessageBox.warning(self, "Database Error", f"Failed to save expense: {str(error)}")
+
 
 # === Month Detail Widget ===
 class MonthDetailWidget(QWidget):
@@ -696,25 +657,12 @@ class MonthDetailWidget(QWidget):
                   "July", "August", "September", "October", "November", "December"]
         month_num = months.index(self.month) + 1
 
-        conn = sqlite3.connect(DB_PATH)
-        c = conn.cursor()
-
         try:
-            c.execute("""
-                SELECT id, item, price, date 
-                FROM expenses 
-                WHERE username = ? 
-                AND strftime('%m', date) = ?
-                AND strftime('%Y', date) = ?
-                ORDER BY date
-            """, (self.username, f"{month_num:02d}", str(self.current_year)))
-            expenses = c.fetchall()
+            expenses = get_repository().list_month_by_date(self.username, self.current_year, month_num)
         except sqlite3.OperationalError as e:
             QMessageBox.warning(self, "Database Error", f"Failed to load expenses: {str(e)}")
             expenses = []
 
-        conn.close()
-
         total = 0
 
         if not expenses:
@@ -724,7 +672,7 @@ class MonthDetailWidget(QWidget):
             empty_label.setAlignment(Qt.AlignCenter)
             self.expenses_layout.insertWidget(0, empty_label)
         else:
-            for expense_id, item, price, date_str in expenses:
+            for expense_id, item, price, date_str, _ in expenses:
                 expense_frame = QFrame()
                 expense_frame.setStyleSheet("""
                     QFrame { 
@@ -737,9 +685,7 @@ class MonthDetailWidget(QWidget):
                 expense_layout = QHBoxLayout(expense_frame)
                 expense_layout.setContentsMargins(10, 10, 10, 10)
 
-                # Parse date
-                date = datetime.strptime(date_str, "%Y-%m-%d")
-                formatted_date = date.strftime("%b %d, %Y")  # Format as "May 09, 2025"
+                formatted_date = format_date(date_str)  # Format as "May 09, 2025"
 
                 # Date label
                 date_label = QLabel(formatted_date)
@@ -753,7 +699,7 @@ class MonthDetailWidget(QWidget):
                 item_label.setStyleSheet("color: #2c3e50;")
 
                 # Price (formatted with commas)
-                price_label = QLabel(f"₱{price:,.2f}")
+                price_label = QLabel(format_amount(price))
                 price_label.setFont(QFont("Segoe UI", 11, QFont.Bold))
                 price_label.setStyleSheet("color: #16a085;")
                 price_label.setFixedWidth(100)
@@ -803,11 +749,7 @@ class MonthDetailWidget(QWidget):
         )
 
         if confirm == QMessageBox.Yes:
-            conn = sqlite3.connect(DB_PATH)
-            c = conn.cursor()
-            c.execute("DELETE FROM expenses WHERE id = ?", (expense_id,))
-            conn.commit()
-            conn.close()
+            get_repository().delete(expense_id)
             self.load_expenses()
 
 
@@ -897,15 +839,7 @@ class ExpenseTrackerWindow(QMainWindow):
         self.setCentralWidget(main_widget)
 
     def get_user_name(self):
-        conn = sqlite3.connect(DB_PATH)
-        c = conn.cursor()
-        c.execute("SELECT name FROM users WHERE username = ?", (self.username,))
-        user = c.fetchone()
-        conn.close()
-
-        if user and user[0]:
-            return user[0]
-        return self.username
+        return get_repository().get_user_name(self.username) or self.username
 
     def show_month_detail(self, month):
         month_index = self.months.index(month)
@@ -946,6 +880,9 @@ class ExpenseTrackerApp(QApplication):
         # Set initial page to Login
         self.auth_stack.setCurrentIndex(0)
 
+        # Commit whatever is still queued before the process exits
+        self.aboutToQuit.connect(stop_expense_writer)
+
         self.auth_window.setCentralWidget(self.auth_stack)
         self.auth_window.show()
 
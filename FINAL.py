@@ -1,61 +1,31 @@
 import os
 import sys
-import sqlite3
+import time
+from collections import OrderedDict
 from datetime import datetime
+
+# Taken before the Qt imports so startup timing covers them too
+PROCESS_START = time.perf_counter()
+
 from PyQt5.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
                              QLabel, QLineEdit, QPushButton, QScrollArea, QFrame, QStackedWidget,
-                             QComboBox, QDialog, QFormLayout, QMessageBox, QDateEdit)
-from PyQt5.QtCore import Qt, QDate, pyqtSignal, QRegExp
-from PyQt5.QtGui import QFont, QRegExpValidator
+                             QComboBox, QDialog, QFormLayout, QMessageBox, QDateEdit,
+                             QAction, QFileDialog)
+from PyQt5.QtCore import Qt, QDate, QTimer, pyqtSignal, QRegExp
+from PyQt5.QtGui import QRegExpValidator
 
 # === SQLite Database Setup ===
 
-DB_PATH = 'expense_tracker.db'
-
-def setup_database():
-    conn = sqlite3.connect(DB_PATH)
-    c = conn.cursor()
-
-    # Create Users table
-    c.execute('''CREATE TABLE IF NOT EXISTS users (
-                    username TEXT PRIMARY KEY,
-                    name TEXT,
-                    email TEXT,
-                    password TEXT)''')
-
-    # Create Categories table
-    c.execute('''CREATE TABLE IF NOT EXISTS categories (
-                    id INTEGER PRIMARY KEY,
-                    name TEXT UNIQUE)''')
-
-    # Clear existing categories and insert new ones in exact order
-    c.execute("DELETE FROM categories")  # Clear any existing categories
-
-    # Insert categories in specific order with manual IDs
-    categories = [
-        (1, 'Food'),
-        (2, 'Utilities'),
-        (3, 'Necessities'),
-        (4, 'Transportation')
-    ]
-
-    for cat_id, cat_name in categories:
-        c.execute("INSERT OR IGNORE INTO categories (id, name) VALUES (?, ?)",
-                  (cat_id, cat_name))
-
-    # Create Expenses table with category_id
-    c.execute('''CREATE TABLE IF NOT EXISTS expenses (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    username TEXT,
-                    item TEXT,
-                    price REAL,
-                    date TEXT,
-                    category_id INTEGER,
-                    FOREIGN KEY (username) REFERENCES users(username),
-                    FOREIGN KEY (category_id) REFERENCES categories(id))''')
-
-    conn.commit()
-    conn.close()
+from expense_repository import Expense, setup_database, get_repository
+from expense_export import export_expenses
+from query_worker import get_query_executor
+from query_cache import print_stats
+from write_worker import get_expense_writer, stop_expense_writer
+from month_cache import fetch_year, get_month_cache
+from month_view import EMPTY_MONTH, load_month_summary, stream_category_rows
+from category_state import get_expanded_categories
+from expense_list_view import ExpenseListModel, ExpenseListView
+from theme import apply_theme, font, set_style_state
 
 # === Helper Functions ===
 
@@ -69,6 +39,10 @@ def get_days_in_month(year, month):
 def format_currency(amount):
     return f"₱{amount:,.2f}"
 
+def report_startup_timing(timings):
+    parts = ", ".join(f"{name} {seconds * 1000:.1f} ms" for name, seconds in timings.items())
+    print(f"Startup: {parts}")
+
 # === Add Expense Dialog ===
 class AddExpenseDialog(QDialog):
     def __init__(self, month, username):
@@ -76,21 +50,23 @@ class AddExpenseDialog(QDialog):
         self.month = month
         self.username = username
         self.current_year = datetime.now().year
+        self.saved_expense = None
+        self.saving = False
         self.initUI()
 
     def initUI(self):
         self.setWindowTitle(f"Add Expense for {self.month}")
         self.setFixedWidth(400)
-        self.setStyleSheet("QDialog { background-color: white; }")
+        self.setObjectName("addExpenseDialog")
 
         layout = QVBoxLayout(self)
         layout.setContentsMargins(20, 20, 20, 20)
         layout.setSpacing(15)
 
         title = QLabel(f"Add New Expense for {self.month}")
-        title.setFont(QFont("Segoe UI", 14, QFont.Bold))
+        title.setObjectName("dialogTitle")
+        title.setFont(font("heading_large"))
         title.setAlignment(Qt.AlignCenter)
-        title.setStyleSheet("color: #2c3e50; margin-bottom: 15px;")
         layout.addWidget(title)
 
         form = QFormLayout()
@@ -98,12 +74,10 @@ class AddExpenseDialog(QDialog):
 
         self.item_input = QLineEdit()
         self.item_input.setPlaceholderText("Enter item")
-        self.item_input.setStyleSheet("padding: 8px; border: 1px solid #ddd; border-radius: 4px;")
         form.addRow("Item:", self.item_input)
 
         self.price_input = QLineEdit()
         self.price_input.setPlaceholderText("0.00")
-        self.price_input.setStyleSheet("padding: 8px; border: 1px solid #ddd; border-radius: 4px;")
         regex = QRegExp(r'^\d*\.?\d{0,2}$')
         validator = QRegExpValidator(regex)
         self.price_input.setValidator(validator)
@@ -125,55 +99,28 @@ class AddExpenseDialog(QDialog):
         self.date_input.setDate(QDate(self.current_year, month_num, 1))
         self.date_input.setMinimumDate(QDate(self.current_year, month_num, 1))
         self.date_input.setMaximumDate(QDate(self.current_year, month_num, days_in_month))
-        self.date_input.setStyleSheet("padding: 8px; border: 1px solid #ddd; border-radius: 4px;")
         form.addRow("Date:", self.date_input)
 
         layout.addLayout(form)
 
         buttons_layout = QHBoxLayout()
-        cancel_btn = QPushButton("Cancel")
-        cancel_btn.setStyleSheet("""
-            QPushButton {
-                background-color: #ecf0f1; 
-                color: #2c3e50; 
-                border-radius: 5px; 
-                padding: 8px; 
-                font-weight: bold;
-            }
-            QPushButton:hover {
-                background-color: #bdc3c7;
-            }
-        """)
-        cancel_btn.setCursor(Qt.PointingHandCursor)
-        cancel_btn.clicked.connect(self.reject)
-
-        save_btn = QPushButton("Save Expense")
-        save_btn.setStyleSheet("""
-            QPushButton {
-                background-color: #2ecc71; 
-                color: white; 
-                border-radius: 5px; 
-                padding: 8px; 
-                font-weight: bold;
-            }
-            QPushButton:hover {
-                background-color: #27ae60;
-            }
-        """)
-        save_btn.setCursor(Qt.PointingHandCursor)
-        save_btn.clicked.connect(self.save_expense)
-
-        buttons_layout.addWidget(cancel_btn)
-        buttons_layout.addWidget(save_btn)
+        self.cancel_btn = QPushButton("Cancel")
+        self.cancel_btn.setObjectName("cancelButton")
+        self.cancel_btn.setCursor(Qt.PointingHandCursor)
+        self.cancel_btn.clicked.connect(self.reject)
+
+        self.save_btn = QPushButton("Save Expense")
+        self.save_btn.setObjectName("saveButton")
+        self.save_btn.setCursor(Qt.PointingHandCursor)
+        self.save_btn.clicked.connect(self.save_expense)
+
+        buttons_layout.addWidget(self.cancel_btn)
+        buttons_layout.addWidget(self.save_btn)
         layout.addLayout(buttons_layout)
 
     def load_categories(self):
-        conn = sqlite3.connect(DB_PATH)
-        c = conn.cursor()
-        c.execute("SELECT name FROM categories")
-        categories = [row[0] for row in c.fetchall()]
+        categories = [name for _, name in get_repository().categories()]
         self.category_combo.addItems(categories)
-        conn.close()
 
     def save_expense(self):
         item = self.item_input.text().strip()
@@ -192,28 +139,49 @@ class AddExpenseDialog(QDialog):
             return
 
         category = self.category_combo.currentText()
+        date_str = self.date_input.date().toString("yyyy-MM-dd")
+
+        def queue_expense(category_id):
+            get_expense_writer().add_expense(self.username, item, price, date_str, category_id,
+                                             on_done=lambda expense_id: self.saved(
+                                                 Expense(expense_id, item, price, date_str, category)),
+                                             on_error=self.save_failed)
 
-        conn = sqlite3.connect(DB_PATH)
-        c = conn.cursor()
+        # Queued on the writer thread; the dialog closes once it is committed
+        self.set_saving(True)
 
         # Check if the category exists
-        c.execute("SELECT id FROM categories WHERE name = ?", (category,))
-        category_id = c.fetchone()
+        category_id = get_repository().category_id(category)
 
-        if category_id is None:  # If category does not exist, insert it
-            c.execute("INSERT INTO categories (name) VALUES (?)", (category,))
-            conn.commit()
-            category_id = c.lastrowid  # Get the new category ID
+        if category_id is None:  # If category does not exist, insert it first
+            get_expense_writer().add_category(category, on_done=queue_expense,
+                                              on_error=self.save_failed)
         else:
-            category_id = category_id[0]  # Get the existing category ID
-
-        c.execute("INSERT INTO expenses (username, item, price, date, category_id) VALUES (?, ?, ?, ?, ?)",
-                  (self.username, item, price, self.date_input.date().toString("yyyy-MM-dd"), category_id))
+            queue_expense(category_id)
+
+    def set_saving(self, saving):
+        """Lock the buttons while a save is queued, so the row can't land after a cancel"""
+        self.saving = saving
+        self.save_btn.setEnabled(not saving)
+        self.cancel_btn.setEnabled(not saving)
+
+    def reject(self):
+        # Esc and the close button end up here too
+        if not self.saving:
+            super().reject()
+
+    def saved(self, expense):
+        self.saving = False
+        self.saved_expense = expense
+        self.accept()
 
-        conn.commit()
-        conn.close()
+    def category_order(self):
+        """Category names in id order, as the month view sorts its groups"""
+        return [self.category_combo.itemText(i) for i in range(self.category_combo.count())]
 
-        self.accept()
+    def save_failed(self, error):
+        self.set_saving(False)
+        QMessageBox.warning(self, "Database Error", f"Failed to save expense: {str(error)}")
 
 
 # === Register Page ===
@@ -225,29 +193,25 @@ class RegisterPage(QWidget):
         self.initUI()
 
     def initUI(self):
-        self.setStyleSheet("background-color: #f0f4f8;")
+        self.setObjectName("registerPage")
         main_layout = QVBoxLayout()
         main_layout.setContentsMargins(0, 30, 0, 30)
         main_layout.setAlignment(Qt.AlignCenter)
 
         form_container = QFrame()
         form_container.setFixedWidth(420)
-        form_container.setStyleSheet("""
-            background-color: white;
-            border-radius: 16px;
-            border: 1px solid #dfe6e9;
-        """)
+        form_container.setObjectName("registerForm")
         form_layout = QVBoxLayout(form_container)
         form_layout.setContentsMargins(40, 40, 40, 40)
         form_layout.setSpacing(20)
 
         title_label = QLabel("Create Your Account")
-        title_label.setFont(QFont("Poppins", 20, QFont.Bold))
-        title_label.setStyleSheet("color: #2c3e50;")
+        title_label.setObjectName("registerTitle")
+        title_label.setFont(font("signup_title"))
 
         subtitle_label = QLabel("Start tracking your expenses today")
-        subtitle_label.setFont(QFont("Poppins", 11))
-        subtitle_label.setStyleSheet("color: #7f8c8d;")
+        subtitle_label.setObjectName("registerSubtitle")
+        subtitle_label.setFont(font("signup_subtitle"))
 
         form_layout.addWidget(title_label, alignment=Qt.AlignCenter)
         form_layout.addWidget(subtitle_label, alignment=Qt.AlignCenter)
@@ -263,43 +227,21 @@ class RegisterPage(QWidget):
         form_layout.addWidget(self.email_input)
         form_layout.addWidget(self.password_input)
 
-        register_btn = QPushButton("Sign Up")
-        register_btn.setStyleSheet("""
-            QPushButton {
-                background-color: #2980b9;
-                color: white;
-                font-size: 15px;
-                padding: 12px;
-                font-weight: bold;
-                border-radius: 10px;
-            }
-            QPushButton:hover {
-                background-color: #2471a3;
-            }
-        """)
-        register_btn.setCursor(Qt.PointingHandCursor)
-        register_btn.clicked.connect(self.register)
-        form_layout.addWidget(register_btn)
+        self.register_btn = QPushButton("Sign Up")
+        self.register_btn.setObjectName("signUpButton")
+        self.register_btn.setCursor(Qt.PointingHandCursor)
+        self.register_btn.clicked.connect(self.register)
+        form_layout.addWidget(self.register_btn)
 
         login_container = QHBoxLayout()
         login_container.setAlignment(Qt.AlignCenter)
 
         login_text = QLabel("Already have an account?")
-        login_text.setFont(QFont("Poppins", 9))
+        login_text.setFont(font("signup_caption"))
 
         login_btn = QPushButton("Log In")
-        login_btn.setFont(QFont("Poppins", 9, QFont.Bold))
-        login_btn.setStyleSheet("""
-            QPushButton {
-                color: #2980b9;
-                background-color: transparent;
-                border: none;
-                text-decoration: underline;
-            }
-            QPushButton:hover {
-                color: #21618c;
-            }
-        """)
+        login_btn.setObjectName("linkButton")
+        login_btn.setFont(font("signup_caption_bold"))
         login_btn.setCursor(Qt.PointingHandCursor)
         login_btn.clicked.connect(self.switch_to_login.emit)
 
@@ -313,19 +255,7 @@ class RegisterPage(QWidget):
     def _create_input(self, placeholder, is_password=False):
         entry = QLineEdit()
         entry.setPlaceholderText(placeholder)
-        entry.setFont(QFont("Poppins", 10))
-        entry.setStyleSheet("""
-            QLineEdit {
-                padding: 12px;
-                border: 1px solid #ccc;
-                border-radius: 8px;
-                font-size: 14px;
-            }
-            QLineEdit:focus {
-                border: 1px solid #3498db;
-                outline: none;
-            }
-        """)
+        entry.setFont(font("signup_input"))
         if is_password:
             entry.setEchoMode(QLineEdit.Password)
         return entry
@@ -340,22 +270,25 @@ class RegisterPage(QWidget):
             QMessageBox.warning(self, "Missing Fields", "Username and password are required.")
             return
 
-        conn = sqlite3.connect(DB_PATH)
-        c = conn.cursor()
-        c.execute("SELECT * FROM users WHERE username = ?", (username,))
-        if c.fetchone():
+        if get_repository().user_exists(username):
             QMessageBox.warning(self, "Username Exists", "Username already exists.")
-            conn.close()
             return
 
-        c.execute("INSERT INTO users (username, name, email, password) VALUES (?, ?, ?, ?)",
-                  (username, name, email, password))
-        conn.commit()
-        conn.close()
+        # Committed on the writer thread; Sign Up stays off until it is
+        self.register_btn.setEnabled(False)
+        get_expense_writer().add_user(username, name, email, password,
+                                      on_done=lambda _: self.registered(),
+                                      on_error=self.register_failed)
 
+    def registered(self):
+        self.register_btn.setEnabled(True)
         QMessageBox.information(self, "Success", "Registered Successfully!")
         self.switch_to_login.emit()
 
+    def register_failed(self, error):
+        self.register_btn.setEnabled(True)
+        QMessageBox.warning(self, "Database Error", f"Failed to register: {str(error)}")
+
 
 # === Login Page ===
 class LoginPage(QWidget):
@@ -367,101 +300,48 @@ class LoginPage(QWidget):
         self.initUI()
 
     def initUI(self):
-        self.setStyleSheet("background-color: #ecf0f3;")
+        self.setObjectName("loginPage")
         main_layout = QVBoxLayout()
         main_layout.setAlignment(Qt.AlignCenter)
 
         title_label = QLabel("Welcome Back!")
-        title_label.setFont(QFont("Segoe UI", 26, QFont.Bold))
-        title_label.setStyleSheet("color: #2d3436;")
+        title_label.setObjectName("loginTitle")
+        title_label.setFont(font("display"))
 
         login_box = QFrame()
-        login_box.setStyleSheet("""
-            QFrame {
-                background-color: white;
-                border-radius: 20px;
-                padding: 30px;
-                border: 1px solid #dcdde1;
-            }
-        """)
+        login_box.setObjectName("loginBox")
         login_box.setFixedWidth(400)
         login_layout = QVBoxLayout(login_box)
         login_layout.setSpacing(15)
 
         subtitle_label = QLabel("Expense Tracker Login System")
-        subtitle_label.setFont(QFont("Segoe UI", 11, QFont.StyleItalic))
-        subtitle_label.setStyleSheet("color: #7f8c8d;")
+        subtitle_label.setObjectName("loginSubtitle")
+        subtitle_label.setFont(font("subtitle"))
         login_layout.addWidget(subtitle_label, alignment=Qt.AlignCenter)
 
         self.username_entry = QLineEdit()
         self.username_entry.setPlaceholderText("Username")
-        self.username_entry.setStyleSheet("""
-            QLineEdit {
-                border: 1px solid #bdc3c7;
-                border-radius: 10px;
-                padding: 10px;
-                font-size: 14px;
-                background-color: #f9f9f9;
-            }
-            QLineEdit:focus {
-                border: 1px solid #2980b9;
-                background-color: #ecf6fc;
-            }
-        """)
         login_layout.addWidget(self.username_entry)
 
         self.password_entry = QLineEdit()
         self.password_entry.setPlaceholderText("Password")
         self.password_entry.setEchoMode(QLineEdit.Password)
-        self.password_entry.setStyleSheet("""
-            QLineEdit {
-                border: 1px solid #bdc3c7;
-                border-radius: 10px;
-                padding: 10px;
-                font-size: 14px;
-                background-color: #f9f9f9;
-            }
-            QLineEdit:focus {
-                border: 1px solid #2980b9;
-                background-color: #ecf6fc;
-            }
-        """)
         login_layout.addWidget(self.password_entry)
 
         login_btn = QPushButton("Log In")
-        login_btn.setStyleSheet("""
-            QPushButton {
-                background-color: #2980b9;
-                color: white;
-                border-radius: 10px;
-                padding: 12px;
-                font-size: 16px;
-                font-weight: bold;
-            }
-            QPushButton:hover {
-                background-color: #2471a3;
-            }
-        """)
+        login_btn.setObjectName("loginButton")
         login_btn.setCursor(Qt.PointingHandCursor)
         login_btn.clicked.connect(self.login)
         login_layout.addWidget(login_btn)
 
         divider = QFrame()
         divider.setFrameShape(QFrame.HLine)
-        divider.setStyleSheet("color: #ccc;")
+        divider.setObjectName("loginDivider")
         login_layout.addWidget(divider)
 
         register_label = QLabel("Don't have an account? <a href='#'>Sign Up</a>")
-        register_label.setFont(QFont("Segoe UI", 10))
-        register_label.setStyleSheet("""
-            QLabel {
-                color: #2980b9;
-                text-align: center;
-            }
-            QLabel:hover {
-                color: #2471a3;
-            }
-        """)
+        register_label.setObjectName("registerLink")
+        register_label.setFont(font("small"))
         register_label.setAlignment(Qt.AlignCenter)
         register_label.setOpenExternalLinks(False)
         register_label.linkActivated.connect(self.redirect_to_register)
@@ -478,11 +358,7 @@ class LoginPage(QWidget):
         username = self.username_entry.text().strip()
         password = self.password_entry.text().strip()
 
-        conn = sqlite3.connect(DB_PATH)
-        c = conn.cursor()
-        c.execute("SELECT * FROM users WHERE username = ? AND password = ?", (username, password))
-        user = c.fetchone()
-        conn.close()
+        user = get_repository().authenticate(username, password)
 
         if user:
             QMessageBox.information(self, "Login Success", f"Welcome, {user[1]}!")
@@ -503,7 +379,8 @@ class MonthCard(QFrame):
         self.initUI()
 
     def initUI(self):
-        self.setActiveStyle(self.is_current)
+        self.setObjectName("monthCard")
+        self.setProperty("active", self.is_current)
         self.setCursor(Qt.PointingHandCursor)
 
         layout = QVBoxLayout(self)
@@ -511,39 +388,23 @@ class MonthCard(QFrame):
 
         self.month_label = QLabel(self.month)
         self.month_label.setAlignment(Qt.AlignCenter)
-        self.month_label.setFont(QFont("Segoe UI", 12, QFont.Bold))
+        self.month_label.setFont(font("heading"))
+
+        self.total_label = QLabel("")
+        self.total_label.setAlignment(Qt.AlignCenter)
+        self.total_label.setFont(font("caption"))
 
         layout.addWidget(self.month_label)
+        layout.addWidget(self.total_label)
         self.setFixedSize(120, 80)
 
+    def setTotal(self, amount):
+        self.total_label.setText(format_currency(amount) if amount else "")
+
     def setActiveStyle(self, active):
-        if active:
-            self.setStyleSheet("""
-                QFrame { 
-                    background-color: #3498db; 
-                    border-radius: 10px; 
-                    padding: 10px;
-                    border: 2px solid #2980b9;
-                }
-                QLabel {
-                    color: white;
-                }
-            """)
-        else:
-            self.setStyleSheet("""
-                QFrame { 
-                    background-color: #ecf0f1; 
-                    border-radius: 8px; 
-                    padding: 10px;
-                    border: 1px solid #ddd;
-                }
-                QFrame:hover { 
-                    background-color: #d6dbdf; 
-                }
-                QLabel {
-                    color: #2c3e50;
-                }
-            """)
+        # Colours live in the app stylesheet under QFrame#monthCard[active="true"]
+        if active != self.is_current:
+            set_style_state(self, "active", active)
         self.is_current = active
 
     def mousePressEvent(self, event):
@@ -558,21 +419,23 @@ class AddExpenseDialog(QDialog):
         self.month = month
         self.username = username
         self.current_year = datetime.now().year
+        self.saved_expense = None
+        self.saving = False
         self.initUI()
 
     def initUI(self):
         self.setWindowTitle(f"Add Expense for {self.month}")
         self.setFixedWidth(400)
-        self.setStyleSheet("QDialog { background-color: white; }")
+        self.setObjectName("addExpenseDialog")
 
         layout = QVBoxLayout(self)
         layout.setContentsMargins(20, 20, 20, 20)
         layout.setSpacing(15)
 
         title = QLabel(f"Add New Expense for {self.month}")
-        title.setFont(QFont("Segoe UI", 14, QFont.Bold))
+        title.setObjectName("dialogTitle")
+        title.setFont(font("heading_large"))
         title.setAlignment(Qt.AlignCenter)
-        title.setStyleSheet("color: #2c3e50; margin-bottom: 15px;")
         layout.addWidget(title)
 
         form = QFormLayout()
@@ -580,26 +443,19 @@ class AddExpenseDialog(QDialog):
 
         self.item_input = QLineEdit()
         self.item_input.setPlaceholderText("Enter item")
-        self.item_input.setStyleSheet("padding: 8px; border: 1px solid #ddd; border-radius: 4px;")
         form.addRow("Item:", self.item_input)
 
         self.price_input = QLineEdit()
         self.price_input.setPlaceholderText("0.00")
-        self.price_input.setStyleSheet("padding: 8px; border: 1px solid #ddd; border-radius: 4px;")
         regex = QRegExp(r'^\d*\.?\d{0,2}$')
         validator = QRegExpValidator(regex)
         self.price_input.setValidator(validator)
         form.addRow("Price:", self.price_input)
 
         self.category_combo = QComboBox()
-        self.category_combo.setStyleSheet("padding: 8px; border: 1px solid #ddd; border-radius: 4px;")
 
         # Get categories from database
-        conn = sqlite3.connect(DB_PATH)
-        c = conn.cursor()
-        c.execute("SELECT name FROM categories ORDER BY id")
-        categories = [row[0] for row in c.fetchall()]
-        conn.close()
+        categories = [name for _, name in get_repository().categories()]
 
         self.category_combo.addItems(categories)
         form.addRow("Category:", self.category_combo)
@@ -615,46 +471,23 @@ class AddExpenseDialog(QDialog):
         self.date_input.setDate(QDate(self.current_year, month_num, 1))
         self.date_input.setMinimumDate(QDate(self.current_year, month_num, 1))
         self.date_input.setMaximumDate(QDate(self.current_year, month_num, days_in_month))
-        self.date_input.setStyleSheet("padding: 8px; border: 1px solid #ddd; border-radius: 4px;")
         form.addRow("Date:", self.date_input)
 
         layout.addLayout(form)
 
         buttons_layout = QHBoxLayout()
-        cancel_btn = QPushButton("Cancel")
-        cancel_btn.setStyleSheet("""
-            QPushButton {
-                background-color: #ecf0f1; 
-                color: #2c3e50; 
-                border-radius: 5px; 
-                padding: 8px; 
-                font-weight: bold;
-            }
-            QPushButton:hover {
-                background-color: #bdc3c7;
-            }
-        """)
-        cancel_btn.setCursor(Qt.PointingHandCursor)
-        cancel_btn.clicked.connect(self.reject)
-
-        save_btn = QPushButton("Save Expense")
-        save_btn.setStyleSheet("""
-            QPushButton {
-                background-color: #2ecc71; 
-                color: white; 
-                border-radius: 5px; 
-                padding: 8px; 
-                font-weight: bold;
-            }
-            QPushButton:hover {
-                background-color: #27ae60;
-            }
-        """)
-        save_btn.setCursor(Qt.PointingHandCursor)
-        save_btn.clicked.connect(self.save_expense)
-
-        buttons_layout.addWidget(cancel_btn)
-        buttons_layout.addWidget(save_btn)
+        self.cancel_btn = QPushButton("Cancel")
+        self.cancel_btn.setObjectName("cancelButton")
+        self.cancel_btn.setCursor(Qt.PointingHandCursor)
+        self.cancel_btn.clicked.connect(self.reject)
+
+        self.save_btn = QPushButton("Save Expense")
+        self.save_btn.setObjectName("saveButton")
+        self.save_btn.setCursor(Qt.PointingHandCursor)
+        self.save_btn.clicked.connect(self.save_expense)
+
+        buttons_layout.addWidget(self.cancel_btn)
+        buttons_layout.addWidget(self.save_btn)
         layout.addLayout(buttons_layout)
 
     def save_expense(self):
@@ -674,39 +507,77 @@ class AddExpenseDialog(QDialog):
             return
 
         category_name = self.category_combo.currentText()
-
-        conn = sqlite3.connect(DB_PATH)
-        c = conn.cursor()
+        repo = get_repository()
 
         # First get the category ID
-        c.execute("SELECT id FROM categories WHERE name = ?", (category_name,))
-        category_id = c.fetchone()
+        category_id = repo.category_id(category_name)
 
-        if not category_id:
+        if category_id is None:
             QMessageBox.warning(self, "Invalid Category", "Selected category doesn't exist in database.")
-            conn.close()
             return
 
-        category_id = category_id[0]
-
         # Then insert the expense with the correct category_id
-        c.execute("INSERT INTO expenses (username, item, price, date, category_id) VALUES (?, ?, ?, ?, ?)",
-                  (self.username, item, price, self.date_input.date().toString("yyyy-MM-dd"), category_id))
+        # Queued on the writer thread; the dialog closes once it is committed
+        self.set_saving(True)
+        date_str = self.date_input.date().toString("yyyy-MM-dd")
+        get_expense_writer().add_expense(self.username, item, price, date_str, category_id,
+                                         on_done=lambda expense_id: self.saved(
+                                             Expense(expense_id, item, price, date_str, category_name)),
+                                         on_error=self.save_failed)
+
+    def set_saving(self, saving):
+        """Lock the buttons while a save is queued, so the row can't land after a cancel"""
+        self.saving = saving
+        self.save_btn.setEnabled(not saving)
+        self.cancel_btn.setEnabled(not saving)
+
+    def reject(self):
+        # Esc and the close button end up here too
+        if not self.saving:
+            super().reject()
+
+    def saved(self, expense):
+        self.saving = False
+        self.saved_expense = expense
+        self.accept()
 
-        conn.commit()
-        conn.close()
+    def category_order(self):
+        """Category names in id order, as the month view sorts its groups"""
+        return [self.category_combo.itemText(i) for i in range(self.category_combo.count())]
 
-        self.accept()
+    def save_failed(self, error):
+        self.set_saving(False)
+        QMessageBox.warning(self, "Database Error", f"Failed to save expense: {str(error)}")
 
 
 # === Month Detail Widget ===
 
+# Only the newest month query is delivered; switching months drops the rest
+MONTH_QUERY_KEY = "month_detail"
+SECTION_QUERY_KEY = "month_sections"
+
+def fetch_month(username, year, month, generation):
+    # Runs on a query worker thread. Only monthly_summary is read here;
+    # expanded sections stream their rows in afterwards. The expanded set
+    # is read here too, so set_month's get() on the GUI thread is a lookup.
+    get_expanded_categories().preload(username)
+    data = load_month_summary(username, year, month)
+    get_month_cache().put_month(username, year, month, data, generation)
+    return data
+
 class MonthDetailWidget(QWidget):
+    expenses_changed = pyqtSignal()
+
     def __init__(self, month, username):
         super().__init__()
         self.month = month
         self.username = username
         self.current_year = datetime.now().year
+        months = ["January", "February", "March", "April", "May", "June",
+                  "July", "August", "September", "October", "November", "December"]
+        self.month_num = months.index(month) + 1
+        self.loaded = False
+        self.section_stream = None
         self.initUI()
 
     def initUI(self):
@@ -716,22 +587,11 @@ class MonthDetailWidget(QWidget):
 
         header_layout = QHBoxLayout()
         month_label = QLabel(f"{self.month} {self.current_year}")
-        month_label.setFont(QFont("Segoe UI", 16, QFont.Bold))
-        month_label.setStyleSheet("color: #2c3e50;")
+        month_label.setObjectName("monthTitle")
+        month_label.setFont(font("title"))
 
         add_btn = QPushButton("+ Add Expense")
-        add_btn.setStyleSheet("""
-            QPushButton { 
-                background-color: #3498db; 
-                color: white; 
-                border-radius: 5px; 
-                padding: 8px; 
-                font-weight: bold;
-            }
-            QPushButton:hover { 
-                background-color: #2980b9; 
-            }
-        """)
+        add_btn.setObjectName("primaryButton")
         add_btn.setCursor(Qt.PointingHandCursor)
         add_btn.clicked.connect(self.add_expense)
 
@@ -740,33 +600,46 @@ class MonthDetailWidget(QWidget):
         header_layout.addWidget(add_btn)
         main_layout.addLayout(header_layout)
 
-        expenses_container = QScrollArea()
-        expenses_container.setWidgetResizable(True)
-        expenses_container.setFrameShape(QFrame.NoFrame)
-        expenses_container.setStyleSheet("background-color: transparent;")
-
-        self.expenses_widget = QWidget()
-        self.expenses_layout = QVBoxLayout(self.expenses_widget)
-        self.expenses_layout.setContentsMargins(0, 0, 0, 0)
-        self.expenses_layout.setSpacing(10)
-        self.expenses_layout.addStretch()
-
-        expenses_container.setWidget(self.expenses_widget)
-        main_layout.addWidget(expenses_container)
+        self.status_label = QLabel()
+        self.status_label.setObjectName("statusLabel")
+        self.status_label.setFont(font("body"))
+        self.status_label.setAlignment(Qt.AlignHCenter | Qt.AlignTop)
+        main_layout.addWidget(self.status_label, 1)
+
+        # Rows are painted by a delegate; only the visible ones cost anything
+        self.expense_model = ExpenseListModel(self)
+        self.expense_view = ExpenseListView()
+        self.expense_view.setModel(self.expense_model)
+        self.expense_view.delegate.delete_requested.connect(self.delete_expense)
+        self.expense_view.delegate.toggle_requested.connect(self.toggle_section)
+        self.expense_view.hide()
+        main_layout.addWidget(self.expense_view, 1)
 
         self.total_label = QLabel("Total: ₱0.00")
-        self.total_label.setFont(QFont("Segoe UI", 14, QFont.Bold))
-        self.total_label.setStyleSheet("color: #16a085; padding: 10px 0;")
+        self.total_label.setObjectName("monthTotal")
+        self.total_label.setFont(font("heading_large"))
         self.total_label.setAlignment(Qt.AlignRight)
         main_layout.addWidget(self.total_label)
 
-        self.load_expenses()
+    def showEvent(self, event):
+        super().showEvent(event)
+        # Months are loaded the first time they are shown, not up front
+        if not self.loaded:
+            self.load_expenses()
+        elif not self.streaming():
+            # Sections whose stream was stopped when the user switched months
+            self.fetch_open_sections()
 
     def add_expense(self):
         dialog = AddExpenseDialog(self.month, self.username)
         result = dialog.exec_()
         if result == QDialog.Accepted:
-            self.load_expenses()
+            if self.loaded and dialog.saved_expense is not None:
+                self.expense_model.insert_expense(dialog.saved_expense, dialog.category_order())
+                self.expenses_patched()
+                self.fetch_open_sections()
+            else:
+                self.expenses_modified()
 
     def delete_expense(self, expense_id):
         reply = QMessageBox.question(self, "Confirm Delete",
@@ -774,202 +647,118 @@ class MonthDetailWidget(QWidget):
                                      QMessageBox.Yes | QMessageBox.No, QMessageBox.No)
 
         if reply == QMessageBox.Yes:
-            conn = sqlite3.connect(DB_PATH)
-            c = conn.cursor()
-            c.execute("DELETE FROM expenses WHERE id = ?", (expense_id,))
-            conn.commit()
-            conn.close()
-            self.load_expenses()
+            get_expense_writer().delete_expense(expense_id,
+                                                on_done=lambda _: self.expense_deleted(expense_id),
+                                                on_error=self.delete_failed)
+
+    def expense_deleted(self, expense_id):
+        if self.loaded and self.expense_model.remove_expense(expense_id):
+            self.expenses_patched()
+        else:
+            self.expenses_modified()
+
+    def expenses_patched(self):
+        # The model was updated in place; the cache and totals follow it
+        get_month_cache().invalidate(self.username, self.current_year, self.month_num)
+        self.update_totals()
+        self.expenses_changed.emit()
+
+    def expenses_modified(self):
+        # Fallback: the cached copy of this month is stale, reload all of it
+        get_month_cache().invalidate(self.username, self.current_year, self.month_num)
+        self.load_expenses()
+        self.expenses_changed.emit()
+
+    def delete_failed(self, error):
+        QMessageBox.warning(self, "Database Error", f"Failed to delete expense: {str(error)}")
+
+    def show_status(self, text):
+        self.expense_view.hide()
+        self.status_label.setText(text)
+        self.status_label.show()
 
     def load_expenses(self):
-        while self.expenses_layout.count() > 1:
-            item = self.expenses_layout.takeAt(0)
-            if item.widget():
-                item.widget().deleteLater()
+        cache = get_month_cache()
+        cached = cache.get(self.username, self.current_year, self.month_num)
+        if cached is not None:
+            get_query_executor().cancel(MONTH_QUERY_KEY)
+            get_query_executor().cancel(SECTION_QUERY_KEY)
+            self.render_expenses(cached)
+            return
 
-        months = ["January", "February", "March", "April", "May", "June",
-                  "July", "August", "September", "October", "November", "December"]
-        month_num = months.index(self.month) + 1
+        self.total_label.setText("Loading…")
+        if not self.loaded:
+            self.show_status("Loading expenses…")
+
+        get_query_executor().submit(fetch_month, self.username, self.current_year, self.month_num,
+                                    cache.generation,
+                                    key=MONTH_QUERY_KEY,
+                                    on_result=self.render_expenses,
+                                    on_error=self.load_failed)
+
+    def load_failed(self, error):
+        QMessageBox.warning(self, "Database Error", f"Failed to load expenses: {str(error)}")
+        self.render_expenses(EMPTY_MONTH)
+
+    def render_expenses(self, view):
+        # Grouping, totals and formatting were done off the GUI thread
+        self.loaded = True
+        self.expense_model.set_month(view, get_expanded_categories().get(self.username))
+        self.update_totals()
+        self.fetch_open_sections()
+
+    def toggle_section(self, category):
+        expanded = self.expense_model.toggle(category)
+        get_expanded_categories().set_expanded(self.username, category, expanded)
+        get_expense_writer().set_category_expanded(self.username, category, expanded)
+        if expanded:
+            self.fetch_open_sections()
+
+    def fetch_open_sections(self):
+        # Every expanded section still missing rows, in one stream. A new
+        # stream stops the running one, so its sections start over.
+        pending = self.expense_model.pending_categories()
+        if pending:
+            for category in pending:
+                self.expense_model.discard_partial_rows(category)
+            self.section_stream = get_query_executor().stream(
+                stream_category_rows, self.username, self.current_year, self.month_num, pending,
+                key=SECTION_QUERY_KEY,
+                on_chunk=self.section_chunk,
+                on_error=self.sections_failed)
+
+    def streaming(self):
+        return (self.section_stream is not None
+                and get_query_executor().is_current(self.section_stream, SECTION_QUERY_KEY))
+
+    def section_chunk(self, chunk):
+        # One chunk per event-loop turn; the first is small so rows show at once
+        category, rows = chunk
+        if rows is None:
+            self.expense_model.finish_category_rows(category)
+            self.update_totals()
+        else:
+            self.expense_model.add_category_rows(category, rows)
 
-        conn = sqlite3.connect(DB_PATH)
-        c = conn.cursor()
+    def sections_failed(self, error):
+        QMessageBox.warning(self, "Database Error", f"Failed to load expenses: {str(error)}")
 
-        try:
-            c.execute("""
-                     SELECT c.name, SUM(e.price), GROUP_CONCAT(e.id), GROUP_CONCAT(e.item), 
-                            GROUP_CONCAT(e.price), GROUP_CONCAT(e.date)
-                     FROM expenses e
-                     JOIN categories c ON e.category_id = c.id
-                     WHERE e.username = ? 
-                     AND strftime('%m', e.date) = ?
-                     AND strftime('%Y', e.date) = ?
-                     GROUP BY c.name
-                     ORDER BY c.id
-                 """, (self.username, f"{month_num:02d}", str(self.current_year)))
-
-            category_data = c.fetchall()
-
-            c.execute("""
-                     SELECT e.id, e.item, e.price, e.date, c.name
-                     FROM expenses e
-                     JOIN categories c ON e.category_id = c.id
-                     WHERE e.username = ? 
-                     AND strftime('%m', e.date) = ?
-                     AND strftime('%Y', e.date) = ?
-                     ORDER BY c.id, e.date
-                 """, (self.username, f"{month_num:02d}", str(self.current_year)))
-
-            expenses = c.fetchall()
-        except sqlite3.OperationalError as e:
-            QMessageBox.warning(self, "Database Error", f"Failed to load expenses: {str(e)}")
-            category_data = []
-            expenses = []
-
-        conn.close()
-
-        total = 0
-
-        if not expenses:
-            empty_label = QLabel("No expenses recorded for this month.\nClick '+ Add Expense' to get started.")
-            empty_label.setFont(QFont("Segoe UI", 11))
-            empty_label.setStyleSheet("color: #95a5a6; padding: 20px 0;")
-            empty_label.setAlignment(Qt.AlignCenter)
-            self.expenses_layout.insertWidget(0, empty_label)
+    def update_totals(self):
+        if self.expense_model.expense_count():
+            self.status_label.hide()
+            self.expense_view.show()
         else:
-            current_category = None
-            category_total = 0
-
-            for expense_id, item, price, date_str, category in expenses:
-                if category != current_category:
-                    if current_category is not None:
-                        cat_total_frame = QFrame()
-                        cat_total_frame.setStyleSheet("""
-                                 QFrame { 
-                                     background-color: #e8f4f8; 
-                                     border-radius: 5px; 
-                                     padding: 10px;
-                                 }
-                             """)
-                        cat_total_layout = QHBoxLayout(cat_total_frame)
-
-                        cat_total_label = QLabel(f"{current_category} Total:")
-                        cat_total_label.setFont(QFont("Segoe UI", 10, QFont.Bold))
-                        cat_total_label.setStyleSheet("color: #2980b9;")
-
-                        cat_total_value = QLabel(f"₱{category_total:,.2f}")
-                        cat_total_value.setFont(QFont("Segoe UI", 10, QFont.Bold))
-                        cat_total_value.setStyleSheet("color: #2980b9;")
-                        cat_total_value.setAlignment(Qt.AlignRight | Qt.AlignVCenter)
-
-                        cat_total_layout.addWidget(cat_total_label)
-                        cat_total_layout.addStretch()
-                        cat_total_layout.addWidget(cat_total_value)
-
-                        self.expenses_layout.insertWidget(self.expenses_layout.count() - 1, cat_total_frame)
-
-                    current_category = category
-                    category_total = 0
-
-                    category_header = QLabel(current_category)
-                    category_header.setFont(QFont("Segoe UI", 12, QFont.Bold))
-                    category_header.setStyleSheet("""
-                             QLabel { 
-                                 color: #2c3e50; 
-                                 padding: 5px 0;
-                                 border-bottom: 2px solid #3498db;
-                             }
-                         """)
-                    self.expenses_layout.insertWidget(self.expenses_layout.count() - 1, category_header)
-
-                expense_frame = QFrame()
-                expense_frame.setStyleSheet("""
-                         QFrame { 
-                             background-color: #f9f9f9; 
-                             border-radius: 5px; 
-                             padding: 10px;
-                         }
-                     """)
-
-                expense_layout = QHBoxLayout(expense_frame)
-                expense_layout.setContentsMargins(10, 10, 10, 10)
-
-                date = datetime.strptime(date_str, "%Y-%m-%d")
-                formatted_date = date.strftime("%b %d, %Y")
-
-                date_label = QLabel(formatted_date)
-                date_label.setFont(QFont("Segoe UI", 10))
-                date_label.setStyleSheet("color: #7f8c8d;")
-                date_label.setFixedWidth(120)
-
-                item_label = QLabel(item)
-                item_label.setFont(QFont("Segoe UI", 11))
-                item_label.setStyleSheet("color: #2c3e50;")
-
-                price_label = QLabel(f"₱{price:,.2f}")
-                price_label.setFont(QFont("Segoe UI", 11, QFont.Bold))
-                price_label.setStyleSheet("color: #16a085;")
-                price_label.setFixedWidth(100)
-                price_label.setAlignment(Qt.AlignRight | Qt.AlignVCenter)
-
-                delete_btn = QPushButton("×")
-                delete_btn.setStyleSheet("""
-                    QPushButton { 
-                        background-color: #e74c3c; 
-                        color: white; 
-                        border-radius: 10px; 
-                        font-weight: bold; 
-                        width: 20px; 
-                        height: 20px;
-                    }
-                    QPushButton:hover { 
-                        background-color: #c0392b; 
-                    }
-                """)
-                delete_btn.setCursor(Qt.PointingHandCursor)
-                delete_btn.setFixedSize(20, 20)
-                delete_btn.clicked.connect(lambda checked, eid=expense_id: self.delete_expense(eid))
-
-                expense_layout.addWidget(date_label)
-                expense_layout.addWidget(item_label)
-                expense_layout.addWidget(price_label)
-                expense_layout.addWidget(delete_btn)
-
-                self.expenses_layout.insertWidget(self.expenses_layout.count() - 1, expense_frame)
-
-                category_total += price
-                total += price
-
-            if current_category is not None:
-                cat_total_frame = QFrame()
-                cat_total_frame.setStyleSheet("""
-                    QFrame { 
-                        background-color: #e8f4f8; 
-                        border-radius: 5px; 
-                        padding: 10px;
-                    }
-                """)
-                cat_total_layout = QHBoxLayout(cat_total_frame)
-
-                cat_total_label = QLabel(f"{current_category} Total:")
-                cat_total_label.setFont(QFont("Segoe UI", 10, QFont.Bold))
-                cat_total_label.setStyleSheet("color: #2980b9;")
-
-                cat_total_value = QLabel(f"₱{category_total:,.2f}")
-                cat_total_value.setFont(QFont("Segoe UI", 10, QFont.Bold))
-                cat_total_value.setStyleSheet("color: #2980b9;")
-                cat_total_value.setAlignment(Qt.AlignRight | Qt.AlignVCenter)
-
-                cat_total_layout.addWidget(cat_total_label)
-                cat_total_layout.addStretch()
-                cat_total_layout.addWidget(cat_total_value)
-
-                self.expenses_layout.insertWidget(self.expenses_layout.count() - 1, cat_total_frame)
-
-        self.total_label.setText(f"Total: ₱{total:,.2f}")
+            self.show_status("No expenses recorded for this month.\nClick '+ Add Expense' to get started.")
+
+        self.total_label.setText(f"Total: ₱{self.expense_model.total():,.2f}")
 
 
 # === Main Expense Tracker Window ===
 
+# Month pages are built on first view; beyond this many the least
+# recently viewed page is torn down and rebuilt if it is visited again
+MAX_MONTH_PAGES = 3
+
 class ExpenseTrackerWindow(QMainWindow):
     def __init__(self, username):
         super().__init__()
@@ -979,12 +768,18 @@ class ExpenseTrackerWindow(QMainWindow):
                        "July", "August", "September", "October", "November", "December"]
         self.current_month = self.months[datetime.now().month - 1]
         self.month_cards = {}
+        self.month_pages = OrderedDict()
         self.initUI()
 
     def initUI(self):
         self.setWindowTitle("Expense Tracker")
         self.setGeometry(100, 100, 1000, 700)
-        self.setStyleSheet("background-color: white;")
+        self.setObjectName("trackerWindow")
+
+        file_menu = self.menuBar().addMenu("File")
+        self.export_action = QAction("Export Expenses...", self)
+        self.export_action.triggered.connect(self.export_expenses)
+        file_menu.addAction(self.export_action)
 
         main_widget = QWidget()
         main_layout = QVBoxLayout(main_widget)
@@ -992,23 +787,28 @@ class ExpenseTrackerWindow(QMainWindow):
         main_layout.setSpacing(0)
 
         header = QFrame()
-        header.setStyleSheet("background-color: #3498db;")
+        header.setObjectName("appHeader")
         header.setFixedHeight(60)
 
         header_layout = QHBoxLayout(header)
         header_layout.setContentsMargins(20, 0, 20, 0)
 
         app_title = QLabel("Expense Tracker")
-        app_title.setFont(QFont("Segoe UI", 16, QFont.Bold))
-        app_title.setStyleSheet("color: white;")
+        app_title.setObjectName("appTitle")
+        app_title.setFont(font("title"))
 
         user_label = QLabel(f"Welcome, {self.username}")
-        user_label.setFont(QFont("Segoe UI", 12))
-        user_label.setStyleSheet("color: white;")
+        user_label.setObjectName("welcomeLabel")
+        user_label.setFont(font("body_large"))
+
+        profile_label = QLabel(f"DB profile: {get_repository().profile}")
+        profile_label.setObjectName("profileLabel")
+        profile_label.setFont(font("caption"))
 
         header_layout.addWidget(app_title)
         header_layout.addStretch()
         header_layout.addWidget(user_label)
+        header_layout.addWidget(profile_label)
 
         main_layout.addWidget(header)
 
@@ -1018,9 +818,10 @@ class ExpenseTrackerWindow(QMainWindow):
         months_scroll.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
         months_scroll.setVerticalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
         months_scroll.setFixedHeight(100)
-        months_scroll.setStyleSheet("background-color: #f8f9fa;")
+        months_scroll.setObjectName("monthStrip")
 
         months_widget = QWidget()
+        months_widget.setObjectName("monthStripContents")
         months_layout = QHBoxLayout(months_widget)
         months_layout.setContentsMargins(20, 10, 20, 10)
         months_layout.setSpacing(15)
@@ -1039,35 +840,109 @@ class ExpenseTrackerWindow(QMainWindow):
 
         self.month_detail_stack = QStackedWidget()
 
-        for month in self.months:
-            detail_widget = MonthDetailWidget(month, self.username)
-            self.month_detail_stack.addWidget(detail_widget)
-
-        current_month_index = self.months.index(self.current_month)
-        self.month_detail_stack.setCurrentIndex(current_month_index)
+        self.show_month_page(self.current_month)
 
         main_layout.addWidget(self.month_detail_stack)
 
         self.setCentralWidget(main_widget)
+        self.prefetch_year()
+
+    def export_expenses(self):
+        filters = {"CSV (*.csv)": "csv", "JSON Lines (*.jsonl)": "jsonl", "NumPy snapshot (*.npz)": "npz"}
+        path, selected = QFileDialog.getSaveFileName(self, "Export Expenses",
+                                                     f"{self.username}_expenses.csv",
+                                                     ";;".join(filters))
+        if not path:
+            return
+
+        fmt = filters.get(selected, "csv")
+        if not path.lower().endswith(f".{fmt}"):
+            path = f"{path}.{fmt}"
+
+        # Streams on a query worker; the menu item stays off until it is done
+        self.export_action.setEnabled(False)
+        get_query_executor().submit(export_expenses, get_repository(), self.username, path, fmt,
+                                    on_result=lambda count: self.export_done(count, path),
+                                    on_error=self.export_failed)
+
+    def export_done(self, count, path):
+        self.export_action.setEnabled(True)
+        QMessageBox.information(self, "Export Complete", f"Exported {count:,} expenses to {path}")
+
+    def export_failed(self, error):
+        self.export_action.setEnabled(True)
+        QMessageBox.warning(self, "Export Failed", f"Failed to export expenses: {str(error)}")
+
+    def prefetch_year(self):
+        # One range query for the whole year; month cards are then served from memory
+        generation = get_month_cache().generation
+        get_query_executor().submit(fetch_year, self.username, self.current_year,
+                                    key="year_prefetch",
+                                    on_result=lambda block: self.year_prefetched(block, generation))
+
+    def year_prefetched(self, block, generation):
+        cache = get_month_cache()
+        if cache.put_year(self.username, self.current_year, block, generation):
+            self.apply_month_totals(cache.year_totals(self.username, self.current_year))
+        else:
+            # An expense changed while the year was loading
+            self.refresh_month_totals()
+
+    def refresh_month_totals(self):
+        totals = get_month_cache().year_totals(self.username, self.current_year)
+        if totals is not None:
+            self.apply_month_totals(totals)
+            return
+        get_query_executor().submit(get_repository().month_totals, self.username, self.current_year,
+                                    key="month_totals", on_result=self.apply_month_totals)
+
+    def apply_month_totals(self, totals):
+        for i, month in enumerate(self.months):
+            self.month_cards[month].setTotal(totals.get(i + 1, 0))
 
     def show_month_detail(self, month):
         if month in self.month_cards:
             for m, card in self.month_cards.items():
                 card.setActiveStyle(m == month)
 
-            idx = self.months.index(month)
-            self.month_detail_stack.setCurrentIndex(idx)
+            # A month still loading in the background is no longer wanted
+            get_query_executor().cancel(MONTH_QUERY_KEY)
+            get_query_executor().cancel(SECTION_QUERY_KEY)
+
+            self.show_month_page(month)
+
+    def show_month_page(self, month):
+        page = self.month_pages.get(month)
+        if page is None:
+            page = MonthDetailWidget(month, self.username)
+            page.expenses_changed.connect(self.refresh_month_totals)
+            self.month_detail_stack.addWidget(page)
+            self.month_pages[month] = page
+        self.month_pages.move_to_end(month)
+        self.month_detail_stack.setCurrentWidget(page)
+
+        while len(self.month_pages) > MAX_MONTH_PAGES:
+            _, stale = self.month_pages.popitem(last=False)
+            self.month_detail_stack.removeWidget(stale)
+            stale.deleteLater()
 
 
 # === Main Application ===
 
 class ExpenseTrackerApp(QApplication):
-    def __init__(self, args):
+    def __init__(self, args, startup_hook=report_startup_timing):
         super().__init__(args)
+        self.startup_hook = startup_hook
+        self.startup_timings = {}
         self.initApp()
 
     def initApp(self):
+        # One stylesheet for every window, parsed once
+        apply_theme(self)
+
+        start = time.perf_counter()
         setup_database()
+        self.startup_timings["setup_database"] = time.perf_counter() - start
 
         self.auth_window = QMainWindow()
         self.auth_window.setWindowTitle("Expense Tracker - Login")
@@ -1086,9 +961,24 @@ class ExpenseTrackerApp(QApplication):
         self.auth_stack.addWidget(register_page)
         self.auth_stack.setCurrentIndex(0)
 
+        # Commit whatever is still queued before the process exits
+        self.aboutToQuit.connect(stop_expense_writer)
+        self.aboutToQuit.connect(self.print_cache_stats)
+
         self.auth_window.setCentralWidget(self.auth_stack)
         self.auth_window.show()
 
+        # Runs on the first event loop turn, once the login window is up
+        QTimer.singleShot(0, self.finish_startup_timing)
+
+    def print_cache_stats(self):
+        print_stats(get_repository().cache.stats())
+
+    def finish_startup_timing(self):
+        self.startup_timings["time_to_login_window"] = time.perf_counter() - PROCESS_START
+        if self.startup_hook:
+            self.startup_hook(self.startup_timings)
+
     def launch_expense_tracker(self, username):
         self.auth_window.hide()
         self.expense_tracker = ExpenseTrackerWindow(username)
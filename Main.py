@@ -1,19 +1,17 @@
-import os
 import tkinter as tk
 from tkinter import ttk, messagebox
-import csv
+from datetime import date
 
-# === CSV Setup ===
-USER_CSV = 'users.csv'
-EXPENSE_CSV = 'expenses.csv'
+from storage_backend import open_backend
+from tk_worker import TkIOWorker
+from month_view import MONTH_NUMBERS, build_month_view
 
-# Ensure files exist with headers
-if not os.path.exists(USER_CSV):
-    with open(USER_CSV, 'w', newline='') as f:
-        csv.writer(f).writerow(['username', 'name', 'email', 'password'])
-if not os.path.exists(EXPENSE_CSV):
-    with open(EXPENSE_CSV, 'w', newline='') as f:
-        csv.writer(f).writerow(['username', 'month', 'category', 'item', 'amount'])
+# === Storage ===
+# users.csv / expenses.csv by default; EXPENSE_STORAGE=sqlite or memory
+# switches to another backend (see storage_backend.py). The month picker
+# has no year, so it shows and adds to the current year; expenses.csv
+# rows from before dates were stored show up in every year.
+YEAR = date.today().year
 
 
 # === Register Page ===
@@ -64,15 +62,13 @@ class RegisterPage(tk.Frame):
             messagebox.showwarning("Missing Fields", "Username and password are required.")
             return
 
-        with open(USER_CSV, 'r', newline='') as f:
-            reader = csv.reader(f)
-            next(reader, None)
-            if any(row and row[0] == uname for row in reader):
-                messagebox.showwarning("Exists", "Username already exists.")
-                return
+        self.master.io.submit(lambda: self.master.storage.add_user(uname, name, email, pwd),
+                              key="register", on_result=self.registered)
 
-        with open(USER_CSV, 'a', newline='') as f:
-            csv.writer(f).writerow([uname, name, email, pwd])
+    def registered(self, added):
+        if not added:
+            messagebox.showwarning("Exists", "Username already exists.")
+            return
 
         messagebox.showinfo("Success", "Registered Successfully!")
         self.master.show_frame(LoginPage)
@@ -115,16 +111,16 @@ class LoginPage(tk.Frame):
         uname = self.user_e.get().strip()
         pwd   = self.pwd_e.get().strip()
 
-        with open(USER_CSV, 'r', newline='') as f:
-            reader = csv.reader(f)
-            next(reader, None)
-            for row in reader:
-                if len(row) >= 4 and row[0] == uname and row[3] == pwd:
-                    self.master.current_user = uname
-                    messagebox.showinfo("Login Success", f"Welcome, {row[1]}!")
-                    self.master.show_frame(ExpenseTrackerPage)
-                    return
-        messagebox.showerror("Failed", "Invalid username or password.")
+        self.master.io.submit(lambda: self.master.storage.authenticate(uname, pwd),
+                              key="login", on_result=lambda user: self.logged_in(uname, user))
+
+    def logged_in(self, uname, user):
+        if user is None:
+            messagebox.showerror("Failed", "Invalid username or password.")
+            return
+        self.master.current_user = uname
+        messagebox.showinfo("Login Success", f"Welcome, {user.name}!")
+        self.master.show_frame(ExpenseTrackerPage)
 
 
 # === Expense Tracker Page ===
@@ -191,29 +187,41 @@ class ExpenseTrackerPage(tk.Frame):
             messagebox.showerror("Invalid", "Price must be a number.")
             return
 
-        with open(EXPENSE_CSV, 'a', newline='') as f:
-            csv.writer(f).writerow([self.master.current_user, month, cat, item, amt])
+        user = self.master.current_user
+        expense_date = f"{YEAR:04d}-{MONTH_NUMBERS[month]:02d}-01"
+        self.master.io.submit(lambda: self.master.storage.add(user, item, amt, expense_date, cat),
+                              on_error=self.add_failed)
 
+        # Queued behind the append, so the reload includes the new row
         self.load_history()
         self.item_e.delete(0, tk.END)
         self.price_e.delete(0, tk.END)
 
+    def add_failed(self, error):
+        messagebox.showerror("Error", f"Could not save expense: {error}")
+
     def load_history(self):
-        self.listbox.delete(0, tk.END)
         month = self.month_cb.get()
         user  = getattr(self.master, 'current_user', None)
-        total = 0.0
+        # Keyed, so quick month changes only apply the last one
+        self.master.io.submit(self.read_month, user, month, key="load_history",
+                              on_result=lambda view: self.show_history(month, view))
 
-        with open(EXPENSE_CSV, 'r', newline='') as f:
-            reader = csv.reader(f)
-            next(reader, None)
-            for row in reader:
-                if len(row) >= 5 and row[0] == user and row[1] == month:
-                    amt = float(row[4])
-                    total += amt
-                    self.listbox.insert(tk.END, f"{row[3]} ({row[2]}) – ₱{amt:,.2f}")
+    def read_month(self, user, month):
+        """Runs on the I/O thread; only this user's month is read from storage"""
+        expenses = self.master.storage.list_month(user, YEAR, MONTH_NUMBERS[month])
 
-        self.total_lbl.config(text=f"Total for {month}: ₱{total:,.2f}")
+        # Same month view model as the Qt frontend: rows grouped by category
+        return build_month_view(expenses)
+
+    def show_history(self, month, view):
+        self.listbox.delete(0, tk.END)
+        lines = [f"{expense.item} ({expense.category}) – {expense.price_text}"
+                 for group in view.groups for expense in group.rows]
+        if lines:
+            self.listbox.insert(tk.END, *lines)
+
+        self.total_lbl.config(text=f"Total for {month}: {view.total_text}")
 
 
 # === Main Application ===
@@ -225,6 +233,13 @@ class ExpenseApp(tk.Tk):
         self.resizable(False, False)
         self.current_user = None
 
+        # All storage I/O runs on this worker; opening the backend is its first job
+        self.io = TkIOWorker(self, on_busy=self.set_busy)
+        self.io.submit(self.open_storage)
+        self.status_lbl = tk.Label(self, text="Working…", font=("Segoe UI", 9),
+                                   bg="#f4f8fb", fg="#7f8c8d")
+        self.protocol("WM_DELETE_WINDOW", self.close)
+
         # Create and grid all frames
         self.frames = {}
         for Page in (RegisterPage, LoginPage, ExpenseTrackerPage):
@@ -236,6 +251,27 @@ class ExpenseApp(tk.Tk):
 
     def show_frame(self, page_cls):
         self.frames[page_cls].tkraise()
+        if self.io.busy:
+            self.status_lbl.lift()
+
+    def open_storage(self):
+        """Runs on the I/O thread; loading the users and the expense index can take a while"""
+        self.storage = open_backend()
+
+    def set_busy(self, busy):
+        self.config(cursor="watch" if busy else "")
+        if busy:
+            self.status_lbl.place(relx=0.5, rely=1.0, anchor="s", y=-6)
+            self.status_lbl.lift()
+        else:
+            self.status_lbl.place_forget()
+
+    def close(self):
+        # Let queued appends reach storage before the window goes
+        self.io.stop()
+        if hasattr(self, 'storage'):
+            self.storage.close()
+        self.destroy()
 
 
 if __name__ == "__main__":
@@ -1,12 +1,30 @@
 
 # === Month Detail Widget ===
 
+# Only the newest month query is delivered; switching months drops the rest
+MONTH_QUERY_KEY = "month_detail"
+SECTION_QUERY_KEY = "month_sections"
+
+def fetch_month(username, year, month, generation):
+    # Runs on a query worker thread. Only monthly_summary is read here;
+    # expanded sections stream their rows in afterwards. The expanded set
+    # is read here too, so set_month's get() on the GUI thread is a lookup.
+    get_expanded_categories().preload(username)
+    data = load_month_summary(username, year, month)
+    get_month_cache().put_month(username, year, month, data, generation)
+    return data
+
 class MonthDetailWidget(QWidget):
     def __init__(self, month, username):
         super().__init__()
         self.month = month
         self.username = username
         self.current_year = datetime.now().year
+        months = ["January", "February", "March", "April", "May", "June",
+                  "July", "August", "September", "October", "November", "December"]
+        self.month_num = months.index(month) + 1
+        self.loaded = False
+        self.section_stream = None
         self.initUI()
 
     def initUI(self):
@@ -16,22 +34,11 @@ class MonthDetailWidget(QWidget):
 
         header_layout = QHBoxLayout()
         month_label = QLabel(f"{self.month} {self.current_year}")
-        month_label.setFont(QFont("Segoe UI", 16, QFont.Bold))
-        month_label.setStyleSheet("color: #2c3e50;")
+        month_label.setObjectName("monthTitle")
+        month_label.setFont(font("title"))
 
         add_btn = QPushButton("+ Add Expense")
-        add_btn.setStyleSheet("""
-            QPushButton { 
-                background-color: #3498db; 
-                color: white; 
-                border-radius: 5px; 
-                padding: 8px; 
-                font-weight: bold;
-            }
-            QPushButton:hover { 
-                background-color: #2980b9; 
-            }
-        """)
+        add_btn.setObjectName("primaryButton")
         add_btn.setCursor(Qt.PointingHandCursor)
         add_btn.clicked.connect(self.add_expense)
 
@@ -40,33 +47,46 @@ class MonthDetailWidget(QWidget):
         header_layout.addWidget(add_btn)
         main_layout.addLayout(header_layout)
 
-        expenses_container = QScrollArea()
-        expenses_container.setWidgetResizable(True)
-        expenses_container.setFrameShape(QFrame.NoFrame)
-        expenses_container.setStyleSheet("background-color: transparent;")
-
-        self.expenses_widget = QWidget()
-        self.expenses_layout = QVBoxLayout(self.expenses_widget)
-        self.expenses_layout.setContentsMargins(0, 0, 0, 0)
-        self.expenses_layout.setSpacing(10)
-        self.expenses_layout.addStretch()
-
-        expenses_container.setWidget(self.expenses_widget)
-        main_layout.addWidget(expenses_container)
+        self.status_label = QLabel()
+        self.status_label.setObjectName("statusLabel")
+        self.status_label.setFont(font("body"))
+        self.status_label.setAlignment(Qt.AlignHCenter | Qt.AlignTop)
+        main_layout.addWidget(self.status_label, 1)
+
+        # Rows are painted by a delegate; only the visible ones cost anything
+        self.expense_model = ExpenseListModel(self)
+        self.expense_view = ExpenseListView()
+        self.expense_view.setModel(self.expense_model)
+        self.expense_view.delegate.delete_requested.connect(self.delete_expense)
+        self.expense_view.delegate.toggle_requested.connect(self.toggle_section)
+        self.expense_view.hide()
+        main_layout.addWidget(self.expense_view, 1)
 
         self.total_label = QLabel("Total: ₱0.00")
-        self.total_label.setFont(QFont("Segoe UI", 14, QFont.Bold))
-        self.total_label.setStyleSheet("color: #16a085; padding: 10px 0;")
+        self.total_label.setObjectName("monthTotal")
+        self.total_label.setFont(font("heading_large"))
         self.total_label.setAlignment(Qt.AlignRight)
         main_layout.addWidget(self.total_label)
 
-        self.load_expenses()
+    def showEvent(self, event):
+        super().showEvent(event)
+        # Months are loaded the first time they are shown, not up front
+        if not self.loaded:
+            self.load_expenses()
+        elif not self.streaming():
+            # Sections whose stream was stopped when the user switched months
+            self.fetch_open_sections()
 
     def add_expense(self):
         dialog = AddExpenseDialog(self.month, self.username)
         result = dialog.exec_()
         if result == QDialog.Accepted:
-            self.load_expenses()
+            if self.loaded and dialog.saved_expense is not None:
+                self.expense_model.insert_expense(dialog.saved_expense, dialog.category_order())
+                self.expenses_patched()
+                self.fetch_open_sections()
+            else:
+                self.expenses_modified()
 
     def delete_expense(self, expense_id):
         reply = QMessageBox.question(self, "Confirm Delete",
@@ -74,204 +94,105 @@ class MonthDetailWidget(QWidget):
                                      QMessageBox.Yes | QMessageBox.No, QMessageBox.No)
 
         if reply == QMessageBox.Yes:
-            conn = sqlite3.connect(DB_PATH)
-            c = conn.cursor()
-            c.execute("DELETE FROM expenses WHERE id = ?", (expense_id,))
-            conn.commit()
-            conn.close()
-            self.load_expenses()
+            get_expense_writer().delete_expense(expense_id,
+                                                on_done=lambda _: self.expense_deleted(expense_id),
+                                                on_error=self.delete_failed)
+
+    def expense_deleted(self, expense_id):
+        if self.loaded and self.expense_model.remove_expense(expense_id):
+            self.expenses_patched()
+        else:
+            self.expenses_modified()
+
+    def expenses_patched(self):
+        # The model was updated in place; the cache and totals follow it
+        get_month_cache().invalidate(self.username, self.current_year, self.month_num)
+        self.update_totals()
+
+    def expenses_modified(self):
+        # Fallback: the cached copy of this month is stale, reload all of it
+        get_month_cache().invalidate(self.username, self.current_year, self.month_num)
+        self.load_expenses()
+
+    def delete_failed(self, error):
+        QMessageBox.warning(self, "Database Error", f"Failed to delete expense: {str(error)}")
+
+    def show_status(self, text):
+        self.expense_view.hide()
+        self.status_label.setText(text)
+        self.status_label.show()
 
     def load_expenses(self):
-        while self.expenses_layout.count() > 1:
-            item = self.expenses_layout.takeAt(0)
-            if item.widget():
-                item.widget().deleteLater()
+        cache = get_month_cache()
+        cached = cache.get(self.username, self.current_year, self.month_num)
+        if cached is not None:
+            get_query_executor().cancel(MONTH_QUERY_KEY)
+            get_query_executor().cancel(SECTION_QUERY_KEY)
+            self.render_expenses(cached)
+            return
+
+        self.total_label.setText("Loading…")
+        if not self.loaded:
+            self.show_status("Loading expenses…")
+
+        get_query_executor().submit(fetch_month, self.username, self.current_year, self.month_num,
+                                    cache.generation,
+                                    key=MONTH_QUERY_KEY,
+                                    on_result=self.render_expenses,
+                                    on_error=self.load_failed)
+
+    def load_failed(self, error):
+        QMessageBox.warning(self, "Database Error", f"Failed to load expenses: {str(error)}")
+        self.render_expenses(EMPTY_MONTH)
+
+    def render_expenses(self, view):
+        # Grouping, totals and formatting were done off the GUI thread
+        self.loaded = True
+        self.expense_model.set_month(view, get_expanded_categories().get(self.username))
+        self.update_totals()
+        self.fetch_open_sections()
+
+    def toggle_section(self, category):
+        expanded = self.expense_model.toggle(category)
+        get_expanded_categories().set_expanded(self.username, category, expanded)
+        get_expense_writer().set_category_expanded(self.username, category, expanded)
+        if expanded:
+            self.fetch_open_sections()
+
+    def fetch_open_sections(self):
+        # Every expanded section still missing rows, in one stream. A new
+        # stream stops the running one, so its sections start over.
+        pending = self.expense_model.pending_categories()
+        if pending:
+            for category in pending:
+                self.expense_model.discard_partial_rows(category)
+            self.section_stream = get_query_executor().stream(
+                stream_category_rows, self.username, self.current_year, self.month_num, pending,
+                key=SECTION_QUERY_KEY,
+                on_chunk=self.section_chunk,
+                on_error=self.sections_failed)
+
+    def streaming(self):
+        return (self.section_stream is not None
+                and get_query_executor().is_current(self.section_stream, SECTION_QUERY_KEY))
+
+    def section_chunk(self, chunk):
+        # One chunk per event-loop turn; the first is small so rows show at once
+        category, rows = chunk
+        if rows is None:
+            self.expense_model.finish_category_rows(category)
+            self.update_totals()
+        else:
+            self.expense_model.add_category_rows(category, rows)
 
-        months = ["January", "February", "March", "April", "May", "June",
-                  "July", "August", "September", "October", "November", "December"]
-        month_num = months.index(self.month) + 1
-
-        conn = sqlite3.connect(DB_PATH)
-        c = conn.cursor()
-
-        try:
-            # Get expenses grouped by category
-            c.execute("""
-                     SELECT c.name, SUM(e.price), GROUP_CONCAT(e.id), GROUP_CONCAT(e.item), 
-                            GROUP_CONCAT(e.price), GROUP_CONCAT(e.date)
-                     FROM expenses e
-                     JOIN categories c ON e.category_id = c.id
-                     WHERE e.username = ? 
-                     AND strftime('%m', e.date) = ?
-                     AND strftime('%Y', e.date) = ?
-                     GROUP BY c.name
-                     ORDER BY c.id
-                 """, (self.username, f"{month_num:02d}", str(self.current_year)))
-
-            category_data = c.fetchall()
-
-            # Get all individual expenses for detailed display
-            c.execute("""
-                     SELECT e.id, e.item, e.price, e.date, c.name
-                     FROM expenses e
-                     JOIN categories c ON e.category_id = c.id
-                     WHERE e.username = ? 
-                     AND strftime('%m', e.date) = ?
-                     AND strftime('%Y', e.date) = ?
-                     ORDER BY c.id, e.date
-                 """, (self.username, f"{month_num:02d}", str(self.current_year)))
-
-            expenses = c.fetchall()
-        except sqlite3.OperationalError as e:
-            QMessageBox.warning(self, "Database Error", f"Failed to load expenses: {str(e)}")
-            category_data = []
-            expenses = []
-
-        conn.close()
-
-        total = 0
-
-        if not expenses:
-            empty_label = QLabel("No expenses recorded for this month.\nClick '+ Add Expense' to get started.")
-            empty_label.setFont(QFont("Segoe UI", 11))
-            empty_label.setStyleSheet("color: #95a5a6; padding: 20px 0;")
-            empty_label.setAlignment(Qt.AlignCenter)
-            self.expenses_layout.insertWidget(0, empty_label)
+    def sections_failed(self, error):
+        QMessageBox.warning(self, "Database Error", f"Failed to load expenses: {str(error)}")
+
+    def update_totals(self):
+        if self.expense_model.expense_count():
+            self.status_label.hide()
+            self.expense_view.show()
         else:
-            current_category = None
-            category_total = 0
-
-            for expense_id, item, price, date_str, category in expenses:
-                if category != current_category:
-                    # Add category header if this is a new category
-                    if current_category is not None:
-                        # Add category total
-                        cat_total_frame = QFrame()
-                        cat_total_frame.setStyleSheet("""
-                                 QFrame { 
-                                     background-color: #e8f4f8; 
-                                     border-radius: 5px; 
-                                     padding: 10px;
-                                 }
-                             """)
-                        cat_total_layout = QHBoxLayout(cat_total_frame)
-
-                        cat_total_label = QLabel(f"{current_category} Total:")
-                        cat_total_label.setFont(QFont("Segoe UI", 10, QFont.Bold))
-                        cat_total_label.setStyleSheet("color: #2980b9;")
-
-                        cat_total_value = QLabel(f"₱{category_total:,.2f}")
-                        cat_total_value.setFont(QFont("Segoe UI", 10, QFont.Bold))
-                        cat_total_value.setStyleSheet("color: #2980b9;")
-                        cat_total_value.setAlignment(Qt.AlignRight | Qt.AlignVCenter)
-
-                        cat_total_layout.addWidget(cat_total_label)
-                        cat_total_layout.addStretch()
-                        cat_total_layout.addWidget(cat_total_value)
-
-                        self.expenses_layout.insertWidget(self.expenses_layout.count() - 1, cat_total_frame)
-
-                    # Add new category header
-                    current_category = category
-                    category_total = 0
-
-                    category_header = QLabel(current_category)
-                    category_header.setFont(QFont("Segoe UI", 12, QFont.Bold))
-                    category_header.setStyleSheet("""
-                             QLabel { 
-                                 color: #2c3e50; 
-                                 padding: 5px 0;
-                                 border-bottom: 2px solid #3498db;
-                             }
-                         """)
-                    self.expenses_layout.insertWidget(self.expenses_layout.count() - 1, category_header)
-
-                # Add expense item
-                expense_frame = QFrame()
-                expense_frame.setStyleSheet("""
-                         QFrame { 
-                             background-color: #f9f9f9; 
-                             border-radius: 5px; 
-                             padding: 10px;
-                         }
-                     """)
-
-                expense_layout = QHBoxLayout(expense_frame)
-                expense_layout.setContentsMargins(10, 10, 10, 10)
-
-                date = datetime.strptime(date_str, "%Y-%m-%d")
-                formatted_date = date.strftime("%b %d, %Y")
-
-                date_label = QLabel(formatted_date)
-                date_label.setFont(QFont("Segoe UI", 10))
-                date_label.setStyleSheet("color: #7f8c8d;")
-                date_label.setFixedWidth(120)
-
-                item_label = QLabel(item)
-                item_label.setFont(QFont("Segoe UI", 11))
-                item_label.setStyleSheet("color: #2c3e50;")
-
-                price_label = QLabel(f"₱{price:,.2f}")
-                price_label.setFont(QFont("Segoe UI", 11, QFont.Bold))
-                price_label.setStyleSheet("color: #16a085;")
-                price_label.setFixedWidth(100)
-                price_label.setAlignment(Qt.AlignRight | Qt.AlignVCenter)
-
-                delete_btn = QPushButton("×")
-                delete_btn.setStyleSheet("""
-                    QPushButton { 
-                        background-color: #e74c3c; 
-                        color: white; 
-                        border-radius: 10px; 
-                        font-weight: bold; 
-                        width: 20px; 
-                        height: 20px;
-                    }
-                    QPushButton:hover { 
-                        background-color: #c0392b; 
-                    }
-                """)
-                delete_btn.setCursor(Qt.PointingHandCursor)
-                delete_btn.setFixedSize(20, 20)
-                delete_btn.clicked.connect(lambda checked, eid=expense_id: self.delete_expense(eid))
-
-                expense_layout.addWidget(date_label)
-                expense_layout.addWidget(item_label)
-                expense_layout.addWidget(price_label)
-                expense_layout.addWidget(delete_btn)
-
-                self.expenses_layout.insertWidget(self.expenses_layout.count() - 1, expense_frame)
-
-                # Update the total for the current category
-                category_total += price
-                total += price
-
-            # After the loop, add the total for the last category
-            if current_category is not None:
-                cat_total_frame = QFrame()
-                cat_total_frame.setStyleSheet("""
-                    QFrame { 
-                        background-color: #e8f4f8; 
-                        border-radius: 5px; 
-                        padding: 10px;
-                    }
-                """)
-                cat_total_layout = QHBoxLayout(cat_total_frame)
-
-                cat_total_label = QLabel(f"{current_category} Total:")
-                cat_total_label.setFont(QFont("Segoe UI", 10, QFont.Bold))
-                cat_total_label.setStyleSheet("color: #2980b9;")
-
-                cat_total_value = QLabel(f"₱{category_total:,.2f}")
-                cat_total_value.setFont(QFont("Segoe UI", 10, QFont.Bold))
-                cat_total_value.setStyleSheet("color: #2980b9;")
-                cat_total_value.setAlignment(Qt.AlignRight | Qt.AlignVCenter)
-
-                cat_total_layout.addWidget(cat_total_label)
-                cat_total_layout.addStretch()
-                cat_total_layout.addWidget(cat_total_value)
-
-                self.expenses_layout.insertWidget(self.expenses_layout.count() - 1, cat_total_frame)
-
-        # Update the overall total label
-        self.total_label.setText(f"Total: ₱{total:,.2f}")
+            self.show_status("No expenses recorded for this month.\nClick '+ Add Expense' to get started.")
+
+        self.total_label.setText(f"Total: ₱{self.expense_model.total():,.2f}")
@@ -6,21 +6,23 @@ class AddExpenseDialog(QDialog):
         self.month = month
         self.username = username
         self.current_year = datetime.now().year
+        self.saved_expense = None
+        self.saving = False
         self.initUI()
 
     def initUI(self):
         self.setWindowTitle(f"Add Expense for {self.month}")
         self.setFixedWidth(400)
-        self.setStyleSheet("QDialog { background-color: white; }")
+        self.setObjectName("addExpenseDialog")
 
         layout = QVBoxLayout(self)
         layout.setContentsMargins(20, 20, 20, 20)
         layout.setSpacing(15)
 
         title = QLabel(f"Add New Expense for {self.month}")
-        title.setFont(QFont("Segoe UI", 14, QFont.Bold))
+        title.setObjectName("dialogTitle")
+        title.setFont(font("heading_large"))
         title.setAlignment(Qt.AlignCenter)
-        title.setStyleSheet("color: #2c3e50; margin-bottom: 15px;")
         layout.addWidget(title)
 
         form = QFormLayout()
@@ -28,27 +30,18 @@ class AddExpenseDialog(QDialog):
 
         self.item_input = QLineEdit()
         self.item_input.setPlaceholderText("Enter item")
-        self.item_input.setStyleSheet("padding: 8px; border: 1px solid #ddd; border-radius: 4px;")
         form.addRow("Item:", self.item_input)
 
         self.price_input = QLineEdit()
         self.price_input.setPlaceholderText("0.00")
-        self.price_input.setStyleSheet("padding: 8px; border: 1px solid #ddd; border-radius: 4px;")
         regex = QRegExp(r'^\d*\.?\d{0,2}$')
         validator = QRegExpValidator(regex)
         self.price_input.setValidator(validator)
         form.addRow("Price:", self.price_input)
 
         self.category_combo = QComboBox()
-        self.category_combo.setStyleSheet("padding: 8px; border: 1px solid #ddd; border-radius: 4px;")
 
-        conn = sqlite3.connect(DB_PATH)
-        c = conn.cursor()
-        c.execute("SELECT id, name FROM categories ORDER BY id")
-        categories = c.fetchall()
-        conn.close()
-
-        for cat_id, cat_name in categories:
+        for cat_id, cat_name in get_repository().categories():
             self.category_combo.addItem(cat_name, cat_id)
 
         form.addRow("Category:", self.category_combo)
@@ -65,46 +58,23 @@ class AddExpenseDialog(QDialog):
         self.date_input.setDate(QDate(self.current_year, month_num, 1))
         self.date_input.setMinimumDate(QDate(self.current_year, month_num, 1))
         self.date_input.setMaximumDate(QDate(self.current_year, month_num, days_in_month))
-        self.date_input.setStyleSheet("padding: 8px; border: 1px solid #ddd; border-radius: 4px;")
         form.addRow("Date:", self.date_input)
 
         layout.addLayout(form)
 
         buttons_layout = QHBoxLayout()
-        cancel_btn = QPushButton("Cancel")
-        cancel_btn.setStyleSheet("""
-            QPushButton {
-                background-color: #ecf0f1; 
-                color: #2c3e50; 
-                border-radius: 5px; 
-                padding: 8px; 
-                font-weight: bold;
-            }
-            QPushButton:hover {
-                background-color: #bdc3c7;
-            }
-        """)
-        cancel_btn.setCursor(Qt.PointingHandCursor)
-        cancel_btn.clicked.connect(self.reject)
-
-        save_btn = QPushButton("Save Expense")
-        save_btn.setStyleSheet("""
-            QPushButton {
-                background-color: #2ecc71; 
-                color: white; 
-                border-radius: 5px; 
-                padding: 8px; 
-                font-weight: bold;
-            }
-            QPushButton:hover {
-                background-color: #27ae60;
-            }
-        """)
-        save_btn.setCursor(Qt.PointingHandCursor)
-        save_btn.clicked.connect(self.save_expense)
-
-        buttons_layout.addWidget(cancel_btn)
-        buttons_layout.addWidget(save_btn)
+        self.cancel_btn = QPushButton("Cancel")
+        self.cancel_btn.setObjectName("cancelButton")
+        self.cancel_btn.setCursor(Qt.PointingHandCursor)
+        self.cancel_btn.clicked.connect(self.reject)
+
+        self.save_btn = QPushButton("Save Expense")
+        self.save_btn.setObjectName("saveButton")
+        self.save_btn.setCursor(Qt.PointingHandCursor)
+        self.save_btn.clicked.connect(self.save_expense)
+
+        buttons_layout.addWidget(self.cancel_btn)
+        buttons_layout.addWidget(self.save_btn)
         layout.addLayout(buttons_layout)
 
     def save_expense(self):
@@ -126,11 +96,34 @@ class AddExpenseDialog(QDialog):
 
         date_str = self.date_input.date().toString("yyyy-MM-dd")
 
-        conn = sqlite3.connect(DB_PATH)
-        c = conn.cursor()
-        c.execute("INSERT INTO expenses (username, item, price, date, category_id) VALUES (?, ?, ?, ?, ?)",
-                  (self.username, item, price, date_str, category_id))
-        conn.commit()
-        conn.close()
-
+        # Queued on the writer thread; the dialog closes once it is committed
+        self.set_saving(True)
+        get_expense_writer().add_expense(self.username, item, price, date_str, category_id,
+                                         on_done=lambda expense_id: self.saved(
+                                             Expense(expense_id, item, price, date_str,
+                                                     self.category_combo.currentText())),
+                                         on_error=self.save_failed)
+
+    def set_saving(self, saving):
+        """Lock the buttons while a save is queued, so the row can't land after a cancel"""
+        self.saving = saving
+        self.save_btn.setEnabled(not saving)
+        self.cancel_btn.setEnabled(not saving)
+
+    def reject(self):
+        # Esc and the close button end up here too
+        if not self.saving:
+            super().reject()
+
+    def saved(self, expense):
+        self.saving = False
+        self.saved_expense = expense
         self.accept()
+
+    def category_order(self):
+        """Category names in id order, as the month view sorts its groups"""
+        return [self.category_combo.itemText(i) for i in range(self.category_combo.count())]
+
+    def save_failed(self, error):
+        self.set_saving(False)
+        QMessageBox.warning(self, "Database Error", f"Failed to save expense: {str(error)}")
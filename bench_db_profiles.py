@@ -0,0 +1,104 @@
+import argparse
+import os
+import random
+import shutil
+import statistics
+import tempfile
+import threading
+import time
+
+from expense_repository import PROFILES, SQL_ADD_EXPENSE, ExpenseRepository, setup_database
+from group_commit import GroupCommitWriter
+
+# === SQLite Profile Benchmark ===
+# Measures single-row insert throughput (one commit per expense, like
+# AddExpenseDialog.save_expense) and month-view read latency while a
+# writer is busy, for every profile in expense_repository.PROFILES.
+# With --group-commit the inserts go through the group commit writer
+# thread instead, as the Qt frontend queues them.
+#
+#   python bench_db_profiles.py --inserts 2000 --readers 2 --group-commit
+
+
+def random_date(year):
+    return f"{year}-{random.randint(1, 12):02d}-{random.randint(1, 28):02d}"
+
+
+def bench_profile(profile, inserts, readers, year, group_commit=False):
+    workdir = tempfile.mkdtemp(prefix=f"bench_{profile}_")
+    db_path = os.path.join(workdir, "bench.db")
+    try:
+        setup_database(db_path, profile)
+        # No result cache, so every read below reaches SQLite
+        repo = ExpenseRepository(db_path, pool_size=readers, profile=profile, cache_rows=0)
+        repo.add_user("bench", "Bench", "", "")
+
+        latencies = []
+        latencies_lock = threading.Lock()
+        stop = threading.Event()
+
+        def read_loop():
+            while not stop.is_set():
+                month = random.randint(1, 12)
+                start = time.perf_counter()
+                repo.list_month("bench", year, month)
+                elapsed = time.perf_counter() - start
+                with latencies_lock:
+                    latencies.append(elapsed)
+
+        threads = [threading.Thread(target=read_loop, daemon=True) for _ in range(readers)]
+        for t in threads:
+            t.start()
+
+        start = time.perf_counter()
+        if group_commit:
+            writer = GroupCommitWriter(repo)
+            writer.start()
+            for i in range(inserts):
+                writer.submit(SQL_ADD_EXPENSE, ("bench", f"item {i}", random.uniform(1, 500),
+                                                random_date(year), random.randint(1, 4)))
+            writer.close()
+        else:
+            for i in range(inserts):
+                repo.add("bench", f"item {i}", random.uniform(1, 500), random_date(year),
+                         random.randint(1, 4))
+        insert_seconds = time.perf_counter() - start
+
+        stop.set()
+        for t in threads:
+            t.join()
+        repo.close()
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    return insert_seconds, latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare SQLite performance profiles")
+    parser.add_argument("--inserts", type=int, default=2000)
+    parser.add_argument("--readers", type=int, default=2)
+    parser.add_argument("--year", type=int, default=2025)
+    parser.add_argument("--profile", choices=sorted(PROFILES), action="append",
+                        help="Profile to run (repeatable, default: all)")
+    parser.add_argument("--group-commit", action="store_true",
+                        help="Insert through the group commit writer thread")
+    args = parser.parse_args()
+
+    print(f"{'profile':<10} {'inserts/s':>10} {'reads':>8} {'p50 ms':>8} {'p95 ms':>8} {'max ms':>8}")
+    for profile in args.profile or PROFILES:
+        insert_seconds, latencies = bench_profile(profile, args.inserts, args.readers, args.year,
+                                                    args.group_commit)
+        rate = args.inserts / insert_seconds if insert_seconds else float("inf")
+        if latencies:
+            latencies.sort()
+            p50 = statistics.median(latencies) * 1000
+            p95 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))] * 1000
+            worst = latencies[-1] * 1000
+        else:
+            p50 = p95 = worst = 0.0
+        print(f"{profile:<10} {rate:>10.0f} {len(latencies):>8} {p50:>8.2f} {p95:>8.2f} {worst:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+import argparse
+import os
+import random
+import shutil
+import tempfile
+import time
+import tracemalloc
+
+from expense_block import ExpenseBlock
+from expense_repository import ExpenseRepository, setup_database, year_bounds
+
+# === Expense Block Benchmark ===
+# Loads one user's year as a list of Expense tuples (list_year) and as an
+# ExpenseBlock (iter_range), and reports the memory each holds, measured
+# with tracemalloc, and how long a month slice takes.
+#
+#   python bench_expense_block.py --rows 200000 --items 500
+
+
+def measure(fn):
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = fn()
+    seconds = time.perf_counter() - start
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, size, seconds
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare Expense tuples with an ExpenseBlock")
+    parser.add_argument("--rows", type=int, default=200000)
+    parser.add_argument("--items", type=int, default=500, help="Distinct item names")
+    parser.add_argument("--year", type=int, default=2025)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="bench_block_")
+    try:
+        db_path = os.path.join(workdir, "bench.db")
+        setup_database(db_path)
+        repo = ExpenseRepository(db_path)
+        repo.add_user("bench", "Bench", "", "")
+        repo.add_many(("bench", f"item {random.randrange(args.items)}", round(random.uniform(1, 500), 2),
+                       f"{args.year}-{random.randint(1, 12):02d}-{random.randint(1, 28):02d}",
+                       random.randint(1, 4))
+                      for _ in range(args.rows))
+
+        def load_block():
+            rows = repo.iter_range("bench", *year_bounds(args.year))
+            try:
+                return ExpenseBlock.from_rows(rows)
+            finally:
+                rows.close()
+
+        expenses, tuple_bytes, tuple_seconds = measure(lambda: repo.list_year("bench", args.year))
+        block, block_bytes, block_seconds = measure(load_block)
+
+        start = time.perf_counter()
+        for month in range(1, 13):
+            block.month(args.year, month)
+        slice_ms = (time.perf_counter() - start) * 1000 / 12
+
+        print(f"{'layout':<8} {'load ms':>10} {'MB':>8} {'B/row':>8}")
+        for name, size, seconds in (("tuples", tuple_bytes, tuple_seconds),
+                                    ("block", block_bytes, block_seconds)):
+            print(f"{name:<8} {seconds * 1000:>10.1f} {size / 1e6:>8.1f} {size / len(expenses):>8.1f}")
+        print(f"ExpenseBlock.nbytes(): {block.bytes_per_expense():.1f} B/row, month slice {slice_ms:.2f} ms")
+        repo.close()
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+import argparse
+import os
+import random
+import shutil
+import statistics
+import tempfile
+import time
+from datetime import datetime
+
+from expense_repository import ExpenseRepository, setup_database
+from month_view import build_month_view
+
+# === Month View Model Benchmark ===
+# Times building one month's view data without Qt: the old way (a
+# monthly_summary query plus list_month, with strptime and string
+# formatting per row) against build_month_view on a single list_month.
+#
+#   python bench_month_view.py --rows 5000 --repeat 20
+
+
+def old_month_view(repo, username, year, month):
+    totals = repo.month_summary(username, year, month)
+    rows = []
+    for expense in repo.list_month(username, year, month):
+        date = datetime.strptime(expense.date, "%Y-%m-%d").strftime("%b %d, %Y")
+        rows.append((expense, date, f"₱{expense.price:,.2f}"))
+    return totals, rows
+
+
+def new_month_view(repo, username, year, month):
+    return build_month_view(repo.list_month(username, year, month))
+
+
+def time_it(fn, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time building a month's view data")
+    parser.add_argument("--rows", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--year", type=int, default=2025)
+    parser.add_argument("--month", type=int, default=3)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="bench_month_view_")
+    try:
+        db_path = os.path.join(workdir, "bench.db")
+        setup_database(db_path)
+        # No result cache, so each repeat runs the queries again
+        repo = ExpenseRepository(db_path, cache_rows=0)
+        repo.add_user("bench", "Bench", "", "")
+        repo.add_many(("bench", f"item {i}", round(random.uniform(1, 500), 2),
+                       f"{args.year}-{args.month:02d}-{random.randint(1, 28):02d}", random.randint(1, 4))
+                      for i in range(args.rows))
+
+        print(f"{'builder':<8} {'median ms':>10}")
+        for name, fn in (("old", old_month_view), ("new", new_month_view)):
+            seconds = time_it(lambda: fn(repo, "bench", args.year, args.month), args.repeat)
+            print(f"{name:<8} {seconds * 1000:>10.2f}")
+        repo.close()
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
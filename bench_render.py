@@ -0,0 +1,184 @@
+import argparse
+import os
+import sys
+import time
+
+from PyQt5.QtGui import QFont
+from PyQt5.QtWidgets import QApplication, QFrame, QHBoxLayout, QLabel, QPushButton, QVBoxLayout, QWidget
+
+from theme import APP_STYLESHEET, font, set_style_state
+
+# === Render Benchmark ===
+# Builds the same widget tree twice: once the old way, with a
+# setStyleSheet string and a fresh QFont on every widget, and once with
+# object names under the app-wide theme and shared fonts. It reports the
+# time to build, polish and lay out the tree, and the time to flip every
+# month card's active state.
+#
+#   python bench_render.py --rows 1000 --toggles 200
+#
+# Uses the offscreen Qt platform unless QT_QPA_PLATFORM says otherwise.
+
+MONTHS = ["January", "February", "March", "April", "May", "June",
+          "July", "August", "September", "October", "November", "December"]
+
+INLINE_ROW = """
+    QFrame {
+        background-color: #f9f9f9;
+        border-radius: 5px;
+        padding: 10px;
+    }
+"""
+INLINE_DELETE = """
+    QPushButton {
+        background-color: #e74c3c;
+        color: white;
+        border-radius: 10px;
+        font-weight: bold;
+    }
+    QPushButton:hover {
+        background-color: #c0392b;
+    }
+"""
+INLINE_CARD_ACTIVE = """
+    QFrame { background-color: #3498db; border-radius: 10px; padding: 10px; border: 2px solid #2980b9; }
+    QLabel { color: white; }
+"""
+INLINE_CARD = """
+    QFrame { background-color: #ecf0f1; border-radius: 8px; padding: 10px; border: 1px solid #ddd; }
+    QFrame:hover { background-color: #d6dbdf; }
+    QLabel { color: #2c3e50; }
+"""
+
+# Extra rules for the benchmark's own rows, in the same style as the theme
+BENCH_STYLESHEET = APP_STYLESHEET + """
+QFrame#benchRow { background-color: #f9f9f9; border-radius: 5px; padding: 10px; }
+QLabel#benchDate { color: #7f8c8d; }
+QLabel#benchItem { color: #2c3e50; }
+QLabel#benchPrice { color: #16a085; }
+QPushButton#benchDelete { background-color: #e74c3c; color: white; border-radius: 10px; font-weight: bold; }
+QPushButton#benchDelete:hover { background-color: #c0392b; }
+"""
+
+
+def build_inline(parent_layout, rows):
+    cards = []
+    strip = QHBoxLayout()
+    for i, month in enumerate(MONTHS):
+        card = QFrame()
+        card.setStyleSheet(INLINE_CARD_ACTIVE if i == 0 else INLINE_CARD)
+        layout = QVBoxLayout(card)
+        label = QLabel(month)
+        label.setFont(QFont("Segoe UI", 12, QFont.Bold))
+        layout.addWidget(label)
+        strip.addWidget(card)
+        cards.append(card)
+    parent_layout.addLayout(strip)
+
+    for i in range(rows):
+        row = QFrame()
+        row.setStyleSheet(INLINE_ROW)
+        layout = QHBoxLayout(row)
+        for text, size, bold, style in (("Jan 01, 2025", 10, False, "color: #7f8c8d;"),
+                                        (f"item {i}", 11, False, "color: #2c3e50;"),
+                                        ("₱1,234.00", 11, True, "color: #16a085;")):
+            label = QLabel(text)
+            label.setFont(QFont("Segoe UI", size, QFont.Bold if bold else QFont.Normal))
+            label.setStyleSheet(style)
+            layout.addWidget(label)
+        delete_btn = QPushButton("×")
+        delete_btn.setStyleSheet(INLINE_DELETE)
+        delete_btn.setFixedSize(20, 20)
+        layout.addWidget(delete_btn)
+        parent_layout.addWidget(row)
+    return cards
+
+
+def toggle_inline(cards, active_index):
+    for i, card in enumerate(cards):
+        card.setStyleSheet(INLINE_CARD_ACTIVE if i == active_index else INLINE_CARD)
+
+
+def build_themed(parent_layout, rows):
+    cards = []
+    strip = QHBoxLayout()
+    for i, month in enumerate(MONTHS):
+        card = QFrame()
+        card.setObjectName("monthCard")
+        card.setProperty("active", i == 0)
+        layout = QVBoxLayout(card)
+        label = QLabel(month)
+        label.setFont(font("heading"))
+        layout.addWidget(label)
+        strip.addWidget(card)
+        cards.append(card)
+    parent_layout.addLayout(strip)
+
+    for i in range(rows):
+        row = QFrame()
+        row.setObjectName("benchRow")
+        layout = QHBoxLayout(row)
+        for text, role, name in (("Jan 01, 2025", "small", "benchDate"),
+                                 (f"item {i}", "body", "benchItem"),
+                                 ("₱1,234.00", "body_bold", "benchPrice")):
+            label = QLabel(text)
+            label.setObjectName(name)
+            label.setFont(font(role))
+            layout.addWidget(label)
+        delete_btn = QPushButton("×")
+        delete_btn.setObjectName("benchDelete")
+        delete_btn.setFixedSize(20, 20)
+        layout.addWidget(delete_btn)
+        parent_layout.addWidget(row)
+    return cards
+
+
+def toggle_themed(cards, active_index):
+    for i, card in enumerate(cards):
+        active = i == active_index
+        if card.property("active") != active:
+            set_style_state(card, "active", active)
+
+
+def run(app, mode, rows, toggles):
+    app.setStyleSheet(BENCH_STYLESHEET if mode == "themed" else "")
+    build, toggle = (build_themed, toggle_themed) if mode == "themed" else (build_inline, toggle_inline)
+
+    window = QWidget()
+    layout = QVBoxLayout(window)
+
+    start = time.perf_counter()
+    cards = build(layout, rows)
+    window.show()
+    app.processEvents()
+    build_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for i in range(toggles):
+        toggle(cards, i % len(cards))
+        app.processEvents()
+    toggle_seconds = time.perf_counter() - start
+
+    window.close()
+    window.deleteLater()
+    app.processEvents()
+    return build_seconds, toggle_seconds
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare inline styles with the app-wide theme")
+    parser.add_argument("--rows", type=int, default=1000)
+    parser.add_argument("--toggles", type=int, default=200)
+    args = parser.parse_args()
+
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    app = QApplication(sys.argv)
+
+    print(f"{'mode':<8} {'build ms':>10} {'toggle ms':>10}")
+    for mode in ("inline", "themed"):
+        build_seconds, toggle_seconds = run(app, mode, args.rows, args.toggles)
+        print(f"{mode:<8} {build_seconds * 1000:>10.1f} {toggle_seconds * 1000:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
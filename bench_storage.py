@@ -0,0 +1,157 @@
+import argparse
+import multiprocessing
+import os
+import random
+import shutil
+import statistics
+import tempfile
+import time
+
+from storage_backend import BACKENDS, open_backend
+
+# === Storage Backend Benchmark ===
+# Loads the same generated expenses into each StorageBackend and reports
+# load rate, resident memory, size on disk, reopen time and per-call
+# latency of the StorageBackend methods. Every (backend, size) case runs
+# in its own process, so one case's memory can't leak into the next.
+#
+#   python bench_storage.py --sizes 10000,1000000,10000000 --backends csv,sqlite
+#
+# The in-memory backend holds every row as Python objects; at 10M rows
+# it needs several GB of RAM.
+
+DEFAULT_SIZES = "10000,1000000,10000000"
+CATEGORIES = ["Food", "Utilities", "Necessities", "Transportation"]
+LOAD_BATCH_SIZE = 100000
+
+
+def rss_bytes():
+    """Current resident set size, or None where /proc isn't available"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+def disk_bytes(directory):
+    return sum(os.path.getsize(os.path.join(directory, name)) for name in os.listdir(directory))
+
+
+def generate_rows(rng, rows, users, items, year):
+    for _ in range(rows):
+        yield (f"user{rng.randrange(users)}", f"item {rng.randrange(items)}",
+               round(rng.uniform(1, 500), 2),
+               f"{year}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}",
+               rng.choice(CATEGORIES))
+
+
+def timed(fn, calls):
+    """Milliseconds per call for each of calls"""
+    times = []
+    for args in calls:
+        start = time.perf_counter()
+        fn(*args)
+        times.append((time.perf_counter() - start) * 1000)
+    return times
+
+
+def run_case(name, rows, args, results):
+    workdir = tempfile.mkdtemp(prefix=f"bench_storage_{name}_")
+    try:
+        rng = random.Random(args.seed)
+        users = min(args.users, max(1, rows // 10))
+        baseline = rss_bytes()
+
+        storage = open_backend(name, workdir)
+        start = time.perf_counter()
+        for i in range(users):
+            storage.add_user(f"user{i}", f"User {i}", "", "pw")
+        remaining = generate_rows(rng, rows, users, args.items, args.year)
+        while True:
+            batch = [row for _, row in zip(range(LOAD_BATCH_SIZE), remaining)]
+            if not batch:
+                break
+            storage.add_many(batch)
+        load_seconds = time.perf_counter() - start
+        memory = rss_bytes()
+
+        def sample_month():
+            return f"user{rng.randrange(users)}", args.year, rng.randint(1, 12)
+
+        list_ms = timed(storage.list_month, [sample_month() for _ in range(args.queries)])
+        totals_ms = timed(storage.month_totals,
+                          [(f"user{rng.randrange(users)}", args.year) for _ in range(args.queries // 4 or 1)])
+        login_ms = timed(storage.authenticate,
+                         [(f"user{rng.randrange(users)}", "pw") for _ in range(args.queries)])
+        added = []
+        add_ms = timed(lambda *row: added.append(storage.add(*row)),
+                       list(generate_rows(rng, args.queries, users, args.items, args.year)))
+        delete_ms = timed(storage.delete, [(expense_id,) for expense_id in added])
+        storage.close()
+
+        reopen_ms = None
+        if name != "memory":
+            start = time.perf_counter()
+            storage = open_backend(name, workdir)
+            storage.list_month(*sample_month())
+            reopen_ms = (time.perf_counter() - start) * 1000
+            storage.close()
+
+        results.put({
+            "backend": name,
+            "rows": rows,
+            "load_s": load_seconds,
+            "memory": None if baseline is None or memory is None else memory - baseline,
+            "disk": disk_bytes(workdir) if name != "memory" else 0,
+            "reopen_ms": reopen_ms,
+            "latency": [(label, statistics.mean(times), p95(times)) for label, times in (
+                ("list_month", list_ms), ("month_totals", totals_ms), ("authenticate", login_ms),
+                ("add", add_ms), ("delete", delete_ms))],
+        })
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+def p95(times):
+    return sorted(times)[int(len(times) * 0.95)] if times else 0
+
+
+def print_result(r):
+    memory = "-" if r["memory"] is None else f"{r['memory'] / 2 ** 20:,.0f} MB"
+    reopen = "-" if r["reopen_ms"] is None else f"{r['reopen_ms']:,.0f} ms"
+    print(f"{r['backend']:<7} {r['rows']:>11,} rows  load {r['load_s']:7.1f}s "
+          f"({r['rows'] / r['load_s']:,.0f}/s)  memory {memory:>9}  disk {r['disk'] / 2 ** 20:,.0f} MB  "
+          f"reopen {reopen}")
+    for label, mean, slow in r["latency"]:
+        print(f"    {label:<13} mean {mean:8.3f} ms   p95 {slow:8.3f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare the CSV, memory and SQLite storage backends")
+    parser.add_argument("--sizes", default=DEFAULT_SIZES, help="Comma-separated expense counts")
+    parser.add_argument("--backends", default=",".join(BACKENDS))
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--items", type=int, default=500, help="Distinct item names")
+    parser.add_argument("--queries", type=int, default=200, help="Calls timed per method")
+    parser.add_argument("--year", type=int, default=2025)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    sizes = [int(size) for size in args.sizes.split(",")]
+    backends = args.backends.split(",")
+    ctx = multiprocessing.get_context("spawn")
+    for rows in sizes:
+        for name in backends:
+            results = ctx.Queue()
+            case = ctx.Process(target=run_case, args=(name, rows, args, results))
+            case.start()
+            case.join()
+            if case.exitcode != 0:
+                print(f"{name:<7} {rows:>11,} rows  failed (exit code {case.exitcode})")
+                continue
+            print_result(results.get())
+
+
+if __name__ == "__main__":
+    main()
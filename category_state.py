@@ -0,0 +1,45 @@
+import threading
+
+from expense_repository import get_repository
+
+# === Expanded Categories ===
+# Which category sections each user keeps open on the month pages. The
+# expanded_categories table is read once per user and then kept here;
+# toggles update the set straight away and the month page queues the
+# write on the expense writer.
+
+
+class ExpandedCategories:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._users = {}
+
+    def preload(self, username):
+        """Read the user's rows from the table if they aren't loaded yet"""
+        with self._lock:
+            if username in self._users:
+                return
+        loaded = set(get_repository().expanded_categories(username))
+        with self._lock:
+            self._users.setdefault(username, loaded)
+
+    def get(self, username):
+        """The user's expanded category names; reads the table on first use"""
+        self.preload(username)
+        with self._lock:
+            return frozenset(self._users[username])
+
+    def set_expanded(self, username, category, expanded):
+        self.preload(username)
+        with self._lock:
+            if expanded:
+                self._users[username].add(category)
+            else:
+                self._users[username].discard(category)
+
+
+_expanded = ExpandedCategories()
+
+
+def get_expanded_categories():
+    return _expanded
@@ -0,0 +1,152 @@
+import argparse
+import csv
+import time
+from datetime import datetime
+from itertools import islice
+
+from expense_repository import DB_PATH, ExpenseRepository, setup_database
+from month_view import MONTH_NUMBERS
+
+# === CSV Importer ===
+# Carries data from the Tk frontend (Main.py: users.csv / expenses.csv)
+# into the SQLite schema used by the Qt frontends. Rows are streamed
+# from disk and inserted in executemany batches, one transaction per
+# batch, so memory stays flat no matter how large the files are.
+#
+#   python csv_importer.py --users users.csv --expenses expenses.csv --year 2025
+
+USER_CSV = 'users.csv'
+EXPENSE_CSV = 'expenses.csv'
+BATCH_SIZE = 50000
+
+# Main.py category names that have a direct counterpart in the SQLite schema
+CATEGORY_ALIASES = {
+    "Food": "Food",
+    "Transport": "Transportation",
+    "Transportation": "Transportation",
+    "Utilities": "Utilities",
+    "Necessities": "Necessities",
+}
+
+
+class ImportStats:
+    def __init__(self, label):
+        self.label = label
+        self.rows = 0
+        self.skipped = 0
+        self.start = time.perf_counter()
+
+    def report(self, final=False):
+        elapsed = time.perf_counter() - self.start
+        rate = self.rows / elapsed if elapsed else 0
+        prefix = "Imported" if final else "  ..."
+        print(f"{prefix} {self.rows:,} {self.label} in {elapsed:.1f}s "
+              f"({rate:,.0f} rows/s, {self.skipped:,} skipped)")
+
+
+def read_csv_rows(path):
+    """Yield data rows from a CSV file, skipping its header"""
+    with open(path, 'r', newline='') as f:
+        reader = csv.reader(f)
+        next(reader, None)
+        yield from reader
+
+
+def batched(rows, size):
+    rows = iter(rows)
+    while True:
+        batch = list(islice(rows, size))
+        if not batch:
+            return
+        yield batch
+
+
+def iter_users(path, stats):
+    for row in read_csv_rows(path):
+        if len(row) < 4 or not row[0]:
+            stats.skipped += 1
+            continue
+        yield row[0], row[1], row[2], row[3]
+
+
+class CategoryMapper:
+    """Resolves Main.py category strings to category ids, creating unknown ones once"""
+
+    def __init__(self, repo):
+        self.repo = repo
+        self.ids = {name: cat_id for cat_id, name in repo.categories()}
+
+    def __call__(self, category):
+        name = CATEGORY_ALIASES.get(category, category or "Others")
+        cat_id = self.ids.get(name)
+        if cat_id is None:
+            cat_id = self.repo.add_category(name)
+            self.ids[name] = cat_id
+        return cat_id
+
+
+def iter_expenses(path, year, category_id, stats):
+    for row in read_csv_rows(path):
+        if len(row) < 5:
+            stats.skipped += 1
+            continue
+        username, month, category, item, amount = row[:5]
+        month_num = MONTH_NUMBERS.get(month)
+        try:
+            price = float(amount)
+        except ValueError:
+            price = None
+        if month_num is None or price is None:
+            stats.skipped += 1
+            continue
+        if len(row) > 5 and row[5]:
+            # Full date written by storage_backend.CSVBackend
+            expense_date = row[5]
+        else:
+            # Main.py only records the month, so the row lands on the 1st
+            expense_date = f"{year:04d}-{month_num:02d}-01"
+        yield username, item, price, expense_date, category_id(category)
+
+
+def import_users(repo, path, batch_size=BATCH_SIZE):
+    stats = ImportStats("users")
+    for batch in batched(iter_users(path, stats), batch_size):
+        repo.add_users_many(batch)
+        stats.rows += len(batch)
+    stats.report(final=True)
+    return stats
+
+
+def import_expenses(repo, path, year, batch_size=BATCH_SIZE, progress_every=10):
+    stats = ImportStats("expenses")
+    rows = iter_expenses(path, year, CategoryMapper(repo), stats)
+    for i, batch in enumerate(batched(rows, batch_size), 1):
+        repo.add_many(batch)
+        stats.rows += len(batch)
+        if i % progress_every == 0:
+            stats.report()
+    stats.report(final=True)
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Import Main.py CSV data into the SQLite database")
+    parser.add_argument("--users", default=USER_CSV)
+    parser.add_argument("--expenses", default=EXPENSE_CSV)
+    parser.add_argument("--db", default=DB_PATH)
+    parser.add_argument("--year", type=int, default=datetime.now().year,
+                        help="Year to file the month-only CSV expenses under")
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+    args = parser.parse_args()
+
+    setup_database(args.db)
+    repo = ExpenseRepository(args.db)
+    try:
+        import_users(repo, args.users, args.batch_size)
+        import_expenses(repo, args.expenses, args.year, args.batch_size)
+    finally:
+        repo.close()
+
+
+if __name__ == "__main__":
+    main()
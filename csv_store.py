@@ -0,0 +1,278 @@
+import csv
+import io
+import locale
+import mmap
+import os
+import struct
+from array import array
+
+# === Indexed CSV Expense Store ===
+# Storage for the Tk frontend's expenses.csv (Main.py). The CSV stays an
+# append-only file in its original format, so csv_importer.py and older
+# copies of Main.py can still read and append to it. Next to it sits a
+# sidecar index, expenses.csv.idx, holding the byte offset and length of
+# every row grouped by (username, month). It is loaded into a dict, so a
+# month switch seeks straight to that month's rows through an mmap of the
+# CSV instead of parsing every user's history.
+#
+# The sidecar is a sequence of blocks, one per key:
+#   header (username bytes, month bytes, row count)  username  month
+#   row offsets (int64 each)  row lengths (int32 each)
+# Each block loads with two array.frombytes calls. append() writes the
+# CSV row first and then a one-row block. When one-row blocks outnumber
+# the keys, the sidecar is compacted into one block per key on the next
+# start.
+#
+# Rows the index doesn't cover yet, e.g. after a crash between the two
+# writes or an append by another writer, are indexed from the end of the
+# last indexed row the next time the store is read. If the CSV has
+# shrunk or was replaced, the index is rebuilt from scratch.
+
+EXPENSE_CSV = 'expenses.csv'
+INDEX_SUFFIX = '.idx'
+INDEX_MAGIC = b'EXPIDX1\n'
+BLOCK_HEADER = struct.Struct('=HHI')
+COMPACT_MIN_BLOCKS = 1024
+
+# Main.py reads and writes the CSV in text mode with the default encoding
+ENCODING = locale.getpreferredencoding(False)
+
+
+class ExpenseCSVStore:
+    def __init__(self, path=EXPENSE_CSV, index_path=None):
+        self.path = path
+        self.index_path = index_path or path + INDEX_SUFFIX
+        self._months = {}
+        self._end = 0
+        self._blocks = 0
+        self._map = None
+        # Bumped on every rebuild, when byte offsets handed out earlier may point elsewhere
+        self.generation = 0
+        if not self._load_index():
+            self.rebuild_index()
+            return
+        if self._blocks > max(COMPACT_MIN_BLOCKS, 2 * len(self._months)):
+            self.compact_index()
+        self.refresh()
+
+    # --- Index ---
+
+    def _load_index(self):
+        """Read the sidecar into memory; False if it is missing or unreadable"""
+        if not os.path.exists(self.index_path):
+            return False
+        with open(self.index_path, 'rb') as f:
+            data = f.read()
+        if not data.startswith(INDEX_MAGIC):
+            return False
+
+        view = memoryview(data)
+        pos = len(INDEX_MAGIC)
+        while pos + BLOCK_HEADER.size <= len(data):
+            user_len, month_len, count = BLOCK_HEADER.unpack_from(data, pos)
+            start = pos + BLOCK_HEADER.size
+            offsets_at = start + user_len + month_len
+            lengths_at = offsets_at + 8 * count
+            end = lengths_at + 4 * count
+            if end > len(data):
+                break
+            offsets, lengths = array('q'), array('i')
+            offsets.frombytes(view[offsets_at:lengths_at])
+            lengths.frombytes(view[lengths_at:end])
+            username = data[start:start + user_len].decode(ENCODING)
+            month = data[start + user_len:offsets_at].decode(ENCODING)
+            self._add_block(username, month, offsets, lengths)
+            pos = end
+        view.release()
+
+        if pos < len(data):
+            # The last block was only partly written; its rows get indexed again
+            with open(self.index_path, 'rb+') as f:
+                f.truncate(pos)
+        return True
+
+    def _add_block(self, username, month, offsets, lengths):
+        entry = self._months.get((username, month))
+        if entry is None:
+            self._months[(username, month)] = (offsets, lengths)
+        else:
+            entry[0].extend(offsets)
+            entry[1].extend(lengths)
+        if offsets:
+            self._end = max(self._end, offsets[-1] + lengths[-1])
+        self._blocks += 1
+
+    def _write_blocks(self, f, months):
+        for (username, month), (offsets, lengths) in months.items():
+            user_bytes, month_bytes = username.encode(ENCODING), month.encode(ENCODING)
+            f.write(BLOCK_HEADER.pack(len(user_bytes), len(month_bytes), len(offsets)))
+            f.write(user_bytes)
+            f.write(month_bytes)
+            f.write(offsets.tobytes())
+            f.write(lengths.tobytes())
+
+    def rebuild_index(self):
+        """Forget the sidecar and index the whole CSV again"""
+        self._close_map()
+        self._months = {}
+        self._end = 0
+        self._blocks = 0
+        self.generation += 1
+        with open(self.index_path, 'wb') as f:
+            f.write(INDEX_MAGIC)
+        self._index_from(0)
+
+    def compact_index(self):
+        """Rewrite the sidecar as one block per (username, month)"""
+        tmp_path = self.index_path + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            f.write(INDEX_MAGIC)
+            self._write_blocks(f, self._months)
+        os.replace(tmp_path, self.index_path)
+        self._blocks = len(self._months)
+
+    def refresh(self):
+        """Index rows appended since the last read; rebuild if the CSV shrank"""
+        size = os.path.getsize(self.path) if os.path.exists(self.path) else 0
+        if size < self._end or not self._ends_record(self._end):
+            self.rebuild_index()
+        elif size > self._end:
+            self._index_from(self._end)
+
+    def _ends_record(self, offset):
+        """Whether a CSV record ends at offset, i.e. the CSV wasn't replaced under the index"""
+        if offset == 0:
+            return True
+        with open(self.path, 'rb') as f:
+            f.seek(offset - 1)
+            return f.read(1) == b'\n'
+
+    def _index_from(self, start):
+        """Index every complete CSV record from byte offset start to the end of the file"""
+        months = {}
+        offset = start
+        with open(self.path, 'rb') as f:
+            f.seek(start)
+            for record in iter_records(f):
+                key = record_key(record) if offset > 0 else None
+                if key is not None:
+                    entry = months.get(key)
+                    if entry is None:
+                        entry = months[key] = (array('q'), array('i'))
+                    entry[0].append(offset)
+                    entry[1].append(len(record))
+                offset += len(record)
+
+        with open(self.index_path, 'ab') as f:
+            self._write_blocks(f, months)
+        for (username, month), (offsets, lengths) in months.items():
+            self._add_block(username, month, offsets, lengths)
+        self._end = max(self._end, offset)
+
+    # --- Reads ---
+
+    def _mapped(self):
+        if self._map is None or len(self._map) < self._end:
+            self._close_map()
+            with open(self.path, 'rb') as f:
+                self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return self._map
+
+    def _close_map(self):
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+
+    def month_rows(self, username, month):
+        """CSV rows (username, month, category, item, amount) for one user's month, in file order"""
+        return [row for _, row in self.month_records(username, month)]
+
+    def month_records(self, username, month):
+        """(byte offset, CSV row) pairs for one user's month; the offset identifies the row"""
+        self.refresh()
+        entry = self._months.get((username, month))
+        if entry is None:
+            return []
+        data = self._mapped()
+        return [(offset, parse_record(data[offset:offset + length]))
+                for offset, length in zip(*entry)]
+
+    def record_at(self, offset):
+        """The raw CSV record starting at byte offset, or None past the end of the file"""
+        with open(self.path, 'rb') as f:
+            f.seek(offset)
+            return next(iter_records(f), None)
+
+    def records(self):
+        """Yield (byte offset, raw record) for every complete CSV record, header included"""
+        offset = 0
+        with open(self.path, 'rb') as f:
+            for record in iter_records(f):
+                yield offset, record
+                offset += len(record)
+
+    # --- Writes ---
+
+    def append(self, username, month, category, item, amount, *extra):
+        """Append one expense row to the CSV and a one-row block to the sidecar; returns its offset
+
+        Fields after amount are written as extra columns, which Main.py ignores.
+        """
+        self.refresh()
+        buf = io.StringIO(newline='')
+        csv.writer(buf).writerow([username, month, category, item, amount, *extra])
+        record = buf.getvalue().encode(ENCODING)
+
+        # Windows won't extend a file while a view of it is mapped
+        self._close_map()
+        with open(self.path, 'ab') as f:
+            offset = f.tell()
+            f.write(record)
+        block = {(username, month): (array('q', [offset]), array('i', [len(record)]))}
+        with open(self.index_path, 'ab') as f:
+            self._write_blocks(f, block)
+        self._add_block(username, month, *block[(username, month)])
+        return offset
+
+    def append_many(self, rows):
+        """Append CSV rows in one write, then index them in one pass"""
+        self.refresh()
+        self._close_map()
+        with open(self.path, 'a', newline='', encoding=ENCODING) as f:
+            csv.writer(f).writerows(rows)
+        self.refresh()
+
+    def close(self):
+        self._close_map()
+
+
+def iter_records(f):
+    """Yield whole CSV records as bytes from a binary file; quoted fields may span lines.
+
+    A trailing record without its line terminator is still being written
+    and is left for the next call.
+    """
+    record = b''
+    for line in f:
+        if record:
+            line = record + line
+        # csv doubles quotes inside quoted fields, so a complete record has an even count
+        if line.endswith(b'\n') and (b'"' not in line or line.count(b'"') % 2 == 0):
+            yield line
+            record = b''
+        else:
+            record = line
+
+
+def record_key(record):
+    """(username, month) of a CSV record, or None if it has fewer fields"""
+    if b'"' in record:
+        row = parse_record(record)
+    else:
+        # No quoting, so no field contains a comma
+        row = record.decode(ENCODING).split(',', 2)
+    return (row[0], row[1]) if len(row) >= 3 else None
+
+
+def parse_record(record):
+    return next(csv.reader([record.decode(ENCODING)]), [])
@@ -0,0 +1,151 @@
+import sys
+from array import array
+from bisect import bisect_left
+from datetime import date
+from functools import lru_cache
+
+from expense_export import EPOCH_ORDINAL, MISSING_DAY, date_to_days
+from expense_repository import Expense, month_bounds
+
+# === Expense Block ===
+# Expenses stored column by column in typed arrays instead of one tuple
+# of Python objects per row: 8-byte id, 4-byte day number, 8-byte price,
+# 4-byte category id and a 4-byte code into a shared item dictionary,
+# about 28 bytes an expense plus one copy of each distinct item name.
+# The column layout is the one expense_export writes to .npz, and every
+# column exposes the buffer protocol, so numpy.frombuffer can wrap it
+# without a copy where numpy is installed.
+#
+# Rows are kept in date order, so a month is a bisect and a slice.
+
+COLUMNS = [
+    # attribute, array typecode
+    ("ids", "q"),
+    ("days", "i"),
+    ("prices", "d"),
+    ("category_ids", "i"),
+    ("items", "i"),
+]
+
+
+@lru_cache(maxsize=4096)
+def days_to_date(days):
+    """Inverse of expense_export.date_to_days; None for a missing date"""
+    if days == MISSING_DAY:
+        return None
+    return date.fromordinal(days + EPOCH_ORDINAL).isoformat()
+
+
+class ExpenseBlock:
+    __slots__ = [name for name, _ in COLUMNS] + ["item_names", "item_codes", "categories"]
+
+    def __init__(self, categories=None, item_names=None, item_codes=None):
+        for name, typecode in COLUMNS:
+            setattr(self, name, array(typecode))
+        # Slices share the item dictionary and category names of their parent
+        self.item_names = [] if item_names is None else item_names
+        self.item_codes = {} if item_codes is None else item_codes
+        self.categories = {} if categories is None else categories
+
+    @classmethod
+    def from_rows(cls, rows):
+        """Build from (id, date, item, price, category_id, category) rows in date order,
+        as ExpenseRepository.iter_range yields them"""
+        block = cls()
+        for expense_id, date_str, item, price, category_id, category in rows:
+            if category_id is not None and category_id not in block.categories:
+                block.categories[category_id] = category
+            block.append(expense_id, date_str, item, price, category_id)
+        return block
+
+    def append(self, expense_id, date_str, item, price, category_id):
+        day = date_to_days(date_str)
+        if self.days and day < self.days[-1]:
+            raise ValueError("ExpenseBlock rows must be appended in date order")
+        item = item or ""
+        code = self.item_codes.get(item)
+        if code is None:
+            code = self.item_codes[item] = len(self.item_names)
+            self.item_names.append(sys.intern(item))
+        self.ids.append(expense_id)
+        self.days.append(day)
+        self.prices.append(float("nan") if price is None else price)
+        self.category_ids.append(category_id or 0)
+        self.items.append(code)
+
+    def __len__(self):
+        return len(self.ids)
+
+    def _empty_like(self):
+        return ExpenseBlock(self.categories, self.item_names, self.item_codes)
+
+    def _slice(self, start, stop):
+        block = self._empty_like()
+        for name, _ in COLUMNS:
+            setattr(block, name, getattr(self, name)[start:stop])
+        return block
+
+    def _take(self, positions):
+        block = self._empty_like()
+        for name, typecode in COLUMNS:
+            column = getattr(self, name)
+            setattr(block, name, array(typecode, [column[i] for i in positions]))
+        return block
+
+    def between(self, start, end):
+        """Expenses with start <= date < end (YYYY-MM-DD strings)"""
+        return self._slice(bisect_left(self.days, date_to_days(start)),
+                           bisect_left(self.days, date_to_days(end)))
+
+    def month(self, year, month):
+        return self.between(*month_bounds(year, month))
+
+    def category(self, category_id):
+        return self._take([i for i, c in enumerate(self.category_ids) if c == category_id])
+
+    def total(self):
+        return sum(price for price in self.prices if price == price)
+
+    def totals_by_category(self):
+        """{category name: total} in category id order"""
+        totals = {}
+        for category_id, price in zip(self.category_ids, self.prices):
+            if price == price:
+                totals[category_id] = totals.get(category_id, 0) + price
+        return {self.categories.get(c, ""): totals[c] for c in sorted(totals)}
+
+    def month_totals(self):
+        """{month number: total} in one pass over the day column"""
+        totals = {}
+        for day, price in zip(self.days, self.prices):
+            if day != MISSING_DAY and price == price:
+                month = int(days_to_date(day)[5:7])
+                totals[month] = totals.get(month, 0) + price
+        return totals
+
+    def expense(self, i):
+        price = self.prices[i]
+        category_id = self.category_ids[i]
+        return Expense(self.ids[i], self.item_names[self.items[i]], None if price != price else price,
+                       days_to_date(self.days[i]), self.categories.get(category_id, ""))
+
+    def expenses(self, by_category=False):
+        """Materialize Expense tuples, in date order or list_month's (category id, date) order"""
+        positions = range(len(self))
+        if by_category:
+            # Stable sort: dates stay in order within a category
+            positions = sorted(positions, key=self.category_ids.__getitem__)
+        return [self.expense(i) for i in positions]
+
+    def __iter__(self):
+        return iter(self.expenses())
+
+    def nbytes(self):
+        """Approximate memory held: the columns plus the item dictionary it shares"""
+        columns = sum(len(column) * column.itemsize for column in (getattr(self, name) for name, _ in COLUMNS))
+        items = (sys.getsizeof(self.item_names) + sys.getsizeof(self.item_codes)
+                 + sum(sys.getsizeof(item) for item in self.item_names))
+        return columns + items
+
+    def bytes_per_expense(self):
+        return self.nbytes() / len(self) if len(self) else 0.0
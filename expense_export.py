@@ -0,0 +1,185 @@
+import argparse
+import csv
+import json
+import os
+import shutil
+import sys
+import tempfile
+import zipfile
+from array import array
+from datetime import date
+from functools import lru_cache
+
+from expense_repository import DB_PATH, ExpenseRepository, setup_database
+
+# === Expense Export ===
+# Streams one user's expenses out of SQLite as CSV, JSON Lines or a
+# columnar .npz snapshot. Rows are pulled with cursor.fetchmany and
+# written as they arrive, so exports of tens of millions of rows run in
+# constant memory (the .npz item dictionary is the only thing that grows,
+# and only with the number of distinct item names).
+#
+#   python expense_export.py --user alice --out alice.npz --start 2025-01-01 --end 2026-01-01
+
+FORMATS = ("csv", "jsonl", "npz")
+CHUNK_SIZE = 5000
+
+MIN_DATE = "0000-01-01"
+MAX_DATE = "9999-12-31"
+
+CSV_HEADER = ["id", "date", "category", "item", "price"]
+
+EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+MISSING_DAY = -2 ** 31
+
+
+def format_from_path(path):
+    ext = os.path.splitext(path)[1].lower().lstrip(".")
+    if ext == "json":
+        ext = "jsonl"
+    if ext not in FORMATS:
+        raise ValueError(f"Can't tell the export format from '{path}'; use .csv, .jsonl or .npz")
+    return ext
+
+
+@lru_cache(maxsize=4096)
+def date_to_days(date_str):
+    """Days since 1970-01-01, the unit numpy uses for datetime64[D]"""
+    try:
+        return date.fromisoformat(date_str).toordinal() - EPOCH_ORDINAL
+    except (TypeError, ValueError):
+        return MISSING_DAY
+
+
+def write_csv(rows, path):
+    count = 0
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(CSV_HEADER)
+        for expense_id, date_str, item, price, _, category in rows:
+            writer.writerow([expense_id, date_str, category, item, price])
+            count += 1
+    return count
+
+
+def write_jsonl(rows, path):
+    count = 0
+    with open(path, "w", encoding="utf-8") as f:
+        for expense_id, date_str, item, price, _, category in rows:
+            f.write(json.dumps({"id": expense_id, "date": date_str, "category": category,
+                                "item": item, "price": price}, ensure_ascii=False))
+            f.write("\n")
+            count += 1
+    return count
+
+
+# --- .npz snapshots ---
+# Written without numpy: each column is spooled to a temporary file as
+# raw little-endian values, then copied behind a .npy header into the
+# zip archive, exactly as numpy.savez would lay it out.
+
+NPZ_COLUMNS = [
+    # name, array typecode, numpy descr
+    ("id", "q", "<i8"),
+    ("date", "i", "<i4"),
+    ("price", "d", "<f8"),
+    ("category_id", "i", "<i4"),
+    ("item", "i", "<i4"),
+]
+
+
+def _npy_header(descr, length):
+    header = "{'descr': %r, 'fortran_order': False, 'shape': (%d,), }" % (descr, length)
+    # magic (6) + version (2) + header length (2) + header + newline, padded to 64 bytes
+    padding = -(10 + len(header) + 1) % 64
+    header = (header + " " * padding + "\n").encode("latin1")
+    return b"\x93NUMPY\x01\x00" + len(header).to_bytes(2, "little") + header
+
+
+def _flush_column(buffer, spool):
+    if sys.byteorder != "little":
+        buffer.byteswap()
+    buffer.tofile(spool)
+    del buffer[:]
+
+
+def write_npz(rows, path, chunk_size=CHUNK_SIZE):
+    item_codes = {}
+    buffers = {name: array(typecode) for name, typecode, _ in NPZ_COLUMNS}
+    spools = {name: tempfile.TemporaryFile() for name, _, _ in NPZ_COLUMNS}
+    count = 0
+    try:
+        for expense_id, date_str, item, price, category_id, _ in rows:
+            code = item_codes.setdefault(item or "", len(item_codes))
+            buffers["id"].append(expense_id)
+            buffers["date"].append(date_to_days(date_str))
+            buffers["price"].append(float("nan") if price is None else price)
+            buffers["category_id"].append(category_id or 0)
+            buffers["item"].append(code)
+            count += 1
+            if count % chunk_size == 0:
+                for name, buffer in buffers.items():
+                    _flush_column(buffer, spools[name])
+        for name, buffer in buffers.items():
+            _flush_column(buffer, spools[name])
+
+        with zipfile.ZipFile(path, "w", zipfile.ZIP_STORED, allowZip64=True) as zf:
+            for name, _, descr in NPZ_COLUMNS:
+                spool = spools[name]
+                spool.seek(0)
+                with zf.open(f"{name}.npy", "w", force_zip64=True) as entry:
+                    entry.write(_npy_header(descr, count))
+                    shutil.copyfileobj(spool, entry, 1024 * 1024)
+
+            # Dictionary for the item codes, as a fixed-width unicode array
+            width = max((len(item) for item in item_codes), default=0) or 1
+            with zf.open("items.npy", "w", force_zip64=True) as entry:
+                entry.write(_npy_header(f"<U{width}", len(item_codes)))
+                for item in item_codes:
+                    entry.write(item.ljust(width, "\0").encode("utf-32-le"))
+    finally:
+        for spool in spools.values():
+            spool.close()
+    return count
+
+
+WRITERS = {"csv": write_csv, "jsonl": write_jsonl, "npz": write_npz}
+
+
+def export_expenses(repo, username, path, fmt=None, start=None, end=None, chunk_size=CHUNK_SIZE):
+    """Export a user's expenses with start <= date < end; returns the row count
+
+    Without start and end, expenses with no date are exported as well.
+    """
+    fmt = fmt or format_from_path(path)
+    if start is None and end is None:
+        rows = repo.iter_range(username, chunk_size=chunk_size)
+    else:
+        rows = repo.iter_range(username, start or MIN_DATE, end or MAX_DATE, chunk_size)
+    try:
+        return WRITERS[fmt](rows, path)
+    finally:
+        rows.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export a user's expenses")
+    parser.add_argument("--user", required=True)
+    parser.add_argument("--out", required=True, help="Output file (.csv, .jsonl or .npz)")
+    parser.add_argument("--format", choices=FORMATS, help="Override the format implied by --out")
+    parser.add_argument("--start", help="First date to include (YYYY-MM-DD)")
+    parser.add_argument("--end", help="Date to stop before (YYYY-MM-DD)")
+    parser.add_argument("--db", default=DB_PATH)
+    args = parser.parse_args()
+
+    setup_database(args.db)
+    repo = ExpenseRepository(args.db)
+    try:
+        count = export_expenses(repo, args.user, args.out, args.format, args.start, args.end)
+    finally:
+        repo.close()
+    print(f"Exported {count:,} expenses to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+import json
+import os
+
+# === Monthly Expense Journal ===
+# Persistence for the in-memory month cards tracker (.py). Its
+# monthly_expenses dict of {month: [(item, price), ...]} is kept on disk
+# as a snapshot plus an append-only JSON Lines journal of the changes
+# made since:
+#   {"seq": 12, "op": "add", "month": "May", "item": "Rice", "price": 50}
+#   {"seq": 13, "op": "clear", "month": "May"}
+# Every COMPACT_EVERY changes the dict is written out as a new snapshot
+# and the journal starts over. Loading therefore replays at most that
+# many lines on top of the live data, however long the app has been in
+# use.
+#
+# Each change carries a sequence number and the snapshot records the last
+# one it includes. If the app dies between replacing the snapshot and
+# emptying the journal, the lines already in the snapshot are skipped on
+# the next load. A last line cut off mid-write is ignored.
+
+JOURNAL_PATH = 'monthly_expenses.jsonl'
+SNAPSHOT_PATH = 'monthly_expenses.snapshot.json'
+COMPACT_EVERY = 1000
+
+
+class ExpenseJournal:
+    def __init__(self, months, journal_path=JOURNAL_PATH, snapshot_path=SNAPSHOT_PATH):
+        self.journal_path = journal_path
+        self.snapshot_path = snapshot_path
+        self.expenses = {month: [] for month in months}
+        self.seq = 0
+        self._pending = 0
+        self._load()
+        self._file = open(self.journal_path, 'a', encoding='utf-8')
+        if self._pending >= COMPACT_EVERY:
+            self.compact()
+
+    def _load(self):
+        snapshot_seq = 0
+        if os.path.exists(self.snapshot_path):
+            with open(self.snapshot_path, 'r', encoding='utf-8') as f:
+                snapshot = json.load(f)
+            snapshot_seq = snapshot["seq"]
+            for month, rows in snapshot["months"].items():
+                self.expenses[month] = [(item, price) for item, price in rows]
+        self.seq = snapshot_seq
+
+        if not os.path.exists(self.journal_path):
+            return
+        # Short by design: compaction keeps it under COMPACT_EVERY lines
+        with open(self.journal_path, 'rb') as f:
+            data = f.read()
+        good_end = 0
+        for line in data.splitlines(keepends=True):
+            try:
+                if not line.endswith(b"\n"):
+                    raise ValueError("partial line")
+                entry = json.loads(line)
+            except ValueError:
+                print(f"Dropping unreadable end of {self.journal_path}")
+                with open(self.journal_path, 'rb+') as f:
+                    f.truncate(good_end)
+                break
+            good_end += len(line)
+            if entry["seq"] <= snapshot_seq:
+                continue
+            self._apply(entry)
+            self.seq = entry["seq"]
+            self._pending += 1
+
+    def _apply(self, entry):
+        if entry["op"] == "add":
+            self.expenses.setdefault(entry["month"], []).append((entry["item"], entry["price"]))
+        elif entry["op"] == "clear":
+            self.expenses[entry["month"]] = []
+
+    def _record(self, entry):
+        self.seq += 1
+        entry = {"seq": self.seq, **entry}
+        self._apply(entry)
+        self._file.write(json.dumps(entry) + "\n")
+        self._file.flush()
+        self._pending += 1
+        if self._pending >= COMPACT_EVERY:
+            self.compact()
+
+    def add(self, month, item, price):
+        self._record({"op": "add", "month": month, "item": item, "price": price})
+
+    def clear(self, month):
+        self._record({"op": "clear", "month": month})
+
+    def compact(self):
+        """Write every month to a new snapshot and start an empty journal"""
+        tmp_path = self.snapshot_path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({"seq": self.seq, "months": self.expenses}, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.snapshot_path)
+        self._file.close()
+        self._file = open(self.journal_path, 'w', encoding='utf-8')
+        self._pending = 0
+
+    def close(self):
+        self._file.close()
@@ -0,0 +1,427 @@
+from bisect import bisect_right
+
+from PyQt5.QtCore import (Qt, QAbstractListModel, QEvent, QModelIndex, QRect, QSize,
+                          pyqtSignal)
+from PyQt5.QtGui import QColor, QPainter, QPen
+from PyQt5.QtWidgets import QAbstractItemView, QFrame, QListView, QStyle, QStyledItemDelegate
+
+from month_view import format_amount, view_row
+from theme import font
+
+# === Expense List Model/View ===
+# A month's expenses as one flat list model (category header, expense
+# rows, category total, next header, ...) drawn by a delegate. No widget
+# is created per row and every row has the same height, so QListView only
+# lays out and paints the rows inside the viewport: a month with 5,000
+# expenses costs the same to show as one with 5.
+#
+# Each category is a section that can be collapsed to its header, which
+# then shows the category's count and total. A section's rows may not be
+# loaded yet; the month page streams them in chunks when the section is
+# expanded, and each chunk is appended as it arrives.
+#
+# Adds and deletes are applied in place: one row is inserted or removed
+# and the affected category total repainted, without resetting the model.
+
+HEADER_ROW, EXPENSE_ROW, TOTAL_ROW = range(3)
+
+ROW_KIND_ROLE = Qt.UserRole + 1
+EXPENSE_ROLE = Qt.UserRole + 2
+CATEGORY_ROLE = Qt.UserRole + 3
+AMOUNT_ROLE = Qt.UserRole + 4
+COUNT_ROLE = Qt.UserRole + 5
+EXPANDED_ROLE = Qt.UserRole + 6
+LOADING_ROLE = Qt.UserRole + 7
+
+ROW_HEIGHT = 46
+ROW_SPACING = 5
+DATE_WIDTH = 120
+PRICE_WIDTH = 100
+DELETE_SIZE = 20
+
+
+class CategorySection:
+    __slots__ = ["category", "count", "total", "rows", "expanded", "loaded"]
+
+    def __init__(self, category, count, total, rows, expanded):
+        self.category = category
+        self.count = count
+        self.total = total
+        # ExpenseRows in date order, or None until the first chunk arrives
+        self.rows = rows
+        self.expanded = expanded
+        # Whether rows holds every expense of the section
+        self.loaded = rows is not None
+
+    def visible_rows(self):
+        """(kind, payload) rows shown for this section"""
+        if not self.expanded or self.rows is None:
+            return [(HEADER_ROW, self)]
+        return [(HEADER_ROW, self)] + [(EXPENSE_ROW, row) for row in self.rows] + [(TOTAL_ROW, self)]
+
+
+class ExpenseListModel(QAbstractListModel):
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.rows = []
+        # Sections in display order, and by category name
+        self.sections = []
+        self.by_category = {}
+        self.expanded = set()
+
+    def set_month(self, view, expanded=()):
+        """Replace the contents with a MonthViewModel; categories in expanded start open"""
+        self.beginResetModel()
+        self.expanded = set(expanded)
+        self.sections = []
+        self.by_category = {}
+        self.rows = []
+        for group in view.groups:
+            # The view may be shared through the month cache, so rows are copied
+            rows = list(group.rows) if group.rows is not None else None
+            section = CategorySection(group.category, group.count, group.total, rows,
+                                      group.category in self.expanded)
+            self.sections.append(section)
+            self.by_category[group.category] = section
+            self.rows.extend(section.visible_rows())
+        self.endResetModel()
+
+    def _start(self, section):
+        """Row of a section's header"""
+        row = 0
+        for other in self.sections:
+            if other is section:
+                return row
+            row += len(other.visible_rows())
+        raise KeyError(section.category)
+
+    def _section_changed(self, section):
+        start = self._start(section)
+        end = start + len(section.visible_rows()) - 1
+        self.dataChanged.emit(self.index(start), self.index(start))
+        if end != start:
+            self.dataChanged.emit(self.index(end), self.index(end))
+
+    def _show_body(self, section):
+        start = self._start(section) + 1
+        body = section.visible_rows()[1:]
+        self.beginInsertRows(QModelIndex(), start, start + len(body) - 1)
+        self.rows[start:start] = body
+        self.endInsertRows()
+
+    def _hide_body(self, section, length):
+        start = self._start(section) + 1
+        self.beginRemoveRows(QModelIndex(), start, start + length - 1)
+        del self.rows[start:start + length]
+        self.endRemoveRows()
+
+    def toggle(self, category):
+        """Expand or collapse a section; returns whether it is now expanded"""
+        section = self.by_category[category]
+        body_length = len(section.visible_rows()) - 1
+        section.expanded = not section.expanded
+        if section.expanded:
+            self.expanded.add(category)
+        else:
+            self.expanded.discard(category)
+        if section.rows is not None:
+            if section.expanded:
+                self._show_body(section)
+            else:
+                self._hide_body(section, body_length)
+        self._section_changed(section)
+        return section.expanded
+
+    def pending_categories(self):
+        """Expanded sections whose rows haven't all been fetched"""
+        return [s.category for s in self.sections if s.expanded and not s.loaded]
+
+    def discard_partial_rows(self, category):
+        """Drop the rows of a section whose stream was stopped, so it can be fetched again"""
+        section = self.by_category.get(category)
+        if section is None or section.loaded or section.rows is None:
+            return
+        if section.expanded:
+            self._hide_body(section, len(section.visible_rows()) - 1)
+        section.rows = None
+        self._section_changed(section)
+
+    def add_category_rows(self, category, rows):
+        """Append the next chunk of a section's ExpenseRows"""
+        section = self.by_category.get(category)
+        if section is None or section.loaded:
+            return
+        if section.rows is None:
+            section.rows = list(rows)
+            if section.expanded:
+                self._show_body(section)
+        else:
+            end = self._start(section) + 1 + len(section.rows)
+            section.rows.extend(rows)
+            if section.expanded and rows:
+                self.beginInsertRows(QModelIndex(), end, end + len(rows) - 1)
+                self.rows[end:end] = [(EXPENSE_ROW, row) for row in rows]
+                self.endInsertRows()
+
+    def finish_category_rows(self, category):
+        """Mark a section complete; its count and total now come from its rows"""
+        section = self.by_category.get(category)
+        if section is None or section.loaded:
+            return
+        if not section.rows:
+            # Emptied since the summary was read
+            length = len(section.visible_rows())
+            start = self._start(section)
+            self.beginRemoveRows(QModelIndex(), start, start + length - 1)
+            del self.rows[start:start + length]
+            self.sections.remove(section)
+            del self.by_category[category]
+            self.endRemoveRows()
+            return
+        section.loaded = True
+        section.count = len(section.rows)
+        section.total = sum(row.price or 0 for row in section.rows)
+        self._section_changed(section)
+
+    def insert_expense(self, expense, category_order):
+        """Add one expense in list_month order; category_order lists names by category id"""
+        expense = view_row(expense)
+        category = expense.category
+        section = self.by_category.get(category)
+
+        if section is None:
+            # New category: its section goes before the first one that sorts after it
+            def rank(name):
+                return category_order.index(name) if name in category_order else len(category_order)
+
+            position = next((i for i, other in enumerate(self.sections)
+                             if rank(other.category) > rank(category)), len(self.sections))
+            start = self._start(self.sections[position]) if position < len(self.sections) else len(self.rows)
+            section = CategorySection(category, 1, expense.price or 0, [expense], category in self.expanded)
+            new_rows = section.visible_rows()
+            self.beginInsertRows(QModelIndex(), start, start + len(new_rows) - 1)
+            self.sections.insert(position, section)
+            self.by_category[category] = section
+            self.rows[start:start] = new_rows
+            self.endInsertRows()
+            return
+
+        section.count += 1
+        section.total += expense.price or 0
+        if not section.loaded:
+            # A stream that is still running may or may not include the
+            # new row; start the section over
+            self.discard_partial_rows(category)
+        elif section.rows is not None:
+            # Within a category rows are in date order
+            i = bisect_right(section.rows, expense.date or "", key=lambda r: r.date or "")
+            section.rows.insert(i, expense)
+            if section.expanded:
+                row = self._start(section) + 1 + i
+                self.beginInsertRows(QModelIndex(), row, row)
+                self.rows.insert(row, (EXPENSE_ROW, expense))
+                self.endInsertRows()
+        self._section_changed(section)
+
+    def remove_expense(self, expense_id):
+        """Remove one expense by id; returns False if it isn't loaded in the model"""
+        for section in self.sections:
+            if section.rows is None:
+                continue
+            i = next((i for i, row in enumerate(section.rows) if row.id == expense_id), None)
+            if i is None:
+                continue
+            expense = section.rows[i]
+            start = self._start(section)
+
+            if section.count <= 1:
+                # Last expense of its category: the whole section goes
+                length = len(section.visible_rows())
+                self.beginRemoveRows(QModelIndex(), start, start + length - 1)
+                del self.rows[start:start + length]
+                self.sections.remove(section)
+                del self.by_category[section.category]
+                self.endRemoveRows()
+                return True
+
+            del section.rows[i]
+            section.count -= 1
+            section.total -= expense.price or 0
+            if section.expanded:
+                row = start + 1 + i
+                self.beginRemoveRows(QModelIndex(), row, row)
+                del self.rows[row]
+                self.endRemoveRows()
+            self._section_changed(section)
+            return True
+        return False
+
+    def expense_count(self):
+        return sum(section.count for section in self.sections)
+
+    def total(self):
+        return sum(section.total for section in self.sections)
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.rows)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        kind, payload = self.rows[index.row()]
+        if role == ROW_KIND_ROLE:
+            return kind
+        if role == EXPENSE_ROLE:
+            return payload if kind == EXPENSE_ROW else None
+        if role == CATEGORY_ROLE:
+            return payload.category
+        if role == AMOUNT_ROLE:
+            return (payload.price or 0) if kind == EXPENSE_ROW else payload.total
+        if kind == EXPENSE_ROW:
+            if role == Qt.DisplayRole:
+                return f"{payload.date_text}  {payload.item}  {payload.price_text}"
+            return None
+        if role == COUNT_ROLE:
+            return payload.count
+        if role == EXPANDED_ROLE:
+            return payload.expanded
+        if role == LOADING_ROLE:
+            return payload.expanded and not payload.loaded
+        if role == Qt.DisplayRole:
+            if kind == HEADER_ROW:
+                return payload.category
+            return f"{payload.category} Total: {format_amount(payload.total)}"
+        return None
+
+    def flags(self, index):
+        if not index.isValid():
+            return Qt.NoItemFlags
+        return Qt.ItemIsEnabled
+
+
+class ExpenseDelegate(QStyledItemDelegate):
+    delete_requested = pyqtSignal(int)
+    toggle_requested = pyqtSignal(str)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.header_font = font("heading")
+        self.total_font = font("small_bold")
+        self.date_font = font("small")
+        self.item_font = font("body")
+        self.price_font = font("body_bold")
+
+    def sizeHint(self, option, index):
+        return QSize(option.rect.width(), ROW_HEIGHT)
+
+    def _card_rect(self, rect):
+        return rect.adjusted(0, ROW_SPACING // 2, 0, -(ROW_SPACING - ROW_SPACING // 2))
+
+    def _delete_rect(self, rect):
+        card = self._card_rect(rect)
+        return QRect(card.right() - 10 - DELETE_SIZE, card.center().y() - DELETE_SIZE // 2,
+                     DELETE_SIZE, DELETE_SIZE)
+
+    def paint(self, painter, option, index):
+        kind = index.data(ROW_KIND_ROLE)
+        painter.save()
+        painter.setRenderHint(QPainter.Antialiasing)
+        if kind == HEADER_ROW:
+            self._paint_header(painter, option.rect, index)
+        elif kind == TOTAL_ROW:
+            self._paint_total(painter, option.rect, index.data(CATEGORY_ROLE), index.data(AMOUNT_ROLE))
+        else:
+            hovered = bool(option.state & QStyle.State_MouseOver)
+            self._paint_expense(painter, option.rect, index.data(EXPENSE_ROLE), hovered)
+        painter.restore()
+
+    def _paint_header(self, painter, rect, index):
+        expanded = index.data(EXPANDED_ROLE)
+        text_rect = rect.adjusted(0, 0, 0, -4)
+        painter.setFont(self.header_font)
+        painter.setPen(QColor("#2c3e50"))
+        painter.drawText(text_rect, Qt.AlignLeft | Qt.AlignBottom,
+                         f"{'▾' if expanded else '▸'} {index.data(CATEGORY_ROLE)}")
+
+        # Collapsed sections carry their total in the header
+        count = index.data(COUNT_ROLE)
+        summary = f"{count} expense{'' if count == 1 else 's'}"
+        if index.data(LOADING_ROLE):
+            summary = f"{summary}  ·  Loading…"
+        elif not expanded:
+            summary = f"{summary}  ·  {format_amount(index.data(AMOUNT_ROLE))}"
+        painter.setFont(self.total_font)
+        painter.setPen(QColor("#7f8c8d"))
+        painter.drawText(text_rect, Qt.AlignRight | Qt.AlignBottom, summary)
+
+        painter.setPen(QPen(QColor("#3498db"), 2))
+        painter.drawLine(rect.left(), rect.bottom() - 1, rect.right(), rect.bottom() - 1)
+
+    def _paint_total(self, painter, rect, category, amount):
+        card = self._card_rect(rect)
+        painter.setPen(Qt.NoPen)
+        painter.setBrush(QColor("#e8f4f8"))
+        painter.drawRoundedRect(card, 5, 5)
+        painter.setFont(self.total_font)
+        painter.setPen(QColor("#2980b9"))
+        text_rect = card.adjusted(20, 0, -20, 0)
+        painter.drawText(text_rect, Qt.AlignLeft | Qt.AlignVCenter, f"{category} Total:")
+        painter.drawText(text_rect, Qt.AlignRight | Qt.AlignVCenter, format_amount(amount))
+
+    def _paint_expense(self, painter, rect, expense, hovered):
+        card = self._card_rect(rect)
+        painter.setPen(Qt.NoPen)
+        painter.setBrush(QColor("#f9f9f9"))
+        painter.drawRoundedRect(card, 5, 5)
+
+        delete_rect = self._delete_rect(rect)
+        x = card.left() + 20
+        right = delete_rect.left() - 10
+
+        painter.setFont(self.date_font)
+        painter.setPen(QColor("#7f8c8d"))
+        painter.drawText(QRect(x, card.top(), DATE_WIDTH, card.height()),
+                         Qt.AlignLeft | Qt.AlignVCenter, expense.date_text)
+
+        price_rect = QRect(right - PRICE_WIDTH, card.top(), PRICE_WIDTH, card.height())
+        painter.setFont(self.price_font)
+        painter.setPen(QColor("#16a085"))
+        painter.drawText(price_rect, Qt.AlignRight | Qt.AlignVCenter, expense.price_text)
+
+        item_rect = QRect(x + DATE_WIDTH, card.top(), price_rect.left() - x - DATE_WIDTH - 10, card.height())
+        painter.setFont(self.item_font)
+        painter.setPen(QColor("#2c3e50"))
+        item = painter.fontMetrics().elidedText(expense.item or "", Qt.ElideRight, item_rect.width())
+        painter.drawText(item_rect, Qt.AlignLeft | Qt.AlignVCenter, item)
+
+        painter.setPen(Qt.NoPen)
+        painter.setBrush(QColor("#c0392b" if hovered else "#e74c3c"))
+        painter.drawEllipse(delete_rect)
+        painter.setPen(QColor("white"))
+        painter.setFont(self.total_font)
+        painter.drawText(delete_rect, Qt.AlignCenter, "×")
+
+    def editorEvent(self, event, model, option, index):
+        if event.type() == QEvent.MouseButtonRelease and event.button() == Qt.LeftButton:
+            kind = index.data(ROW_KIND_ROLE)
+            if kind == HEADER_ROW:
+                self.toggle_requested.emit(index.data(CATEGORY_ROLE))
+                return True
+            if kind == EXPENSE_ROW and self._delete_rect(option.rect).contains(event.pos()):
+                self.delete_requested.emit(index.data(EXPENSE_ROLE).id)
+                return True
+        return super().editorEvent(event, model, option, index)
+
+
+class ExpenseListView(QListView):
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        # Same height for every row: the view never measures off-screen rows
+        self.setUniformItemSizes(True)
+        self.setSelectionMode(QAbstractItemView.NoSelection)
+        self.setVerticalScrollMode(QAbstractItemView.ScrollPerPixel)
+        self.setFrameShape(QFrame.NoFrame)
+        self.setMouseTracking(True)
+        self.setObjectName("expenseList")
+        self.delegate = ExpenseDelegate(self)
+        self.setItemDelegate(self.delegate)
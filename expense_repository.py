@@ -0,0 +1,535 @@
+import os
+import queue
+import sqlite3
+import threading
+from collections import namedtuple
+from contextlib import contextmanager
+
+from migrations import SCHEMA_VERSION, SQL_REBUILD_SUMMARY, migrate, print_timings, schema_version
+from query_cache import MAX_CACHED_ROWS, QueryCache
+
+# === SQLite Repository ===
+# One long-lived writer connection plus a small pool of read-only
+# connections shared by every widget, instead of a sqlite3.connect()
+# per click.
+
+DB_PATH = 'expense_tracker.db'
+
+READER_POOL_SIZE = 3
+STATEMENT_CACHE_SIZE = 64
+
+# Streaming reads hand back a small first chunk so a view can draw its
+# first screen at once, then larger ones
+FIRST_CHUNK_SIZE = 50
+STREAM_CHUNK_SIZE = 1000
+
+# === Performance Profiles ===
+# Pragmas applied to every connection. Pick one with the
+# EXPENSE_DB_PROFILE environment variable.
+
+PROFILES = {
+    # Every commit is fsynced; safest against power loss
+    "durable": {
+        "journal_mode": "WAL",
+        "synchronous": "FULL",
+        "mmap_size": 0,
+        "cache_size": -2000,
+        "temp_store": "DEFAULT",
+        "busy_timeout": 5000,
+    },
+    # WAL with NORMAL sync: commits only fsync at checkpoints
+    "balanced": {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "mmap_size": 64 * 1024 * 1024,
+        "cache_size": -16000,
+        "temp_store": "MEMORY",
+        "busy_timeout": 5000,
+    },
+    # No fsync at all; a crash can lose the latest commits
+    "fast": {
+        "journal_mode": "WAL",
+        "synchronous": "OFF",
+        "mmap_size": 256 * 1024 * 1024,
+        "cache_size": -64000,
+        "temp_store": "MEMORY",
+        "busy_timeout": 2000,
+    },
+}
+
+DEFAULT_PROFILE = "balanced"
+ACTIVE_PROFILE = os.environ.get("EXPENSE_DB_PROFILE", DEFAULT_PROFILE)
+if ACTIVE_PROFILE not in PROFILES:
+    print(f"Unknown database profile '{ACTIVE_PROFILE}', using '{DEFAULT_PROFILE}'")
+    ACTIVE_PROFILE = DEFAULT_PROFILE
+
+
+def apply_profile(conn, profile=None, read_only=False):
+    settings = PROFILES[profile or ACTIVE_PROFILE]
+    # journal_mode is stored in the database file, so only writers set it
+    if not read_only:
+        conn.execute(f"PRAGMA journal_mode = {settings['journal_mode']}")
+    conn.execute(f"PRAGMA synchronous = {settings['synchronous']}")
+    conn.execute(f"PRAGMA mmap_size = {settings['mmap_size']}")
+    conn.execute(f"PRAGMA cache_size = {settings['cache_size']}")
+    conn.execute(f"PRAGMA temp_store = {settings['temp_store']}")
+    conn.execute(f"PRAGMA busy_timeout = {settings['busy_timeout']}")
+
+Expense = namedtuple("Expense", ["id", "item", "price", "date", "category"])
+CategorySummary = namedtuple("CategorySummary", ["category", "count", "total"])
+
+# SQL is kept in module constants so every call passes the identical
+# string and hits the per-connection prepared statement cache.
+SQL_AUTHENTICATE = "SELECT * FROM users WHERE username = ? AND password = ?"
+SQL_USER_EXISTS = "SELECT 1 FROM users WHERE username = ?"
+SQL_USER_NAME = "SELECT name FROM users WHERE username = ?"
+SQL_GET_USER = "SELECT username, name, email, password FROM users WHERE username = ?"
+SQL_ADD_USER = "INSERT INTO users (username, name, email, password) VALUES (?, ?, ?, ?)"
+SQL_ADD_USER_IF_MISSING = "INSERT OR IGNORE INTO users (username, name, email, password) VALUES (?, ?, ?, ?)"
+SQL_CATEGORIES = "SELECT id, name FROM categories ORDER BY id"
+SQL_CATEGORY_ID = "SELECT id FROM categories WHERE name = ?"
+SQL_ADD_CATEGORY = "INSERT INTO categories (name) VALUES (?)"
+SQL_ADD_EXPENSE = "INSERT INTO expenses (username, item, price, date, category_id) VALUES (?, ?, ?, ?, ?)"
+SQL_DELETE_EXPENSE = "DELETE FROM expenses WHERE id = ?"
+SQL_EXPENSE_MONTH = "SELECT username, date FROM expenses WHERE id = ?"
+SQL_LIST_MONTH = """
+    SELECT e.id, e.item, e.price, e.date, c.name
+    FROM expenses e
+    JOIN categories c ON e.category_id = c.id
+    WHERE e.username = ?
+    AND e.date >= ? AND e.date < ?
+    ORDER BY c.id, e.date
+"""
+SQL_LIST_MONTH_BY_DATE = """
+    SELECT e.id, e.item, e.price, e.date, c.name
+    FROM expenses e
+    LEFT JOIN categories c ON e.category_id = c.id
+    WHERE e.username = ?
+    AND e.date >= ? AND e.date < ?
+    ORDER BY e.date, e.id
+"""
+SQL_LIST_MONTH_CATEGORY = """
+    SELECT e.id, e.item, e.price, e.date, c.name
+    FROM expenses e
+    JOIN categories c ON e.category_id = c.id
+    WHERE e.username = ?
+    AND e.date >= ? AND e.date < ?
+    AND c.name = ?
+    ORDER BY e.date
+"""
+SQL_MONTH_SUMMARY = """
+    SELECT c.name, s.count, s.total
+    FROM monthly_summary s
+    JOIN categories c ON s.category_id = c.id
+    WHERE s.username = ? AND s.year = ? AND s.month = ?
+    ORDER BY c.id
+"""
+SQL_EXPORT_RANGE = """
+    SELECT e.id, e.date, e.item, e.price, e.category_id, c.name
+    FROM expenses e
+    LEFT JOIN categories c ON e.category_id = c.id
+    WHERE e.username = ?
+    AND e.date >= ? AND e.date < ?
+    ORDER BY e.date, e.id
+"""
+SQL_EXPORT_ALL = """
+    SELECT e.id, e.date, e.item, e.price, e.category_id, c.name
+    FROM expenses e
+    LEFT JOIN categories c ON e.category_id = c.id
+    WHERE e.username = ?
+    ORDER BY e.date, e.id
+"""
+SQL_YEAR_TOTALS = """
+    SELECT s.month, SUM(s.total)
+    FROM monthly_summary s
+    JOIN categories c ON s.category_id = c.id
+    WHERE s.username = ? AND s.year = ?
+    GROUP BY s.month
+"""
+SQL_EXPANDED_CATEGORIES = """
+    SELECT c.name
+    FROM expanded_categories x
+    JOIN categories c ON x.category_id = c.id
+    WHERE x.username = ?
+"""
+SQL_EXPAND_CATEGORY = """
+    INSERT OR IGNORE INTO expanded_categories (username, category_id)
+    SELECT ?, id FROM categories WHERE name = ?
+"""
+SQL_COLLAPSE_CATEGORY = """
+    DELETE FROM expanded_categories
+    WHERE username = ? AND category_id = (SELECT id FROM categories WHERE name = ?)
+"""
+
+
+def rebuild_monthly_summary(conn):
+    """Recompute monthly_summary from scratch in one set-based pass"""
+    conn.execute("DELETE FROM monthly_summary")
+    conn.execute(SQL_REBUILD_SUMMARY)
+
+
+def month_bounds(year, month):
+    """Return the half-open [start, end) date range covering a month"""
+    start = f"{year:04d}-{month:02d}-01"
+    if month == 12:
+        end = f"{year + 1:04d}-01-01"
+    else:
+        end = f"{year:04d}-{month + 1:02d}-01"
+    return start, end
+
+
+def year_bounds(year):
+    """Return the half-open [start, end) date range covering a year"""
+    return f"{year:04d}-01-01", f"{year + 1:04d}-01-01"
+
+
+def setup_database(db_path=DB_PATH, profile=None):
+    """Create or upgrade the database; returns the migration step timings.
+
+    When the stored schema version is current this is a single read of
+    PRAGMA user_version: no pragmas, no DDL and no write transaction.
+    """
+    conn = sqlite3.connect(db_path)
+    try:
+        if schema_version(conn) >= SCHEMA_VERSION:
+            return []
+        apply_profile(conn, profile)
+        timings = migrate(conn)
+    finally:
+        conn.close()
+    if timings:
+        print(f"Upgraded {db_path}:")
+        print_timings(timings)
+    return timings
+
+
+class CancelToken:
+    """Stops a streaming read from another thread.
+
+    cancel() sets a flag the reader checks between chunks and calls
+    Connection.interrupt on the connection it has borrowed, so a query
+    stuck inside a long step stops too.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._conn = None
+        self.cancelled = False
+
+    def attach(self, conn):
+        with self._lock:
+            self._conn = conn
+
+    def detach(self):
+        # Before the connection goes back to the pool, so a late cancel
+        # can't interrupt someone else's query
+        with self._lock:
+            self._conn = None
+
+    def cancel(self):
+        with self._lock:
+            self.cancelled = True
+            if self._conn is not None:
+                self._conn.interrupt()
+
+
+class ExpenseRepository:
+    def __init__(self, db_path=DB_PATH, pool_size=READER_POOL_SIZE, profile=None,
+                 cache_rows=MAX_CACHED_ROWS):
+        """cache_rows=0 turns the query result cache off, e.g. for benchmarks"""
+        self.db_path = db_path
+        self.pool_size = pool_size
+        self.profile = profile or ACTIVE_PROFILE
+        self._write_lock = threading.Lock()
+        self._writer = self._connect()
+        self._readers = queue.Queue()
+        self._reader_count = 0
+        self._pool_lock = threading.Lock()
+        self.cache = QueryCache(cache_rows)
+
+    def _connect(self, read_only=False):
+        if read_only:
+            conn = sqlite3.connect(f"file:{self.db_path}?mode=ro", uri=True,
+                                   check_same_thread=False,
+                                   cached_statements=STATEMENT_CACHE_SIZE)
+        else:
+            conn = sqlite3.connect(self.db_path, check_same_thread=False,
+                                   cached_statements=STATEMENT_CACHE_SIZE)
+        apply_profile(conn, self.profile, read_only)
+        return conn
+
+    @contextmanager
+    def _reader(self):
+        """Borrow a read-only connection, opening one if the pool isn't full yet"""
+        try:
+            conn = self._readers.get_nowait()
+        except queue.Empty:
+            with self._pool_lock:
+                can_open = self._reader_count < self.pool_size
+                if can_open:
+                    self._reader_count += 1
+            conn = self._connect(read_only=True) if can_open else self._readers.get()
+        try:
+            yield conn
+        finally:
+            self._readers.put(conn)
+
+    @contextmanager
+    def _transaction(self):
+        with self._write_lock:
+            try:
+                yield self._writer.cursor()
+            except Exception:
+                self._writer.rollback()
+                raise
+            else:
+                self._writer.commit()
+
+    def close(self):
+        with self._write_lock:
+            self._writer.close()
+        while not self._readers.empty():
+            self._readers.get_nowait().close()
+
+    # --- Users ---
+
+    def authenticate(self, username, password):
+        with self._reader() as conn:
+            return conn.execute(SQL_AUTHENTICATE, (username, password)).fetchone()
+
+    def user_exists(self, username):
+        with self._reader() as conn:
+            return conn.execute(SQL_USER_EXISTS, (username,)).fetchone() is not None
+
+    def get_user_name(self, username):
+        with self._reader() as conn:
+            row = conn.execute(SQL_USER_NAME, (username,)).fetchone()
+        return row[0] if row else None
+
+    def get_user(self, username):
+        """(username, name, email, password), or None"""
+        with self._reader() as conn:
+            return conn.execute(SQL_GET_USER, (username,)).fetchone()
+
+    def add_user(self, username, name, email, password):
+        with self._transaction() as c:
+            c.execute(SQL_ADD_USER, (username, name, email, password))
+
+    def add_users_many(self, rows):
+        """Insert (username, name, email, password) rows, keeping existing users"""
+        with self._transaction() as c:
+            c.executemany(SQL_ADD_USER_IF_MISSING, rows)
+            return c.rowcount
+
+    # --- Categories ---
+
+    def categories(self):
+        return list(self._cached(("categories", None, None, None), SQL_CATEGORIES, ()))
+
+    def category_id(self, name):
+        with self._reader() as conn:
+            row = conn.execute(SQL_CATEGORY_ID, (name,)).fetchone()
+        return row[0] if row else None
+
+    def add_category(self, name):
+        with self._transaction() as c:
+            c.execute(SQL_ADD_CATEGORY, (name,))
+            category_id = c.lastrowid
+        self.cache.invalidate_kind("categories")
+        return category_id
+
+    # --- Expenses ---
+
+    def add(self, username, item, price, date, category_id):
+        with self._transaction() as c:
+            c.execute(SQL_ADD_EXPENSE, (username, item, price, date, category_id))
+            expense_id = c.lastrowid
+        self._invalidate({(username, date)})
+        return expense_id
+
+    def add_many(self, rows):
+        """Insert (username, item, price, date, category_id) rows in one transaction"""
+        rows = list(rows)
+        with self._transaction() as c:
+            c.executemany(SQL_ADD_EXPENSE, rows)
+            count = c.rowcount
+        self._invalidate({(row[0], row[3]) for row in rows})
+        return count
+
+    def delete(self, expense_id):
+        with self._transaction() as c:
+            touched = self._touched(c, SQL_DELETE_EXPENSE, (expense_id,))
+            c.execute(SQL_DELETE_EXPENSE, (expense_id,))
+        self._invalidate(touched)
+
+    def write_batch(self, statements):
+        """Run (sql, params) statements in one transaction; returns each lastrowid"""
+        touched = set()
+        with self._transaction() as c:
+            results = []
+            for sql, params in statements:
+                months = self._touched(c, sql, params)
+                touched = None if touched is None or months is None else touched | months
+                c.execute(sql, params)
+                results.append(c.lastrowid)
+        if any(sql == SQL_ADD_CATEGORY for sql, _ in statements):
+            self.cache.invalidate_kind("categories")
+        self._invalidate(touched)
+        return results
+
+    # --- Result Cache ---
+
+    def _cached(self, key, sql, params, row_type=None):
+        """Rows of a read through the result cache; the cached copy is a tuple"""
+        def load():
+            with self._reader() as conn:
+                rows = conn.execute(sql, params).fetchall()
+            return tuple(rows) if row_type is None else tuple(row_type(*row) for row in rows)
+        return self.cache.get_or_load(key, load)
+
+    @staticmethod
+    def _touched(c, sql, params):
+        """(username, date) pairs a write changes, or None if it can't tell"""
+        if sql == SQL_ADD_EXPENSE:
+            return {(params[0], params[3])}
+        if sql == SQL_DELETE_EXPENSE:
+            return set(c.execute(SQL_EXPENSE_MONTH, params).fetchall())
+        if sql in (SQL_EXPAND_CATEGORY, SQL_COLLAPSE_CATEGORY, SQL_ADD_USER, SQL_ADD_CATEGORY):
+            # No cached month reads these; write_batch drops the categories entry itself
+            return set()
+        return None
+
+    def _invalidate(self, touched):
+        if touched is None:
+            self.cache.clear()
+            return
+        for username, date in touched:
+            try:
+                self.cache.invalidate_month(username, int(date[:4]), int(date[5:7]))
+            except (TypeError, ValueError):
+                self.cache.invalidate_user(username)
+
+    def list_month(self, username, year, month):
+        return list(self._cached(("list_month", username, year, month), SQL_LIST_MONTH,
+                                 (username, *month_bounds(year, month)), Expense))
+
+    def list_month_by_date(self, username, year, month):
+        """The month as one flat list in date order, including rows without a category"""
+        return list(self._cached(("list_month_by_date", username, year, month), SQL_LIST_MONTH_BY_DATE,
+                                 (username, *month_bounds(year, month)), Expense))
+
+    def list_year(self, username, year):
+        """Every expense of the year in one indexed range scan, ordered like list_month"""
+        return list(self._cached(("list_year", username, year, None), SQL_LIST_MONTH,
+                                 (username, *year_bounds(year)), Expense))
+
+    def list_month_category(self, username, year, month, category):
+        """One category's expenses for a month, in date order"""
+        return list(self._cached((("list_month_category", category), username, year, month),
+                                 SQL_LIST_MONTH_CATEGORY, (username, *month_bounds(year, month), category),
+                                 Expense))
+
+    def stream_month_category(self, username, year, month, category, cancel=None,
+                              first_chunk=FIRST_CHUNK_SIZE, chunk_size=STREAM_CHUNK_SIZE):
+        """Yield one category's expenses for a month as lists of Expense, in date order.
+
+        Stops quietly once cancel (a CancelToken) is cancelled, whether
+        between chunks or by interrupting the running query.
+        """
+        cancel = cancel or CancelToken()
+        with self._reader() as conn:
+            cancel.attach(conn)
+            cursor = None
+            try:
+                if cancel.cancelled:
+                    return
+                cursor = conn.execute(SQL_LIST_MONTH_CATEGORY, (username, *month_bounds(year, month), category))
+                size = first_chunk
+                while not cancel.cancelled:
+                    rows = cursor.fetchmany(size)
+                    if not rows:
+                        return
+                    yield [Expense(*row) for row in rows]
+                    size = chunk_size
+            except sqlite3.OperationalError:
+                if not cancel.cancelled:
+                    raise
+            finally:
+                cancel.detach()
+                if cursor is not None:
+                    cursor.close()
+
+    def iter_range(self, username, start=None, end=None, chunk_size=5000):
+        """Stream (id, date, item, price, category_id, category) rows in date order.
+
+        With no start and end every row is included, undated ones first.
+        Rows come from cursor.fetchmany, so only one chunk is in memory at a
+        time. The reader connection stays checked out until the generator is
+        exhausted or closed.
+        """
+        if start is None and end is None:
+            sql, params = SQL_EXPORT_ALL, (username,)
+        else:
+            sql, params = SQL_EXPORT_RANGE, (username, start, end)
+        with self._reader() as conn:
+            cursor = conn.execute(sql, params)
+            try:
+                while True:
+                    rows = cursor.fetchmany(chunk_size)
+                    if not rows:
+                        return
+                    yield from rows
+            finally:
+                cursor.close()
+
+    def month_summary(self, username, year, month):
+        """Per-category expense count and total from monthly_summary, in category id order"""
+        return list(self._cached(("month_summary", username, year, month), SQL_MONTH_SUMMARY,
+                                 (username, year, month), CategorySummary))
+
+    def month_totals(self, username, year):
+        """Return {month number: total} for every month of the year with expenses"""
+        return dict(self._cached(("month_totals", username, year, None), SQL_YEAR_TOTALS, (username, year)))
+
+    def rebuild_summary(self):
+        with self._transaction() as c:
+            rebuild_monthly_summary(c.connection)
+        self.cache.clear()
+
+    # --- UI State ---
+
+    def expanded_categories(self, username):
+        """Names of the category sections the user keeps expanded"""
+        with self._reader() as conn:
+            return [name for (name,) in conn.execute(SQL_EXPANDED_CATEGORIES, (username,))]
+
+
+_repository = None
+_repository_lock = threading.Lock()
+
+
+def get_repository():
+    """Return the process-wide repository, creating it on first use"""
+    global _repository
+    with _repository_lock:
+        if _repository is None:
+            _repository = ExpenseRepository(DB_PATH)
+        return _repository
+
+
+# === Command Line ===
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Expense tracker database maintenance")
+    parser.add_argument("command", choices=["rebuild-summary"])
+    parser.add_argument("--db", default=DB_PATH)
+    args = parser.parse_args()
+
+    if args.command == "rebuild-summary":
+        setup_database(args.db)
+        repo = ExpenseRepository(args.db)
+        repo.rebuild_summary()
+        repo.close()
+        print(f"Rebuilt monthly_summary in {args.db}")
@@ -0,0 +1,88 @@
+import queue
+import threading
+import time
+
+# === Group Commit Writer ===
+# A single thread that owns every expense mutation. Writes are queued,
+# gathered into batches and committed together, so a burst of inserts
+# pays for one commit (and one fsync) instead of one each. A batch closes
+# when it reaches max_batch statements or when its first statement has
+# waited max_latency seconds, whichever comes first.
+#
+# Every submission gets a callback(ok, result) on the writer thread once
+# its batch is durable: ok is True with the statement's lastrowid, or
+# False with the exception.
+
+MAX_BATCH_SIZE = 256
+MAX_BATCH_LATENCY = 0.005
+
+_STOP = object()
+
+
+class GroupCommitWriter(threading.Thread):
+    def __init__(self, repo, max_batch=MAX_BATCH_SIZE, max_latency=MAX_BATCH_LATENCY):
+        super().__init__(name="expense-writer", daemon=True)
+        self.repo = repo
+        self.max_batch = max_batch
+        self.max_latency = max_latency
+        self.pending = queue.Queue()
+        self.batches = 0
+        self.writes = 0
+
+    def submit(self, sql, params, callback=None):
+        """Queue one statement; callback(ok, result) runs after its batch commits"""
+        self.pending.put((sql, params, callback))
+
+    def close(self):
+        """Commit everything already queued, then stop the thread"""
+        self.pending.put(_STOP)
+        self.join()
+
+    def run(self):
+        stopping = False
+        while not stopping:
+            first = self.pending.get()
+            if first is _STOP:
+                return
+            batch = [first]
+            stopping = self._fill(batch)
+            self._commit(batch)
+
+    def _fill(self, batch):
+        """Add queued statements to batch until it is full or due; True on stop"""
+        deadline = time.monotonic() + self.max_latency
+        while len(batch) < self.max_batch:
+            try:
+                mutation = self.pending.get(timeout=max(deadline - time.monotonic(), 0))
+            except queue.Empty:
+                return False
+            if mutation is _STOP:
+                return True
+            batch.append(mutation)
+        return False
+
+    def _commit(self, batch):
+        try:
+            results = self.repo.write_batch([(sql, params) for sql, params, _ in batch])
+        except Exception as e:
+            if len(batch) == 1:
+                self._notify(batch[0][2], False, e)
+                return
+            # The batch was rolled back; retry each statement on its own so
+            # one bad write doesn't fail its neighbours
+            for mutation in batch:
+                self._commit([mutation])
+            return
+
+        self.batches += 1
+        self.writes += len(batch)
+        for (_, _, callback), result in zip(batch, results):
+            self._notify(callback, True, result)
+
+    def _notify(self, callback, ok, result):
+        if callback is None:
+            return
+        try:
+            callback(ok, result)
+        except Exception as e:
+            print(f"Write callback failed: {e}")
@@ -0,0 +1,289 @@
+import sqlite3
+import time
+from collections import namedtuple
+
+# === Schema Migrations ===
+# Ordered steps keyed on PRAGMA user_version. Each step is a single
+# set-based SQL statement; a step may instead be a function that looks
+# at the current schema and returns the statement to run, or None when
+# there is nothing to do, so every step is safe to re-run.
+#
+# Version 0 covers every database written by the older setup_database
+# variants (FINAL.py, ExpenseTracker_sqlite.py, mainn1.py, sqlite.py),
+# including the month/day layout and the keyless tables produced by
+# their CREATE TABLE AS rebuilds.
+
+Step = namedtuple("Step", ["version", "description", "sql"])
+StepTiming = namedtuple("StepTiming", ["version", "description", "seconds", "skipped"])
+
+EXPENSE_COLUMNS = ["id", "username", "item", "price", "date", "category_id"]
+
+EXPENSES_TABLE = '''CREATE TABLE {name} (
+                        id INTEGER PRIMARY KEY AUTOINCREMENT,
+                        username TEXT,
+                        item TEXT,
+                        price REAL,
+                        date TEXT,
+                        category_id INTEGER,
+                        FOREIGN KEY (username) REFERENCES users(username),
+                        FOREIGN KEY (category_id) REFERENCES categories(id))'''
+
+# === Monthly Summary ===
+# Per (username, year, month, category) count and sum, kept current by
+# triggers on expenses so totals never have to walk expense rows.
+
+SUMMARY_SCHEMA = [
+    """CREATE TABLE IF NOT EXISTS monthly_summary (
+           username TEXT NOT NULL,
+           year INTEGER NOT NULL,
+           month INTEGER NOT NULL,
+           category_id INTEGER NOT NULL,
+           count INTEGER NOT NULL,
+           total REAL NOT NULL,
+           PRIMARY KEY (username, year, month, category_id)) WITHOUT ROWID""",
+
+    """CREATE TRIGGER IF NOT EXISTS expenses_summary_insert AFTER INSERT ON expenses
+       BEGIN
+           INSERT INTO monthly_summary (username, year, month, category_id, count, total)
+           VALUES (IFNULL(NEW.username, ''),
+                   IFNULL(CAST(substr(NEW.date, 1, 4) AS INTEGER), 0),
+                   IFNULL(CAST(substr(NEW.date, 6, 2) AS INTEGER), 0),
+                   IFNULL(NEW.category_id, 0), 1, IFNULL(NEW.price, 0))
+           ON CONFLICT (username, year, month, category_id)
+           DO UPDATE SET count = count + 1, total = total + excluded.total;
+       END""",
+
+    """CREATE TRIGGER IF NOT EXISTS expenses_summary_delete AFTER DELETE ON expenses
+       BEGIN
+           UPDATE monthly_summary
+           SET count = count - 1, total = total - IFNULL(OLD.price, 0)
+           WHERE username = IFNULL(OLD.username, '')
+           AND year = IFNULL(CAST(substr(OLD.date, 1, 4) AS INTEGER), 0)
+           AND month = IFNULL(CAST(substr(OLD.date, 6, 2) AS INTEGER), 0)
+           AND category_id = IFNULL(OLD.category_id, 0);
+           DELETE FROM monthly_summary
+           WHERE username = IFNULL(OLD.username, '')
+           AND year = IFNULL(CAST(substr(OLD.date, 1, 4) AS INTEGER), 0)
+           AND month = IFNULL(CAST(substr(OLD.date, 6, 2) AS INTEGER), 0)
+           AND category_id = IFNULL(OLD.category_id, 0)
+           AND count <= 0;
+       END""",
+
+    """CREATE TRIGGER IF NOT EXISTS expenses_summary_update
+       AFTER UPDATE OF username, date, price, category_id ON expenses
+       BEGIN
+           UPDATE monthly_summary
+           SET count = count - 1, total = total - IFNULL(OLD.price, 0)
+           WHERE username = IFNULL(OLD.username, '')
+           AND year = IFNULL(CAST(substr(OLD.date, 1, 4) AS INTEGER), 0)
+           AND month = IFNULL(CAST(substr(OLD.date, 6, 2) AS INTEGER), 0)
+           AND category_id = IFNULL(OLD.category_id, 0);
+           DELETE FROM monthly_summary
+           WHERE username = IFNULL(OLD.username, '')
+           AND year = IFNULL(CAST(substr(OLD.date, 1, 4) AS INTEGER), 0)
+           AND month = IFNULL(CAST(substr(OLD.date, 6, 2) AS INTEGER), 0)
+           AND category_id = IFNULL(OLD.category_id, 0)
+           AND count <= 0;
+           INSERT INTO monthly_summary (username, year, month, category_id, count, total)
+           VALUES (IFNULL(NEW.username, ''),
+                   IFNULL(CAST(substr(NEW.date, 1, 4) AS INTEGER), 0),
+                   IFNULL(CAST(substr(NEW.date, 6, 2) AS INTEGER), 0),
+                   IFNULL(NEW.category_id, 0), 1, IFNULL(NEW.price, 0))
+           ON CONFLICT (username, year, month, category_id)
+           DO UPDATE SET count = count + 1, total = total + excluded.total;
+       END""",
+]
+
+SQL_REBUILD_SUMMARY = """
+    INSERT INTO monthly_summary (username, year, month, category_id, count, total)
+    SELECT IFNULL(username, ''),
+           IFNULL(CAST(substr(date, 1, 4) AS INTEGER), 0),
+           IFNULL(CAST(substr(date, 6, 2) AS INTEGER), 0),
+           IFNULL(category_id, 0),
+           COUNT(*),
+           IFNULL(SUM(price), 0)
+    FROM expenses
+    GROUP BY 1, 2, 3, 4
+"""
+
+# Month names as stored by the oldest schema, mapped to a month number
+# without a Python loop: three-letter prefixes are three characters apart.
+MONTH_PREFIXES = "JanFebMarAprMayJunJulAugSepOctNovDec"
+
+
+def _columns(conn, table):
+    return {row[1]: row for row in conn.execute(f"PRAGMA table_info({table})")}
+
+
+def _table_exists(conn, name):
+    return conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?",
+                        (name,)).fetchone() is not None
+
+
+def _expenses_need_rebuild(conn):
+    columns = _columns(conn, "expenses")
+    if list(columns) != EXPENSE_COLUMNS:
+        return True
+    # CREATE TABLE AS copies drop the primary key
+    return columns["id"][5] != 1
+
+
+def _create_rebuild_table(conn):
+    if not _expenses_need_rebuild(conn):
+        return None
+    return EXPENSES_TABLE.format(name="expenses_migrated")
+
+
+def _copy_into_rebuild_table(conn):
+    if not _table_exists(conn, "expenses_migrated"):
+        return None
+    columns = _columns(conn, "expenses")
+
+    legacy_date = None
+    if "month" in columns and "day" in columns:
+        # A month name that isn't one of the twelve leaves the date NULL
+        # rather than producing a month 00 no range query can reach
+        month_at = f"instr('{MONTH_PREFIXES.upper()}', upper(substr(month, 1, 3)))"
+        legacy_date = (f"CASE WHEN {month_at} > 0 THEN printf('%04d-%02d-%02d', strftime('%Y', 'now'), "
+                       f"({month_at} + 2) / 3, day) END")
+    if "date" in columns and legacy_date:
+        date_expr = f"COALESCE(date, {legacy_date})"
+    elif "date" in columns:
+        date_expr = "date"
+    else:
+        date_expr = legacy_date or "NULL"
+
+    # Legacy rows without a category fall under Food, like the old ALTER default
+    category_expr = "IFNULL(category_id, 1)" if "category_id" in columns else "1"
+    id_expr = "id" if "id" in columns else "NULL"
+
+    return f"""INSERT INTO expenses_migrated (id, username, item, price, date, category_id)
+               SELECT {id_expr}, username, item, price, {date_expr}, {category_expr}
+               FROM expenses"""
+
+
+def _drop_old_expenses(conn):
+    if not _table_exists(conn, "expenses_migrated"):
+        return None
+    return "DROP TABLE expenses"
+
+
+def _rename_rebuild_table(conn):
+    if not _table_exists(conn, "expenses_migrated"):
+        return None
+    return "ALTER TABLE expenses_migrated RENAME TO expenses"
+
+
+MIGRATIONS = [
+    Step(1, "create users", """CREATE TABLE IF NOT EXISTS users (
+                                   username TEXT PRIMARY KEY,
+                                   name TEXT,
+                                   email TEXT,
+                                   password TEXT)"""),
+    Step(2, "create categories", """CREATE TABLE IF NOT EXISTS categories (
+                                        id INTEGER PRIMARY KEY,
+                                        name TEXT UNIQUE)"""),
+    # OR REPLACE also moves a default category stored under another id
+    Step(3, "seed default categories", """INSERT OR REPLACE INTO categories (id, name)
+                                           VALUES (1, 'Food'), (2, 'Utilities'),
+                                                  (3, 'Necessities'), (4, 'Transportation')"""),
+    Step(4, "create expenses", EXPENSES_TABLE.format(name="IF NOT EXISTS expenses")),
+    Step(5, "create rebuilt expenses table", _create_rebuild_table),
+    Step(6, "copy and convert legacy expenses", _copy_into_rebuild_table),
+    Step(7, "drop legacy expenses table", _drop_old_expenses),
+    Step(8, "rename rebuilt expenses table", _rename_rebuild_table),
+    Step(9, "create expenses month index", """CREATE INDEX IF NOT EXISTS idx_expenses_user_date
+                                               ON expenses (username, date, category_id, price)"""),
+    Step(10, "create monthly_summary", SUMMARY_SCHEMA[0]),
+    Step(11, "create summary insert trigger", SUMMARY_SCHEMA[1]),
+    Step(12, "create summary delete trigger", SUMMARY_SCHEMA[2]),
+    Step(13, "create summary update trigger", SUMMARY_SCHEMA[3]),
+    Step(14, "clear monthly_summary", "DELETE FROM monthly_summary"),
+    Step(15, "backfill monthly_summary", SQL_REBUILD_SUMMARY),
+    Step(16, "create expanded_categories", """CREATE TABLE IF NOT EXISTS expanded_categories (
+                                                  username TEXT NOT NULL,
+                                                  category_id INTEGER NOT NULL,
+                                                  PRIMARY KEY (username, category_id)) WITHOUT ROWID"""),
+    # v12/v13 triggers cleared empty summary rows with an unkeyed DELETE,
+    # a full monthly_summary scan per deleted or updated expense
+    Step(17, "drop unkeyed summary delete trigger", "DROP TRIGGER IF EXISTS expenses_summary_delete"),
+    Step(18, "create keyed summary delete trigger", SUMMARY_SCHEMA[2]),
+    Step(19, "drop unkeyed summary update trigger", "DROP TRIGGER IF EXISTS expenses_summary_update"),
+    Step(20, "create keyed summary update trigger", SUMMARY_SCHEMA[3]),
+    # Legacy rows with an unknown month name were once converted to YYYY-00-DD
+    Step(21, "clear month 00 legacy dates", "UPDATE expenses SET date = NULL WHERE substr(date, 5, 4) = '-00-'"),
+]
+
+SCHEMA_VERSION = MIGRATIONS[-1].version
+
+
+def schema_version(conn):
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+def migrate(conn, steps=None):
+    """Bring the database up to SCHEMA_VERSION in a single transaction.
+
+    Returns a StepTiming for every step that was considered, so callers
+    can report where upgrade time went. An up-to-date database returns
+    an empty list after one read of user_version.
+    """
+    current = schema_version(conn)
+    if current >= SCHEMA_VERSION:
+        return []
+
+    pending = [step for step in (steps or MIGRATIONS) if step.version > current]
+    timings = []
+
+    previous_isolation = conn.isolation_level
+    conn.isolation_level = None  # manage the transaction ourselves
+    try:
+        conn.execute("BEGIN IMMEDIATE")
+        for step in pending:
+            start = time.perf_counter()
+            sql = step.sql(conn) if callable(step.sql) else step.sql
+            if sql is not None:
+                conn.execute(sql)
+            timings.append(StepTiming(step.version, step.description,
+                                      time.perf_counter() - start, sql is None))
+        conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        conn.execute("COMMIT")
+    except BaseException:
+        # Any failure, including a Python error in a step or Ctrl+C, undoes
+        # the whole upgrade; BEGIN itself may have been what failed
+        if conn.in_transaction:
+            conn.execute("ROLLBACK")
+        raise
+    finally:
+        conn.isolation_level = previous_isolation
+
+    return timings
+
+
+def print_timings(timings):
+    for timing in timings:
+        status = "skipped" if timing.skipped else f"{timing.seconds * 1000:.1f} ms"
+        print(f"  v{timing.version:<3} {timing.description:<36} {status}")
+    if timings:
+        total = sum(timing.seconds for timing in timings)
+        print(f"  Migrated to schema v{SCHEMA_VERSION} in {total * 1000:.1f} ms")
+
+
+# === Command Line ===
+
+if __name__ == "__main__":
+    import argparse
+    from expense_repository import DB_PATH
+
+    parser = argparse.ArgumentParser(description="Upgrade an expense tracker database")
+    parser.add_argument("--db", default=DB_PATH)
+    args = parser.parse_args()
+
+    conn = sqlite3.connect(args.db)
+    print(f"{args.db}: schema v{schema_version(conn)}")
+    timings = migrate(conn)
+    if timings:
+        print_timings(timings)
+    else:
+        print("  Already up to date")
+    conn.close()
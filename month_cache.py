@@ -0,0 +1,93 @@
+import threading
+
+from expense_block import ExpenseBlock
+from expense_repository import get_repository, year_bounds
+from month_view import EMPTY_MONTH, build_month_view
+
+# === Month Cache ===
+# A whole year of one user's expenses, fetched with a single range query
+# right after login and kept as a compact ExpenseBlock, so clicking
+# through the month cards afterwards never touches SQLite. A month's
+# view model is built from the block the first time it is asked for.
+#
+# Writes call invalidate() for the month they touched. Every entry is
+# stamped with the generation it was fetched under, and a fetch that
+# started before an invalidation is dropped instead of cached, so a
+# prefetch racing an insert can't put stale rows back.
+
+
+def fetch_year(username, year):
+    # Runs on a query worker thread
+    rows = get_repository().iter_range(username, *year_bounds(year))
+    try:
+        return ExpenseBlock.from_rows(rows)
+    finally:
+        rows.close()
+
+
+class MonthCache:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._months = {}
+        self._blocks = {}
+        self._month_totals = {}
+        # Months written to since their year's block was fetched
+        self._stale = set()
+        self._years = set()
+        self.generation = 0
+
+    def get(self, username, year, month):
+        """Cached MonthViewModel, one built from a prefetched year, or None"""
+        key = (username, year, month)
+        with self._lock:
+            data = self._months.get(key)
+            if data is not None:
+                return data
+            block = self._blocks.get((username, year))
+            if block is None or key in self._stale:
+                return None
+            rows = block.month(year, month)
+            data = build_month_view(rows.expenses(by_category=True)) if len(rows) else EMPTY_MONTH
+            self._months[key] = data
+            return data
+
+    def put_year(self, username, year, block, generation):
+        with self._lock:
+            if generation != self.generation:
+                return False
+            for month in range(1, 13):
+                self._months.pop((username, year, month), None)
+                self._stale.discard((username, year, month))
+            self._blocks[(username, year)] = block
+            self._month_totals[(username, year)] = block.month_totals()
+            self._years.add((username, year))
+            return True
+
+    def put_month(self, username, year, month, data, generation):
+        with self._lock:
+            if generation != self.generation:
+                return False
+            self._months[(username, year, month)] = data
+            self._stale.discard((username, year, month))
+            return True
+
+    def year_totals(self, username, year):
+        """{month: total} from the cache, or None if the year isn't fully cached"""
+        with self._lock:
+            if (username, year) not in self._years:
+                return None
+            return dict(self._month_totals[(username, year)])
+
+    def invalidate(self, username, year, month):
+        with self._lock:
+            self.generation += 1
+            self._months.pop((username, year, month), None)
+            self._stale.add((username, year, month))
+            self._years.discard((username, year))
+
+
+_cache = MonthCache()
+
+
+def get_month_cache():
+    return _cache
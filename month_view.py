@@ -0,0 +1,94 @@
+from collections import namedtuple
+from datetime import datetime
+from functools import lru_cache
+
+from expense_repository import Expense, get_repository
+
+# === Month View Model ===
+# What a month page shows, as plain Python data: category groups in
+# list_month order, each with its expense count, total and rows, plus the
+# month total. A group's rows may be None when only its summary has been
+# loaded; the month page fetches them when the section is expanded.
+# Dates and amounts are formatted once here through cached formatters
+# instead of per paint or per widget.
+#
+# Nothing in this module imports Qt or Tk. The Qt month page and the Tk
+# tracker build from it, and it can be benchmarked on its own.
+
+MONTHS = ["January", "February", "March", "April", "May", "June",
+          "July", "August", "September", "October", "November", "December"]
+MONTH_NUMBERS = {name: i + 1 for i, name in enumerate(MONTHS)}
+
+ExpenseRow = namedtuple("ExpenseRow", Expense._fields + ("date_text", "price_text"))
+CategoryGroup = namedtuple("CategoryGroup", ["category", "count", "total", "total_text", "rows"])
+MonthViewModel = namedtuple("MonthViewModel", ["groups", "total", "total_text", "count"])
+
+
+@lru_cache(maxsize=512)
+def format_date(date_str):
+    try:
+        return datetime.strptime(date_str, "%Y-%m-%d").strftime("%b %d, %Y")
+    except (TypeError, ValueError):
+        return date_str or ""
+
+
+@lru_cache(maxsize=4096)
+def format_amount(amount):
+    return f"₱{amount:,.2f}"
+
+
+def view_row(expense):
+    """ExpenseRow for an Expense, with its date and price pre-formatted"""
+    return ExpenseRow(*expense, format_date(expense.date), format_amount(expense.price or 0))
+
+
+def build_month_view(expenses):
+    """Group Expense rows by category in first-seen order and total them.
+
+    Rows from list_month come ordered by category id then date, so the
+    groups come out in that order too.
+    """
+    by_category = {}
+    for expense in expenses:
+        by_category.setdefault(expense.category, []).append(view_row(expense))
+
+    groups = []
+    month_total = 0
+    for category, rows in by_category.items():
+        total = sum(row.price or 0 for row in rows)
+        month_total += total
+        groups.append(CategoryGroup(category, len(rows), total, format_amount(total), rows))
+    count = sum(group.count for group in groups)
+    return MonthViewModel(groups, month_total, format_amount(month_total), count)
+
+
+def build_month_summary(summaries, rows_by_category):
+    """MonthViewModel from month_summary rows; only categories in rows_by_category get rows"""
+    groups = []
+    for category, count, total in summaries:
+        rows = rows_by_category.get(category)
+        if rows is not None:
+            rows = [view_row(expense) for expense in rows]
+        groups.append(CategoryGroup(category, count, total, format_amount(total), rows))
+    month_total = sum(group.total for group in groups)
+    count = sum(group.count for group in groups)
+    return MonthViewModel(groups, month_total, format_amount(month_total), count)
+
+
+def stream_category_rows(username, year, month, categories, cancel=None):
+    """Yield (category, [ExpenseRow]) chunks, then (category, None) once a category is complete"""
+    repo = get_repository()
+    for category in categories:
+        for chunk in repo.stream_month_category(username, year, month, category, cancel):
+            yield category, [view_row(expense) for expense in chunk]
+        if cancel is not None and cancel.cancelled:
+            return
+        yield category, None
+
+
+def load_month_summary(username, year, month):
+    """Category counts and totals from monthly_summary, without any rows"""
+    return build_month_summary(get_repository().month_summary(username, year, month), {})
+
+
+EMPTY_MONTH = build_month_view([])
@@ -0,0 +1,98 @@
+import threading
+from collections import OrderedDict
+
+# === Query Result Cache ===
+# Results of repository reads, keyed by (query kind, username, year,
+# month), so re-opening a month, re-drawing totals or building the
+# category combo doesn't go back to SQLite for data that hasn't changed.
+# Year-level queries use None for the month and global ones (categories)
+# None for the rest.
+#
+# The cache is bounded by the number of result rows it holds and evicts
+# the least recently used entries first. The repository's write paths
+# invalidate exactly the months they touched. Every invalidation bumps
+# a generation, and a read that started before it is not stored, so a
+# query racing a write can't cache rows the write has replaced.
+
+MAX_CACHED_ROWS = 100000
+
+
+class QueryCache:
+    def __init__(self, max_rows=MAX_CACHED_ROWS):
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self._rows = 0
+        self.max_rows = max_rows
+        self.generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def get_or_load(self, key, load):
+        """Cached result for key, or load() it and cache it"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+            self.misses += 1
+            generation = self.generation
+        result = load()
+        self._put(key, result, generation)
+        return result
+
+    def _put(self, key, result, generation):
+        cost = max(1, len(result)) if hasattr(result, "__len__") else 1
+        with self._lock:
+            if generation != self.generation or cost > self.max_rows:
+                return
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._rows -= old[1]
+            self._entries[key] = (result, cost)
+            self._rows += cost
+            while self._rows > self.max_rows:
+                _, (_, evicted_cost) = self._entries.popitem(last=False)
+                self._rows -= evicted_cost
+                self.evictions += 1
+
+    def _drop(self, match):
+        with self._lock:
+            self.generation += 1
+            for key in [key for key in self._entries if match(key)]:
+                self._rows -= self._entries.pop(key)[1]
+                self.invalidations += 1
+
+    def invalidate_month(self, username, year, month):
+        """Drop a month's entries and the year-level entries that include it"""
+        self._drop(lambda key: key[1] == username and key[2] == year and key[3] in (month, None))
+
+    def invalidate_user(self, username):
+        self._drop(lambda key: key[1] == username)
+
+    def invalidate_kind(self, kind):
+        self._drop(lambda key: key[0] == kind)
+
+    def clear(self):
+        self._drop(lambda key: True)
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+                "entries": len(self._entries),
+                "rows": self._rows,
+            }
+
+
+def print_stats(stats):
+    print(f"  Query cache: {stats['hits']} hits, {stats['misses']} misses "
+          f"({stats['hit_rate']:.0%}), {stats['evictions']} evicted, "
+          f"{stats['invalidations']} invalidated, {stats['entries']} entries / {stats['rows']} rows")
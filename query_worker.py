@@ -0,0 +1,163 @@
+import itertools
+
+from PyQt5.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+
+from expense_repository import CancelToken
+
+# === Background Query Executor ===
+# Runs repository reads on a QThreadPool and hands the results back to
+# the GUI thread through queued signals, so a slow or locked database
+# never freezes the event loop.
+#
+# Every submission can carry a key. Only the newest ticket per key is
+# delivered; anything older is dropped when it finishes, which is how a
+# month view ignores results for a month the user has already left.
+#
+# stream() runs a generator instead and delivers each item it yields as
+# soon as it is ready, one event-loop turn per item. Cancelling or
+# superseding a stream also cancels its CancelToken, which interrupts
+# the SQLite query behind it.
+
+MAX_QUERY_THREADS = 2
+
+
+class QuerySignals(QObject):
+    finished = pyqtSignal(int, object)
+    failed = pyqtSignal(int, object)
+    chunk = pyqtSignal(int, object)
+
+
+class QueryTask(QRunnable):
+    def __init__(self, ticket, fn, args, kwargs, signals):
+        super().__init__()
+        self.ticket = ticket
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.signals = signals
+
+    def run(self):
+        try:
+            result = self.fn(*self.args, **self.kwargs)
+        except Exception as e:
+            self.signals.failed.emit(self.ticket, e)
+        else:
+            self.signals.finished.emit(self.ticket, result)
+
+
+class StreamTask(QRunnable):
+    def __init__(self, ticket, fn, args, kwargs, signals, cancel):
+        super().__init__()
+        self.ticket = ticket
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.signals = signals
+        self.cancel = cancel
+
+    def run(self):
+        try:
+            chunks = self.fn(*self.args, cancel=self.cancel, **self.kwargs)
+            try:
+                for chunk in chunks:
+                    if self.cancel.cancelled:
+                        break
+                    self.signals.chunk.emit(self.ticket, chunk)
+            finally:
+                chunks.close()
+        except Exception as e:
+            self.signals.failed.emit(self.ticket, e)
+        else:
+            self.signals.finished.emit(self.ticket, None)
+
+
+class QueryExecutor(QObject):
+    def __init__(self, max_threads=MAX_QUERY_THREADS):
+        super().__init__()
+        self.pool = QThreadPool()
+        self.pool.setMaxThreadCount(max_threads)
+        self.signals = QuerySignals()
+        self.signals.finished.connect(self._on_finished)
+        self.signals.failed.connect(self._on_failed)
+        self.signals.chunk.connect(self._on_chunk)
+        self._tickets = itertools.count(1)
+        self._callbacks = {}
+        self._latest = {}
+        self._streams = {}
+
+    def _register(self, key, on_result, on_error):
+        ticket = next(self._tickets)
+        self._callbacks[ticket] = (key, on_result, on_error)
+        if key is not None:
+            self.cancel(key)
+            self._latest[key] = ticket
+        return ticket
+
+    def submit(self, fn, *args, key=None, on_result=None, on_error=None, **kwargs):
+        """Run fn(*args, **kwargs) in the pool; callbacks fire on the GUI thread"""
+        ticket = self._register(key, on_result, on_error)
+        self.pool.start(QueryTask(ticket, fn, args, kwargs, self.signals))
+        return ticket
+
+    def stream(self, fn, *args, key=None, on_chunk=None, on_result=None, on_error=None, **kwargs):
+        """Run the generator fn(*args, cancel=CancelToken, **kwargs) in the pool.
+
+        on_chunk gets each yielded item on the GUI thread, then on_result(None)
+        once the generator is exhausted.
+        """
+        ticket = self._register(key, on_result, on_error)
+        cancel = CancelToken()
+        self._streams[ticket] = (cancel, on_chunk)
+        self.pool.start(StreamTask(ticket, fn, args, kwargs, self.signals, cancel))
+        return ticket
+
+    def cancel(self, key):
+        """Forget the pending ticket for key so its result is discarded; a stream is also stopped"""
+        ticket = self._latest.pop(key, None)
+        stream = self._streams.get(ticket)
+        if stream is not None:
+            stream[0].cancel()
+
+    def is_current(self, ticket, key):
+        return key is None or self._latest.get(key) == ticket
+
+    def _take(self, ticket):
+        """Pop a ticket's callbacks, or None if a newer ticket superseded it"""
+        key, on_result, on_error = self._callbacks.pop(ticket)
+        self._streams.pop(ticket, None)
+        if not self.is_current(ticket, key):
+            return None
+        if key is not None:
+            del self._latest[key]
+        return on_result, on_error
+
+    def _on_finished(self, ticket, result):
+        callbacks = self._take(ticket)
+        if callbacks and callbacks[0]:
+            callbacks[0](result)
+
+    def _on_chunk(self, ticket, chunk):
+        key, _, _ = self._callbacks.get(ticket, (None, None, None))
+        stream = self._streams.get(ticket)
+        if stream is not None and stream[1] and self.is_current(ticket, key):
+            stream[1](chunk)
+
+    def _on_failed(self, ticket, error):
+        callbacks = self._take(ticket)
+        if callbacks is None:
+            return
+        if callbacks[1]:
+            callbacks[1](error)
+        else:
+            print(f"Background query failed: {error}")
+
+
+_executor = None
+
+
+def get_query_executor():
+    """Return the shared executor; must first be called on the GUI thread"""
+    global _executor
+    if _executor is None:
+        _executor = QueryExecutor()
+    return _executor
@@ -45,8 +45,8 @@ class RegisterPage(QWidget):
         form_layout.addLayout(self.password_field)
         form_layout.addSpacing(10)
 
-        register_btn = QPushButton("Register")
-        register_btn.setStyleSheet("""
+        self.register_btn = QPushButton("Register")
+        self.register_btn.setStyleSheet("""
             QPushButton {
                 background-color: #3498db; 
                 color: white; 
@@ -58,9 +58,9 @@ class RegisterPage(QWidget):
                 background-color: #2980b9;
             }
         """)
-        register_btn.setCursor(Qt.PointingHandCursor)
-        register_btn.clicked.connect(self.register)
-        form_layout.addWidget(register_btn)
+        self.register_btn.setCursor(Qt.PointingHandCursor)
+        self.register_btn.clicked.connect(self.register)
+        form_layout.addWidget(self.register_btn)
 
         login_container = QHBoxLayout()
         login_text = QLabel("Already have an account?")
@@ -108,18 +108,21 @@ class RegisterPage(QWidget):
             QMessageBox.warning(self, "Missing Fields", "Username and password are required.")
             return
 
-        conn = sqlite3.connect(DB_PATH)
-        c = conn.cursor()
-        c.execute("SELECT * FROM users WHERE username = ?", (username,))
-        if c.fetchone():
+        if get_repository().user_exists(username):
             QMessageBox.warning(self, "Username Exists", "Username already exists.")
-            conn.close()
             return
 
-        c.execute("INSERT INTO users (username, name, email, password) VALUES (?, ?, ?, ?)",
-                  (username, name, email, password))
-        conn.commit()
-        conn.close()
+        # Committed on the writer thread; Register stays off until it is
+        self.register_btn.setEnabled(False)
+        get_expense_writer().add_user(username, name, email, password,
+                                      on_done=lambda _: self.registered(),
+                                      on_error=self.register_failed)
 
+    def registered(self):
+        self.register_btn.setEnabled(True)
         QMessageBox.information(self, "Success", "Registered Successfully!")
         self.switch_to_login.emit()
+
+    def register_failed(self, error):
+        self.register_btn.setEnabled(True)
+        QMessageBox.warning(self, "Database Error", f"Failed to register: {str(error)}")
@@ -0,0 +1,347 @@
+import csv
+import itertools
+import os
+import sqlite3
+import zlib
+from abc import ABC, abstractmethod
+from operator import attrgetter
+
+from csv_store import ENCODING, ExpenseCSVStore
+from expense_repository import DB_PATH, Expense, ExpenseRepository, setup_database
+from month_view import MONTHS
+from user_directory import User, UserDirectory
+
+# === Storage Backends ===
+# One interface over the three ways the frontends keep their data: the
+# CSV files of Main.py, a plain in-memory dict like the month cards
+# tracker (.py), and the SQLite database behind FINAL.py. A frontend
+# written against StorageBackend can be pointed at any of them:
+#
+#   storage = open_backend("sqlite")       # or EXPENSE_STORAGE=sqlite
+#   storage.add("alice", "Rice", 50.0, "2025-03-14", "Food")
+#   storage.list_month("alice", 2025, 3)   # [Expense(...)] in date order
+#
+# Expenses go in and come out as the repository's Expense tuples
+# (id, item, price, date, category), keyed by username and ISO date.
+# bench_storage.py compares the three at different sizes.
+
+DEFAULT_BACKEND = "csv"
+ACTIVE_BACKEND = os.environ.get("EXPENSE_STORAGE", DEFAULT_BACKEND)
+
+USER_CSV = 'users.csv'
+EXPENSE_CSV = 'expenses.csv'
+USER_HEADER = ['username', 'name', 'email', 'password']
+EXPENSE_HEADER = ['username', 'month', 'category', 'item', 'amount']
+DELETED_SUFFIX = '.deleted'
+SQLITE_BATCH_SIZE = 50000
+
+by_date = attrgetter("date")
+
+
+class StorageBackend(ABC):
+    """Users and expenses, as every frontend needs them"""
+
+    name = None
+
+    # --- Users ---
+
+    @abstractmethod
+    def add_user(self, username, name, email, password):
+        """Store a new user; False if the username is taken"""
+
+    @abstractmethod
+    def get_user(self, username):
+        """The User, or None"""
+
+    def authenticate(self, username, password):
+        user = self.get_user(username)
+        if user is not None and user.password == password:
+            return user
+        return None
+
+    # --- Expenses ---
+
+    @abstractmethod
+    def add(self, username, item, price, date, category):
+        """Store an expense dated date (YYYY-MM-DD); returns its id"""
+
+    def add_many(self, rows):
+        """Store (username, item, price, date, category) rows"""
+        for row in rows:
+            self.add(*row)
+
+    @abstractmethod
+    def delete(self, expense_id):
+        """Remove the expense with an id add returned"""
+
+    @abstractmethod
+    def list_month(self, username, year, month):
+        """The user's expenses for a month as Expense tuples, in date order"""
+
+    @abstractmethod
+    def month_totals(self, username, year):
+        """Return {month number: total} for every month of the year with expenses"""
+
+    def close(self):
+        pass
+
+
+def month_of(date):
+    return int(date[:4]), int(date[5:7])
+
+
+# --- CSV ---
+
+def row_checksum(record):
+    # Line endings left out, so a copy saved with other newlines still matches
+    return zlib.crc32(record.rstrip(b'\r\n'))
+
+
+def ensure_csv(path, header):
+    if not os.path.exists(path):
+        with open(path, 'w', newline='', encoding=ENCODING) as f:
+            csv.writer(f).writerow(header)
+
+
+class CSVBackend(StorageBackend):
+    """Main.py's users.csv and expenses.csv, read through their indexes.
+
+    Rows carry the full date as a sixth column after Main.py's five, and
+    an expense's id is its byte offset in expenses.csv. Rows Main.py wrote
+    have no date and are listed under their month in every year. Deleted
+    ids go to expenses.csv.deleted, since the CSV itself is append-only,
+    each with a checksum of its row. When the store rebuilds its index
+    (the CSV shrank or was replaced), ids whose offset no longer holds
+    that row are looked up again by checksum and moved to the row's new
+    offset; only rows no longer in the CSV lose their entry.
+    """
+
+    name = "csv"
+
+    def __init__(self, directory="."):
+        user_path = os.path.join(directory, USER_CSV)
+        expense_path = os.path.join(directory, EXPENSE_CSV)
+        ensure_csv(user_path, USER_HEADER)
+        ensure_csv(expense_path, EXPENSE_HEADER)
+        self.users = UserDirectory(user_path)
+        self.store = ExpenseCSVStore(expense_path)
+        self.deleted_path = expense_path + DELETED_SUFFIX
+        self._deleted = {}
+        if os.path.exists(self.deleted_path):
+            with open(self.deleted_path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    offset, _, checksum = line.partition(' ')
+                    if offset.strip():
+                        self._deleted[int(offset)] = int(checksum) if checksum.strip() else None
+        self._generation = 0
+        self._check_deleted()
+
+    def add_user(self, username, name, email, password):
+        return self.users.add(username, name, email, password)
+
+    def get_user(self, username):
+        return self.users.get(username)
+
+    def add(self, username, item, price, date, category):
+        _, month = month_of(date)
+        return self.store.append(username, MONTHS[month - 1], category, item, price, date)
+
+    def add_many(self, rows):
+        self.store.append_many([username, MONTHS[month_of(date)[1] - 1], category, item, price, date]
+                               for username, item, price, date, category in rows)
+
+    def _checksum(self, offset):
+        record = self.store.record_at(offset)
+        return row_checksum(record) if record else None
+
+    def _check_deleted(self):
+        """After an index rebuild, move deleted ids whose row moved to its new offset"""
+        if self._generation == self.store.generation:
+            return
+        self._generation = self.store.generation
+        kept = {}
+        moved = {}
+        for offset, checksum in self._deleted.items():
+            if checksum is not None and self._checksum(offset) == checksum:
+                kept[offset] = checksum
+            elif checksum is not None:
+                moved[checksum] = moved.get(checksum, 0) + 1
+        if len(kept) == len(self._deleted):
+            return
+        if moved:
+            # One pass over the CSV; identical rows are matched in file order
+            for offset, record in self.store.records():
+                checksum = row_checksum(record)
+                if moved.get(checksum) and offset not in kept:
+                    kept[offset] = checksum
+                    moved[checksum] -= 1
+        self._deleted = kept
+        tmp_path = self.deleted_path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.writelines(f"{offset} {checksum}\n" for offset, checksum in kept.items())
+        os.replace(tmp_path, self.deleted_path)
+
+    def delete(self, expense_id):
+        self.store.refresh()
+        self._check_deleted()
+        checksum = self._checksum(expense_id)
+        if checksum is None or expense_id in self._deleted:
+            return
+        with open(self.deleted_path, 'a', encoding='utf-8') as f:
+            f.write(f"{expense_id} {checksum}\n")
+        self._deleted[expense_id] = checksum
+
+    def list_month(self, username, year, month):
+        prefix = f"{year:04d}-"
+        expenses = []
+        records = self.store.month_records(username, MONTHS[month - 1])
+        self._check_deleted()
+        for offset, row in records:
+            if len(row) < 5 or offset in self._deleted:
+                continue
+            date = row[5] if len(row) > 5 and row[5] else None
+            if date is not None and not date.startswith(prefix):
+                continue
+            try:
+                price = float(row[4])
+            except ValueError:
+                continue
+            expenses.append(Expense(offset, row[3], price, date, row[2]))
+        expenses.sort(key=lambda expense: expense.date or "")
+        return expenses
+
+    def month_totals(self, username, year):
+        totals = {}
+        for month in range(1, 13):
+            expenses = self.list_month(username, year, month)
+            if expenses:
+                totals[month] = sum(expense.price for expense in expenses)
+        return totals
+
+    def close(self):
+        self.store.close()
+
+
+# --- Memory ---
+
+class MemoryBackend(StorageBackend):
+    """Everything in dicts, as the month cards tracker keeps it; nothing is saved"""
+
+    name = "memory"
+
+    def __init__(self, directory=None):
+        self._users = {}
+        self._months = {}
+        self._where = {}
+        self._totals = {}
+        self._ids = itertools.count(1)
+
+    def add_user(self, username, name, email, password):
+        if username in self._users:
+            return False
+        self._users[username] = User(username, name, email, password)
+        return True
+
+    def get_user(self, username):
+        return self._users.get(username)
+
+    def add(self, username, item, price, date, category):
+        expense_id = next(self._ids)
+        year, month = month_of(date)
+        self._months.setdefault((username, year, month), {})[expense_id] = \
+            Expense(expense_id, item, price, date, category)
+        self._where[expense_id] = (username, year, month)
+        totals = self._totals.setdefault((username, year), {})
+        totals[month] = totals.get(month, 0) + price
+        return expense_id
+
+    def delete(self, expense_id):
+        key = self._where.pop(expense_id, None)
+        if key is None:
+            return
+        expense = self._months[key].pop(expense_id)
+        username, year, month = key
+        totals = self._totals[(username, year)]
+        totals[month] -= expense.price
+        if not self._months[key]:
+            del self._months[key]
+            del totals[month]
+
+    def list_month(self, username, year, month):
+        return sorted(self._months.get((username, year, month), {}).values(), key=by_date)
+
+    def month_totals(self, username, year):
+        return dict(self._totals.get((username, year), {}))
+
+
+# --- SQLite ---
+
+class SQLiteBackend(StorageBackend):
+    """The shared ExpenseRepository; category names map to categories rows"""
+
+    name = "sqlite"
+
+    def __init__(self, directory="."):
+        db_path = os.path.join(directory, DB_PATH)
+        setup_database(db_path)
+        self.repo = ExpenseRepository(db_path)
+        self._category_ids = {}
+
+    def _category_id(self, name):
+        category_id = self._category_ids.get(name)
+        if category_id is None:
+            category_id = self.repo.category_id(name)
+            if category_id is None:
+                category_id = self.repo.add_category(name)
+            self._category_ids[name] = category_id
+        return category_id
+
+    def add_user(self, username, name, email, password):
+        try:
+            self.repo.add_user(username, name, email, password)
+        except sqlite3.IntegrityError:
+            return False
+        return True
+
+    def get_user(self, username):
+        row = self.repo.get_user(username)
+        return User(*row) if row else None
+
+    def add(self, username, item, price, date, category):
+        return self.repo.add(username, item, price, date, self._category_id(category))
+
+    def add_many(self, rows):
+        rows = ((username, item, price, date, self._category_id(category))
+                for username, item, price, date, category in rows)
+        while True:
+            batch = list(itertools.islice(rows, SQLITE_BATCH_SIZE))
+            if not batch:
+                return
+            self.repo.add_many(batch)
+
+    def delete(self, expense_id):
+        self.repo.delete(expense_id)
+
+    def list_month(self, username, year, month):
+        return self.repo.list_month_by_date(username, year, month)
+
+    def month_totals(self, username, year):
+        return self.repo.month_totals(username, year)
+
+    def close(self):
+        self.repo.close()
+
+
+BACKENDS = {
+    "csv": CSVBackend,
+    "memory": MemoryBackend,
+    "sqlite": SQLiteBackend,
+}
+
+
+def open_backend(name=None, directory="."):
+    """Open the named backend, or EXPENSE_STORAGE's (csv by default), on files in directory"""
+    name = name or ACTIVE_BACKEND
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown storage backend {name!r}; expected one of {', '.join(BACKENDS)}")
+    return BACKENDS[name](directory)
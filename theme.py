@@ -0,0 +1,172 @@
+from functools import lru_cache
+
+from PyQt5.QtGui import QFont
+from PyQt5.QtWidgets import QWidget
+
+# === Theme ===
+# The whole look of the Qt frontend as one stylesheet, applied once on
+# the QApplication. Widgets opt in with setObjectName (and the "active"
+# property on MonthCard) instead of each carrying its own setStyleSheet
+# string, so Qt parses the rules once rather than per widget.
+# Fonts come from a shared registry instead of a new QFont per widget.
+
+APP_STYLESHEET = """
+/* --- Add Expense Dialog --- */
+QDialog#addExpenseDialog { background-color: white; }
+QLabel#dialogTitle { color: #2c3e50; margin-bottom: 15px; }
+QDialog#addExpenseDialog QLineEdit,
+QDialog#addExpenseDialog QComboBox,
+QDialog#addExpenseDialog QDateEdit {
+    padding: 8px;
+    border: 1px solid #ddd;
+    border-radius: 4px;
+}
+
+QPushButton#primaryButton, QPushButton#saveButton, QPushButton#cancelButton {
+    border-radius: 5px;
+    padding: 8px;
+    font-weight: bold;
+}
+QPushButton#primaryButton { background-color: #3498db; color: white; }
+QPushButton#primaryButton:hover { background-color: #2980b9; }
+QPushButton#saveButton { background-color: #2ecc71; color: white; }
+QPushButton#saveButton:hover { background-color: #27ae60; }
+QPushButton#cancelButton { background-color: #ecf0f1; color: #2c3e50; }
+QPushButton#cancelButton:hover { background-color: #bdc3c7; }
+
+/* --- Register Page --- */
+QWidget#registerPage { background-color: #f0f4f8; }
+QFrame#registerForm, QFrame#registerForm * {
+    background-color: white;
+    border-radius: 16px;
+    border: 1px solid #dfe6e9;
+}
+QLabel#registerTitle { color: #2c3e50; }
+QLabel#registerSubtitle { color: #7f8c8d; }
+QFrame#registerForm QLineEdit {
+    padding: 12px;
+    border: 1px solid #ccc;
+    border-radius: 8px;
+    font-size: 14px;
+}
+QFrame#registerForm QLineEdit:focus { border: 1px solid #3498db; }
+QPushButton#signUpButton {
+    background-color: #2980b9;
+    color: white;
+    font-size: 15px;
+    padding: 12px;
+    font-weight: bold;
+    border-radius: 10px;
+}
+QPushButton#signUpButton:hover { background-color: #2471a3; }
+QPushButton#linkButton {
+    color: #2980b9;
+    background-color: transparent;
+    border: none;
+    text-decoration: underline;
+}
+QPushButton#linkButton:hover { color: #21618c; }
+
+/* --- Login Page --- */
+QWidget#loginPage { background-color: #ecf0f3; }
+QLabel#loginTitle { color: #2d3436; }
+QFrame#loginBox, QFrame#loginBox QFrame {
+    background-color: white;
+    border-radius: 20px;
+    padding: 30px;
+    border: 1px solid #dcdde1;
+}
+QLabel#loginSubtitle { color: #7f8c8d; }
+QFrame#loginBox QLineEdit {
+    border: 1px solid #bdc3c7;
+    border-radius: 10px;
+    padding: 10px;
+    font-size: 14px;
+    background-color: #f9f9f9;
+}
+QFrame#loginBox QLineEdit:focus {
+    border: 1px solid #2980b9;
+    background-color: #ecf6fc;
+}
+QPushButton#loginButton {
+    background-color: #2980b9;
+    color: white;
+    border-radius: 10px;
+    padding: 12px;
+    font-size: 16px;
+    font-weight: bold;
+}
+QPushButton#loginButton:hover { background-color: #2471a3; }
+QFrame#loginDivider { color: #ccc; }
+QLabel#registerLink { color: #2980b9; }
+QLabel#registerLink:hover { color: #2471a3; }
+
+/* --- Month Cards --- */
+QFrame#monthCard, QFrame#monthCard QLabel {
+    background-color: #ecf0f1;
+    border-radius: 8px;
+    padding: 10px;
+    border: 1px solid #ddd;
+    color: #2c3e50;
+}
+QFrame#monthCard:hover, QFrame#monthCard QLabel:hover { background-color: #d6dbdf; }
+QFrame#monthCard[active="true"], QFrame#monthCard[active="true"] QLabel {
+    background-color: #3498db;
+    border-radius: 10px;
+    border: 2px solid #2980b9;
+    color: white;
+}
+
+/* --- Month Detail --- */
+QLabel#monthTitle { color: #2c3e50; }
+QLabel#statusLabel { color: #95a5a6; padding: 20px 0; }
+QLabel#monthTotal { color: #16a085; padding: 10px 0; }
+QListView#expenseList { background-color: transparent; }
+
+/* --- Main Window --- */
+QMainWindow#trackerWindow, QMainWindow#trackerWindow QMenuBar { background-color: white; }
+QFrame#appHeader { background-color: #3498db; }
+QLabel#appTitle, QLabel#welcomeLabel { color: white; }
+QLabel#profileLabel { color: #d6eaf8; padding-left: 15px; }
+QScrollArea#monthStrip, QWidget#monthStripContents { background-color: #f8f9fa; }
+"""
+
+# role -> QFont arguments
+FONTS = {
+    "display": ("Segoe UI", 26, QFont.Bold),
+    "title": ("Segoe UI", 16, QFont.Bold),
+    "heading_large": ("Segoe UI", 14, QFont.Bold),
+    "heading": ("Segoe UI", 12, QFont.Bold),
+    "body_large": ("Segoe UI", 12),
+    "body": ("Segoe UI", 11),
+    "body_bold": ("Segoe UI", 11, QFont.Bold),
+    "subtitle": ("Segoe UI", 11, QFont.StyleItalic),
+    "small": ("Segoe UI", 10),
+    "small_bold": ("Segoe UI", 10, QFont.Bold),
+    "caption": ("Segoe UI", 9),
+    "signup_title": ("Poppins", 20, QFont.Bold),
+    "signup_subtitle": ("Poppins", 11),
+    "signup_input": ("Poppins", 10),
+    "signup_caption": ("Poppins", 9),
+    "signup_caption_bold": ("Poppins", 9, QFont.Bold),
+}
+
+
+@lru_cache(maxsize=None)
+def font(role):
+    """Shared QFont for a role in FONTS; built once per process"""
+    return QFont(*FONTS[role])
+
+
+def apply_theme(app):
+    app.setStyleSheet(APP_STYLESHEET)
+
+
+def set_style_state(widget, name, value):
+    """Set a property used by a stylesheet selector and re-polish the widget and its children"""
+    widget.setProperty(name, value)
+    style = widget.style()
+    for w in [widget] + widget.findChildren(QWidget):
+        style.unpolish(w)
+        style.polish(w)
+
@@ -0,0 +1,115 @@
+import itertools
+import queue
+import threading
+
+# === Tk Background I/O ===
+# Runs Main.py's file work (users.csv, expenses.csv and their indexes) on
+# one worker thread. Results come back through a queue that the Tk main
+# loop polls with after(), so Tk is only ever touched from its own thread.
+# A single thread keeps the CSV stores single-threaded and runs jobs in
+# the order they were submitted, so a load queued after an append sees
+# the new row.
+#
+# Jobs can carry a key, like QueryExecutor tickets in query_worker.py.
+# Only the newest job per key is delivered, and older ones still waiting
+# in the queue are skipped without running. Flicking through months
+# therefore costs one load, not one per month passed. While jobs take
+# longer than BUSY_DELAY_MS, on_busy(True) lets the window show that it
+# is working.
+
+POLL_MS = 20
+BUSY_DELAY_MS = 150
+
+
+class TkIOWorker:
+    def __init__(self, root, on_busy=None):
+        self.root = root
+        self.on_busy = on_busy
+        self._jobs = queue.Queue()
+        self._results = queue.Queue()
+        self._lock = threading.Lock()
+        self._tickets = itertools.count(1)
+        self._latest = {}
+        self._pending = 0
+        self._polling = False
+        self._busy_shown = False
+        self._thread = threading.Thread(target=self._run, name="tk-io", daemon=True)
+        self._thread.start()
+
+    def submit(self, fn, *args, key=None, on_result=None, on_error=None):
+        """Run fn(*args) on the worker thread; callbacks fire on the Tk thread"""
+        ticket = next(self._tickets)
+        if key is not None:
+            with self._lock:
+                self._latest[key] = ticket
+        self._pending += 1
+        if self._pending == 1:
+            self.root.after(BUSY_DELAY_MS, self._show_busy)
+        self._jobs.put((ticket, key, fn, args, on_result, on_error))
+        if not self._polling:
+            self._polling = True
+            self.root.after(POLL_MS, self._poll)
+        return ticket
+
+    def _is_current(self, ticket, key):
+        with self._lock:
+            return key is None or self._latest.get(key) == ticket
+
+    def _run(self):
+        while True:
+            job = self._jobs.get()
+            if job is None:
+                return
+            ticket, key, fn, args, on_result, on_error = job
+            if not self._is_current(ticket, key):
+                self._results.put((ticket, key, None, None, None))
+                continue
+            try:
+                result = fn(*args)
+            except Exception as e:
+                self._results.put((ticket, key, None, e, on_error))
+            else:
+                self._results.put((ticket, key, result, None, on_result))
+
+    def _poll(self):
+        while True:
+            try:
+                ticket, key, result, error, callback = self._results.get_nowait()
+            except queue.Empty:
+                break
+            self._pending -= 1
+            if not self._is_current(ticket, key):
+                continue
+            if key is not None:
+                with self._lock:
+                    del self._latest[key]
+            if callback:
+                callback(error if error is not None else result)
+            elif error is not None:
+                print(f"Background I/O failed: {error}")
+
+        if self._pending:
+            self.root.after(POLL_MS, self._poll)
+        else:
+            self._polling = False
+            self._set_busy(False)
+
+    @property
+    def busy(self):
+        """Whether on_busy(True) is in effect"""
+        return self._busy_shown
+
+    def _show_busy(self):
+        if self._pending:
+            self._set_busy(True)
+
+    def _set_busy(self, busy):
+        if busy != self._busy_shown:
+            self._busy_shown = busy
+            if self.on_busy:
+                self.on_busy(busy)
+
+    def stop(self):
+        """Let queued jobs finish, then end the worker thread"""
+        self._jobs.put(None)
+        self._thread.join()
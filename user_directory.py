@@ -0,0 +1,101 @@
+import csv
+import io
+import os
+from collections import namedtuple
+
+from csv_store import ENCODING, iter_records
+
+# === User Directory ===
+# The Tk frontend's users.csv (Main.py) kept in a dict keyed by username,
+# so login and the register duplicate check are single lookups instead of
+# a scan of the file. New users are appended to the file and the dict.
+#
+# Each lookup stats the file first. If it grew, only the bytes past the
+# last row read are parsed, which picks up users registered by another
+# Main.py. If it shrank, or the rows the directory has read no longer
+# end where they did, the whole file is read again.
+
+USER_CSV = 'users.csv'
+
+User = namedtuple("User", ["username", "name", "email", "password"])
+
+
+class UserDirectory:
+    def __init__(self, path=USER_CSV):
+        self.path = path
+        self._users = {}
+        self._end = 0
+        self._stat = None
+        self.refresh()
+
+    def refresh(self):
+        """Pick up rows written to the file since it was last read"""
+        try:
+            st = os.stat(self.path)
+        except FileNotFoundError:
+            self._users, self._end, self._stat = {}, 0, None
+            return
+        stat = (st.st_size, st.st_mtime_ns)
+        if stat == self._stat:
+            return
+        if st.st_size < self._end or not self._ends_record(self._end):
+            self._users, self._end = {}, 0
+        self._read_from(self._end)
+        self._stat = stat
+
+    def _ends_record(self, offset):
+        if offset == 0:
+            return True
+        with open(self.path, 'rb') as f:
+            f.seek(offset - 1)
+            return f.read(1) == b'\n'
+
+    def _read_from(self, start):
+        with open(self.path, 'rb') as f:
+            f.seek(start)
+            data = f.read()
+        # Stop before a last row that is still being written
+        end = data.rfind(b'\n') + 1
+        if data.count(b'"', 0, end) % 2:
+            end = sum(len(record) for record in iter_records(io.BytesIO(data)))
+
+        reader = csv.reader(io.StringIO(data[:end].decode(ENCODING), newline=''))
+        if start == 0:
+            next(reader, None)
+        users = self._users
+        for row in reader:
+            # The first registration of a name wins, as with the old scan
+            if len(row) >= 4 and row[0] not in users:
+                users[row[0]] = User(*row[:4])
+        self._end = start + end
+
+    def get(self, username):
+        self.refresh()
+        return self._users.get(username)
+
+    def __contains__(self, username):
+        return self.get(username) is not None
+
+    def __len__(self):
+        self.refresh()
+        return len(self._users)
+
+    def authenticate(self, username, password):
+        """The User if the password matches, else None"""
+        user = self.get(username)
+        if user is not None and user.password == password:
+            return user
+        return None
+
+    def add(self, username, name, email, password):
+        """Append a user to users.csv and the directory; False if the username is taken"""
+        if username in self:
+            return False
+        buf = io.StringIO(newline='')
+        csv.writer(buf).writerow([username, name, email, password])
+        with open(self.path, 'ab') as f:
+            f.write(buf.getvalue().encode(ENCODING))
+        self._users[username] = User(username, name, email, password)
+        # Read our own row back through refresh so _end and _stat stay in step
+        self.refresh()
+        return True
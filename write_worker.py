@@ -0,0 +1,97 @@
+import itertools
+
+from PyQt5.QtCore import QObject, pyqtSignal
+
+from expense_repository import (SQL_ADD_CATEGORY, SQL_ADD_EXPENSE, SQL_ADD_USER, SQL_COLLAPSE_CATEGORY,
+                                SQL_DELETE_EXPENSE, SQL_EXPAND_CATEGORY, get_repository)
+from group_commit import GroupCommitWriter
+
+# === Expense Writer ===
+# Qt front end for the group commit writer. Widgets queue every write
+# (expenses, categories, users) here instead of committing on the GUI
+# thread; each one is acknowledged through a queued signal once its batch
+# is on disk, and the matching callback runs back on the GUI thread.
+
+
+class WriteSignals(QObject):
+    committed = pyqtSignal(int, object)
+    failed = pyqtSignal(int, object)
+
+
+class ExpenseWriter(QObject):
+    def __init__(self, repo):
+        super().__init__()
+        self.signals = WriteSignals()
+        self.signals.committed.connect(self._on_committed)
+        self.signals.failed.connect(self._on_failed)
+        self._tickets = itertools.count(1)
+        self._callbacks = {}
+        self.thread = GroupCommitWriter(repo)
+        self.thread.start()
+
+    def submit(self, sql, params, on_done=None, on_error=None):
+        """Queue a write; on_done(lastrowid) or on_error(exc) fire on the GUI thread"""
+        ticket = next(self._tickets)
+        self._callbacks[ticket] = (on_done, on_error)
+
+        def acknowledge(ok, result):
+            # Writer thread: hop back to the GUI thread through the signal
+            if ok:
+                self.signals.committed.emit(ticket, result)
+            else:
+                self.signals.failed.emit(ticket, result)
+
+        self.thread.submit(sql, params, acknowledge)
+        return ticket
+
+    def add_expense(self, username, item, price, date, category_id, on_done=None, on_error=None):
+        return self.submit(SQL_ADD_EXPENSE, (username, item, price, date, category_id),
+                           on_done, on_error)
+
+    def delete_expense(self, expense_id, on_done=None, on_error=None):
+        return self.submit(SQL_DELETE_EXPENSE, (expense_id,), on_done, on_error)
+
+    def add_category(self, name, on_done=None, on_error=None):
+        """on_done gets the new category id"""
+        return self.submit(SQL_ADD_CATEGORY, (name,), on_done, on_error)
+
+    def add_user(self, username, name, email, password, on_done=None, on_error=None):
+        return self.submit(SQL_ADD_USER, (username, name, email, password), on_done, on_error)
+
+    def set_category_expanded(self, username, category, expanded, on_done=None, on_error=None):
+        sql = SQL_EXPAND_CATEGORY if expanded else SQL_COLLAPSE_CATEGORY
+        return self.submit(sql, (username, category), on_done, on_error)
+
+    def close(self):
+        self.thread.close()
+
+    def _on_committed(self, ticket, result):
+        on_done, _ = self._callbacks.pop(ticket)
+        if on_done:
+            on_done(result)
+
+    def _on_failed(self, ticket, error):
+        _, on_error = self._callbacks.pop(ticket)
+        if on_error:
+            on_error(error)
+        else:
+            print(f"Background write failed: {error}")
+
+
+_writer = None
+
+
+def get_expense_writer():
+    """Return the shared writer; must first be called on the GUI thread"""
+    global _writer
+    if _writer is None:
+        _writer = ExpenseWriter(get_repository())
+    return _writer
+
+
+def stop_expense_writer():
+    """Flush queued writes and stop the writer thread, e.g. on aboutToQuit"""
+    global _writer
+    if _writer is not None:
+        _writer.close()
+        _writer = None